@@ -1,24 +1,75 @@
 import secrets
 from flask import Flask, render_template
 from flask_login import LoginManager
-from .dbmanager import get_db
+from .dbmanager import get_db, init_backend
+from .cache import init_cache
+from .instrumentation import init_instrumentation
+from .metrics import init_metrics
+from .render_cache import init_render_cache
+from .search_index import init_search_index
+from .program_graph import init_program_graph
+from .change_feed import init_change_feed, changes_command
 import os
 
 def create_app(test_config=None):
     app = Flask(__name__)
     app.config.from_mapping(
         SECRET_KEY=secrets.token_urlsafe(32),
-        IMAGE_PATH=os.path.join(app.instance_path, 'images')
+        IMAGE_PATH=os.path.join(app.instance_path, 'images'),
+        DB_BACKEND=os.environ.get('DB_BACKEND', 'oracle'),
+        DB_SQLITE_PATH=os.environ.get('DB_SQLITE_PATH', os.path.join(app.instance_path, 'course_management.sqlite')),
+        DB_POOL=False,
+        DB_POOL_MIN=1,
+        DB_POOL_MAX=4,
+        DB_POOL_INCREMENT=1,
+        DB_POOL_PING_INTERVAL=60,
+        DB_POOL_WAIT_TIMEOUT=5000,
+        ENTITY_CACHE_SIZE=256,
+        ENTITY_CACHE_TTL=300,
+        USER_CACHE_SIZE=1024,
+        USER_CACHE_TTL=60,
+        RENDER_CACHE=True,
+        RENDER_CACHE_PAGES=256,
+        RENDER_CACHE_FRAGMENTS=1024,
+        RENDER_CACHE_TTL=300,
+        CACHE_VERSION_DIR=os.environ.get('CACHE_VERSION_DIR'),
+        API_CACHE_MAX_AGE=0,
+        EXPORT_ARRAYSIZE=1000,
+        IMPORT_CHUNK_SIZE=500,
+        SEARCH_MODE='index',
+        SEARCH_CATEGORY_TIMEOUT=2.0,
+        SEARCH_INDEX_TTL=60,
+        SEARCH_SUGGEST_TTL=30,
+        PROGRAM_GRAPH_TTL=60,
+        QUERY_INSTRUMENTATION=True,
+        SLOW_QUERY_MS=100,
+        METRICS=True,
+        METRICS_DIR=os.environ.get('METRICS_DIR'),
+        METRICS_FLUSH_INTERVAL=1.0,
+        CHANGE_FEED_INTERVAL=1.0,
+        CHANGE_FEED_PAGE_SIZE=1000,
+        CHANGE_FEED_GAP_TIMEOUT=30
     )
     if test_config is None:
         app.config.from_pyfile('config.py', silent=True)
     else:
         app.config.from_mapping(test_config)
 
+    init_backend(app)
+    init_cache(app)
+    init_render_cache(app)
+    init_search_index(app)
+    init_program_graph(app)
+    init_instrumentation(app)
+    init_metrics(app)
+    init_change_feed(app)
+
     app.teardown_appcontext(cleanup)
     
-    from .dbmanager import init_db_command
+    from .dbmanager import init_db_command, import_data_command
     app.cli.add_command(init_db_command)
+    app.cli.add_command(import_data_command)
+    app.cli.add_command(changes_command)
     
     from .home_view import bp as home_bp
     app.register_blueprint(home_bp)
@@ -41,6 +92,9 @@ def create_app(test_config=None):
     from .course_elements_view import bp as course_elements_bp
     app.register_blueprint(course_elements_bp)
 
+    from .report_view import bp as report_bp
+    app.register_blueprint(report_bp)
+
     from .auth_view import bp as auth_bp
     app.register_blueprint(auth_bp)
 
@@ -62,6 +116,18 @@ def create_app(test_config=None):
     from .term_api import bp as term_api_bp
     app.register_blueprint(term_api_bp)
     
+    from .export_api import bp as export_api_bp
+    app.register_blueprint(export_api_bp)
+    
+    from .import_api import bp as import_api_bp
+    app.register_blueprint(import_api_bp)
+    
+    from .search_api import bp as search_api_bp
+    app.register_blueprint(search_api_bp)
+    
+    from .report_api import bp as report_api_bp
+    app.register_blueprint(report_api_bp)
+    
     @app.errorhandler(404)
     def page_not_found(error):
         return render_template('custom404.html'), 404
@@ -1,6 +1,7 @@
-from flask import Blueprint, render_template, abort, flash, request, redirect, url_for
+from flask import Blueprint, render_template, abort, flash, request, redirect, url_for, make_response
 from flask_login import login_required, current_user
-from .dbmanager import get_db
+from .dbmanager import get_db, get_pool_stats
+from .instrumentation import query_stats
 
 bp = Blueprint('admin',__name__,url_prefix='/admin/')
 
@@ -60,6 +61,23 @@ def block_user(email):
         flash('Database Error')
     return redirect(url_for('admin.display_users'))
 
+@bp.route('/pool-stats/')
+@login_required
+def pool_stats():
+    if current_user.access_group != 3 or current_user.blocked:
+        abort(401)
+    stats = get_pool_stats()
+    if stats is None:
+        return make_response({'id': 'Not Pooled', 'description': 'Connection pooling is disabled (set DB_POOL in config.py, Oracle backend only)'}, 404)
+    return make_response(stats, 200)
+
+@bp.route('/query-stats/')
+@login_required
+def query_statistics():
+    if current_user.access_group != 3 or current_user.blocked:
+        abort(401)
+    return make_response({'statements': query_stats()}, 200)
+
 from flask_wtf import FlaskForm
 from wtforms import SelectField, StringField
 
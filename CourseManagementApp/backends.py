@@ -0,0 +1,339 @@
+import oracledb
+import sqlite3
+import os
+import re
+import logging
+import threading
+import time
+
+PLSQL_BLOCK = re.compile(r'\s*create\s+(or\s+replace\s+)?(trigger|package|procedure|function|type)\b', re.IGNORECASE)
+SQL_COMMENTS = re.compile(r'/\*.*?(\*/|$)|--[^\n]*', re.DOTALL)
+
+logger = logging.getLogger('CourseManagementApp.sql')
+
+DB_HOST = "198.168.52.211"
+DB_PORT = 1521
+DB_SERVICE_NAME = "pdbora19c.dawsoncollege.qc.ca"
+
+SQL_DIR = os.path.join(os.path.dirname(__file__), 'sql')
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instance', 'course_management.sqlite')
+
+class ConnectionPool:
+    '''Process-wide pool of Oracle connections, shared by every request handled by this worker'''
+    def __init__(self, min=1, max=4, increment=1, ping_interval=60, wait_timeout=5000):
+        # ping_interval makes the pool ping a connection on acquire once it has been idle that many seconds (0 pings on every acquire)
+        self.__pool = oracledb.create_pool(user=os.environ['DBUSER'], password=os.environ['DBPWD'],
+                                           host=DB_HOST, port=DB_PORT, service_name=DB_SERVICE_NAME,
+                                           min=min, max=max, increment=increment, ping_interval=ping_interval,
+                                           getmode=oracledb.POOL_GETMODE_TIMEDWAIT, wait_timeout=wait_timeout)
+        self.__lock = threading.Lock()
+        self.__acquired = 0
+        self.__total_wait = 0.0
+        self.__max_wait = 0.0
+
+    def acquire(self):
+        start = time.perf_counter()
+        connection = self.__pool.acquire()
+        waited = time.perf_counter() - start
+        with self.__lock:
+            self.__acquired += 1
+            self.__total_wait += waited
+            self.__max_wait = max(self.__max_wait, waited)
+        return connection
+
+    def release(self, connection):
+        self.__pool.release(connection)
+
+    def stats(self):
+        with self.__lock:
+            acquired = self.__acquired
+            total_wait = self.__total_wait
+            max_wait = self.__max_wait
+        return {'min': self.__pool.min, 'max': self.__pool.max, 'increment': self.__pool.increment,
+                'open': self.__pool.opened, 'busy': self.__pool.busy, 'acquired': acquired,
+                'total_wait_ms': round(total_wait * 1000, 3), 'max_wait_ms': round(max_wait * 1000, 3),
+                'avg_wait_ms': round(total_wait * 1000 / acquired, 3) if acquired else 0.0}
+
+    def close(self):
+        self.__pool.close(force=True)
+
+class OracleBackend:
+    '''The college Oracle instance, with standalone connections or a ConnectionPool'''
+    name = 'oracle'
+    Error = oracledb.Error
+    IntegrityError = oracledb.IntegrityError
+    page_clause = 'OFFSET :offset ROWS FETCH NEXT :page_size ROWS ONLY'
+    first_row_clause = 'FETCH FIRST 1 ROW ONLY'
+    limit_clause = 'FETCH FIRST :page_size ROWS ONLY'
+    dual_clause = ' FROM dual'
+    # Every query of a read only transaction sees the database as it was when the transaction began
+    snapshot_statement = 'SET TRANSACTION READ ONLY'
+    setup_scripts = ['remove.sql', 'project_type.sql', 'setup.sql', 'inserting.sql', 'logging.sql', 'views.sql', 'courses_package.sql', 'oracle_text.sql']
+    upsert_course_element_statement = ('MERGE INTO courses_elements t USING (SELECT :course_id course_id, :element_id element_id, :element_hours element_hours FROM dual) s '
+                                       'ON (t.course_id = s.course_id AND t.element_id = s.element_id) WHEN MATCHED THEN UPDATE SET t.element_hours = s.element_hours '
+                                       'WHEN NOT MATCHED THEN INSERT (course_id, element_id, element_hours) VALUES (s.course_id, s.element_id, s.element_hours)')
+    # Full-text search over the CONTEXT indexes of oracle_text.sql, best SCORE first
+    fulltext_queries = {
+        'courses': 'SELECT course_id, course_title FROM courses WHERE CONTAINS(description, :query, 1) > 0 ORDER BY SCORE(1) DESC, term_id, course_id',
+        'competencies': 'SELECT competency_id, competency FROM competencies WHERE CONTAINS(competency_achievement, :query, 1) > 0 ORDER BY SCORE(1) DESC, competency_id',
+        'elements': 'SELECT element_id, element, competency_id FROM elements WHERE CONTAINS(element_criteria, :query, 1) > 0 ORDER BY SCORE(1) DESC, competency_id, element_id',
+        'domains': 'SELECT domain_id, domain FROM domains WHERE CONTAINS(domain_description, :query, 1) > 0 ORDER BY SCORE(1) DESC, domain_id'
+    }
+
+    def __init__(self, pool_options=None):
+        self.pool = None
+        if pool_options is not None:
+            self.pool = ConnectionPool(**pool_options)
+
+    def connect(self):
+        if self.pool is not None:
+            return self.pool.acquire()
+        return oracledb.connect(user=os.environ['DBUSER'], password=os.environ['DBPWD'],
+                                host=DB_HOST, port=DB_PORT, service_name=DB_SERVICE_NAME)
+
+    def release(self, connection):
+        if self.pool is not None:
+            self.pool.release(connection)
+        else:
+            connection.close()
+
+    def run_file(self, connection, file_path):
+        statement_parts = []
+        with connection.cursor() as cursor:
+            def run(statement):
+                if SQL_COMMENTS.sub('', statement).strip():
+                    try:
+                        cursor.execute(statement)
+                    except Exception as e:
+                        logger.error('Statement of %s failed: %s\n%s', os.path.basename(file_path), e, statement)
+            with open(file_path, 'r') as f:
+                for line in f:
+                    statement_parts.append(line)
+                    # Triggers, packages and types hold ';' of their own and end at a line with a single '/' instead
+                    if PLSQL_BLOCK.match(SQL_COMMENTS.sub('', "".join(statement_parts))):
+                        if line.strip() != '/':
+                            continue
+                        run("".join(statement_parts[:-1]).strip())
+                    elif line.strip('\n').strip('\n\r').strip().endswith(';'):
+                        run("".join(
+                            statement_parts).strip().rstrip(';'))
+                    elif line.strip() != '/':
+                        continue
+                    statement_parts = []
+            # A last block the file does not close with '/'
+            run("".join(statement_parts).strip())
+
+    def stats(self):
+        if self.pool is None:
+            return None
+        return self.pool.stats()
+
+    def fulltext_query(self, text):
+        # Braces escape each word so reserved words and operators in the search text are taken literally
+        return ' AND '.join('{' + word + '}' for word in re.findall(r'\w+', text))
+
+class SqliteBatchError:
+    def __init__(self, offset, message):
+        self.offset = offset
+        self.message = message
+
+class SqliteCursor:
+    '''Gives a sqlite3 cursor the parts of the oracledb cursor API that Database relies on'''
+    def __init__(self, cursor):
+        self.__cursor = cursor
+        self.__batch_errors = []
+        self.__rowfactory = None
+        self.arraysize = cursor.arraysize
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = self.__cursor.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    @property
+    def rowcount(self):
+        return self.__cursor.rowcount
+
+    @property
+    def description(self):
+        return self.__cursor.description
+
+    @property
+    def rowfactory(self):
+        return self.__rowfactory
+
+    @rowfactory.setter
+    def rowfactory(self, factory):
+        self.__rowfactory = factory
+        self.__cursor.row_factory = None if factory is None else lambda cursor, row: factory(*row)
+
+    def execute(self, statement, parameters=None, **kwargs):
+        if parameters is None:
+            parameters = kwargs
+        # Like oracledb, each statement starts without a rowfactory
+        self.rowfactory = None
+        self.__cursor.execute(statement, parameters)
+        return self
+
+    def executemany(self, statement, parameters, batcherrors=False):
+        if not batcherrors:
+            self.__cursor.executemany(statement, parameters)
+            return
+        # Like Oracle batch errors: a failing row is skipped and recorded, the rest of the batch still runs
+        self.__batch_errors = []
+        for offset, row in enumerate(parameters):
+            try:
+                self.__cursor.execute(statement, row)
+            except sqlite3.Error as e:
+                self.__batch_errors.append(SqliteBatchError(offset, str(e)))
+
+    def getbatcherrors(self):
+        return self.__batch_errors
+
+    def fetchone(self):
+        return self.__cursor.fetchone()
+
+    def fetchmany(self, size=None):
+        return self.__cursor.fetchmany(size or self.arraysize)
+
+    def fetchall(self):
+        return self.__cursor.fetchall()
+
+    def close(self):
+        self.__cursor.close()
+
+class SqliteConnection:
+    '''Gives a sqlite3 connection the parts of the oracledb connection API that Database relies on'''
+    def __init__(self, connection):
+        self.raw = connection
+
+    @property
+    def autocommit(self):
+        return self.raw.isolation_level is None
+
+    @autocommit.setter
+    def autocommit(self, value):
+        self.raw.isolation_level = None if value else 'DEFERRED'
+
+    def cursor(self):
+        return SqliteCursor(self.raw.cursor())
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def ping(self):
+        self.raw.execute('SELECT 1')
+
+    def close(self):
+        self.raw.close()
+
+class SqliteBackend:
+    '''Embedded SQLite file for local runs, offline tests and benchmarks. Seeded with the sample program on first use'''
+    name = 'sqlite'
+    Error = sqlite3.Error
+    IntegrityError = sqlite3.IntegrityError
+    page_clause = 'LIMIT :page_size OFFSET :offset'
+    first_row_clause = 'LIMIT 1'
+    limit_clause = 'LIMIT :page_size'
+    dual_clause = ''
+    # sqlite3 only opens transactions before writes on its own; an explicit one keeps a shared lock until it ends
+    snapshot_statement = 'BEGIN'
+    setup_scripts = ['sqlite_setup.sql', 'sqlite_fts.sql', 'inserting.sql', 'sqlite_audit.sql']
+    upsert_course_element_statement = ('INSERT INTO courses_elements (course_id, element_id, element_hours) VALUES(:course_id, :element_id, :element_hours) '
+                                       'ON CONFLICT(course_id, element_id) DO UPDATE SET element_hours = excluded.element_hours')
+    # FTS5 stands in for Oracle Text (sqlite_fts.sql), with bm25 (lower is better) in place of SCORE
+    fulltext_queries = {
+        'courses': 'SELECT course_id, course_title FROM courses_fts JOIN courses USING(course_id) WHERE courses_fts MATCH :query ORDER BY bm25(courses_fts), term_id, course_id',
+        'competencies': 'SELECT competency_id, competency FROM competencies_fts JOIN competencies USING(competency_id) WHERE competencies_fts MATCH :query ORDER BY bm25(competencies_fts), competency_id',
+        'elements': 'SELECT element_id, element, competency_id FROM elements_fts JOIN elements USING(element_id) WHERE elements_fts MATCH :query ORDER BY bm25(elements_fts), competency_id, element_id',
+        'domains': 'SELECT domain_id, domain FROM domains_fts JOIN domains USING(domain_id) WHERE domains_fts MATCH :query ORDER BY bm25(domains_fts), domain_id'
+    }
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__ready = False
+
+    def connect(self):
+        if not self.__ready:
+            self.__bootstrap()
+        return self.__open()
+
+    def release(self, connection):
+        connection.close()
+
+    def run_file(self, connection, file_path):
+        with open(file_path, 'r') as f:
+            connection.raw.executescript(f.read())
+
+    def stats(self):
+        return None
+
+    def fulltext_query(self, text):
+        return ' '.join('"' + word + '"' for word in re.findall(r'\w+', text))
+
+    def __open(self):
+        connection = sqlite3.connect(self.path, timeout=30, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        connection.execute('PRAGMA foreign_keys = ON')
+        return SqliteConnection(connection)
+
+    def __bootstrap(self):
+        with self.__lock:
+            if self.__ready:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = self.__open()
+            try:
+                connection.raw.execute('PRAGMA journal_mode = WAL')
+                exists = connection.raw.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='courses'").fetchone()
+                if exists is None:
+                    for script in self.setup_scripts:
+                        self.run_file(connection, os.path.join(SQL_DIR, script))
+                else:
+                    # Databases seeded before full-text search or the change feed were added
+                    for table, script in (('courses_fts', 'sqlite_fts.sql'), ('audit_logs', 'sqlite_audit.sql')):
+                        if connection.raw.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone() is None:
+                            self.run_file(connection, os.path.join(SQL_DIR, script))
+            finally:
+                connection.close()
+            self.__ready = True
+
+_backends = {}
+_default = None
+
+def create_backend(name, sqlite_path=None, pool_options=None):
+    '''Returns the process-wide backend for these settings, creating it (and any pool) only once'''
+    key = (name, sqlite_path, tuple(sorted(pool_options.items())) if pool_options else None)
+    if key not in _backends:
+        if name == 'sqlite':
+            _backends[key] = SqliteBackend(sqlite_path or DEFAULT_SQLITE_PATH)
+        elif name == 'oracle':
+            _backends[key] = OracleBackend(pool_options)
+        else:
+            raise ValueError(f'Unknown database backend: {name}')
+    return _backends[key]
+
+def set_default_backend(backend):
+    global _default
+    _default = backend
+
+def get_default_backend():
+    global _default
+    if _default is None:
+        _default = create_backend(os.environ.get('DB_BACKEND', 'oracle'), os.environ.get('DB_SQLITE_PATH'))
+    return _default
@@ -0,0 +1,163 @@
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    '''Size-bounded LRU mapping whose entries also expire ttl seconds after being stored'''
+    def __init__(self, maxsize=256, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.__entries[key]
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self.__lock:
+            self.__entries[key] = (time.monotonic() + self.ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+
+    def pop(self, key):
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def stats(self):
+        return {'size': len(self.__entries), 'maxsize': self.maxsize, 'ttl': self.ttl, 'hits': self.hits, 'misses': self.misses}
+
+class VersionStore:
+    '''Per-table data versions, bumped by every write. Only visible to this process, unless follow() ties them to the change feed'''
+    def __init__(self):
+        self.__boot = f'{os.getpid()}.{time.time_ns()}'
+        self.__started = time.time()
+        self.__versions = {}
+        self.__followed = {}
+        self.__writes = 0
+        self.__lock = threading.Lock()
+
+    def version(self, table):
+        return self.__versions.get(table, (f'{self.__boot}.0', None))[0]
+
+    def changed_at(self, table):
+        return self.__versions.get(table, (None, self.__started))[1]
+
+    def bump(self, table):
+        with self.__lock:
+            self.__writes += 1
+            self.__versions[table] = (f'{self.__boot}.{self.__writes}', time.time())
+
+    def follow(self, tallies):
+        '''Sets the version of each table from its (last log_id, number of changes) on the change feed, the same in every process
+        that has seen the same changes. A table whose tally has not moved keeps the version a local write may have bumped it to'''
+        with self.__lock:
+            for table, tally in tallies.items():
+                version = 'log.{}.{}'.format(*tally)
+                if self.__followed.get(table) != version:
+                    self.__followed[table] = version
+                    self.__versions[table] = (version, time.time())
+
+class FileVersionStore:
+    '''Per-table data versions kept as one file per table in a directory shared by every gunicorn worker'''
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def version(self, table):
+        try:
+            with open(os.path.join(self.directory, table)) as f:
+                return f.read()
+        except FileNotFoundError:
+            return '0'
+
+    def changed_at(self, table):
+        try:
+            return os.path.getmtime(os.path.join(self.directory, table))
+        except FileNotFoundError:
+            return os.path.getmtime(self.directory)
+
+    def bump(self, table):
+        # Written to a private file then renamed over the old one, so readers never see a partial version
+        path = os.path.join(self.directory, table)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}'
+        with open(temp_path, 'w') as f:
+            f.write(f'{time.time_ns()}.{os.getpid()}')
+        os.replace(temp_path, path)
+
+versions = VersionStore()
+
+def set_version_store(store):
+    global versions
+    versions = store
+
+# Set while the audit_logs change feed (change_feed.py) keeps this process's versions up to date with every write
+following = False
+
+def set_following(value):
+    global following
+    following = value
+
+def versions_shared():
+    '''Whether writes made by other processes reach versions, through the change feed or a CACHE_VERSION_DIR shared by every worker'''
+    return following or isinstance(versions, FileVersionStore)
+
+def follow(tallies):
+    '''Ties the versions of this process to the change feed, so every worker hands out the same versions (and ETags) for the same data'''
+    if isinstance(versions, VersionStore):
+        versions.follow(tallies)
+
+def changed(*tables):
+    '''Records a write to the given tables, invalidating everything cached from them'''
+    for table in tables:
+        versions.bump(table)
+
+class EntityCache:
+    '''Read-through cache for rarely changing Database reads, keyed by table and stamped with the table version'''
+    def __init__(self, maxsize=256, ttl=300):
+        self.entries = TTLCache(maxsize, ttl)
+
+    def get_or_load(self, table, key, loader):
+        version = versions.version(table)
+        entry = self.entries.get((table, key))
+        if entry is None or entry[0] != version:
+            entry = (version, loader())
+            self.entries.set((table, key), entry)
+        # Callers (to_json in particular) mutate the objects they get, so each one gets its own copies
+        if isinstance(entry[1], list):
+            return [copy.copy(item) for item in entry[1]]
+        return copy.copy(entry[1])
+
+    def clear(self):
+        self.entries.clear()
+
+entity_cache = EntityCache()
+# The logged in user of every request (Flask-Login's user_loader), kept briefly and dropped by any write to course_users
+user_cache = EntityCache(maxsize=1024, ttl=60)
+
+def init_cache(app):
+    global entity_cache, user_cache
+    entity_cache = EntityCache(app.config['ENTITY_CACHE_SIZE'], app.config['ENTITY_CACHE_TTL'])
+    user_cache = EntityCache(app.config['USER_CACHE_SIZE'], app.config['USER_CACHE_TTL'])
+    if app.config['CACHE_VERSION_DIR']:
+        set_version_store(FileVersionStore(app.config['CACHE_VERSION_DIR']))
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+from collections import namedtuple
+import click
+from flask import current_app
+from . import cache
+from .dbmanager import get_db
+
+## Change feed over audit_logs, which the triggers of logging.sql (sqlite_audit.sql on SQLite) fill with one row per changed
+## row of every table. A ChangeFeed remembers the highest log_id it has handed out and each poll() returns what was logged
+## after it, oldest first. Identity values are taken when a row is inserted but only become visible when its transaction
+## commits, so an id skipped over may still show up: skipped ids are asked for again until gap_timeout seconds have passed.
+## Every process polls the feed at the start of a request, at most every CHANGE_FEED_INTERVAL seconds, and bumps the cache
+## version of each changed table, so writes made by other workers or outside this app (SQL*Plus, courses_package, another
+## deployment) reach the entity, user, render, search and program graph caches within that interval. Writes made through
+## Database already bump the versions of their own process, and are bumped once more when the feed sees them. The feed also
+## tallies the last log_id and the number of changes of every table, which become the versions of each process following it:
+## workers that have seen the same changes agree on their versions, and so on the ETags of conditional.py.
+
+Change = namedtuple('Change', ['log_id', 'table_name', 'operation', 'row_key', 'change_time'])
+
+# Larger jumps between two visible ids are sequence cache losses, not transactions still in flight
+MAX_GAP = 100
+
+# The tables with audit triggers, tallied from the start so that those without changes yet get a version too
+FEED_TABLES = ('terms', 'domains', 'courses', 'competencies', 'elements', 'courses_elements', 'course_users')
+
+class ChangeFeed:
+    def __init__(self, position=None, page_size=1000, gap_timeout=30):
+        self.position = position
+        self.page_size = page_size
+        self.gap_timeout = gap_timeout
+        self.subscribers = []
+        self.tallies = {}
+        self.__gaps = {}
+
+    def subscribe(self, callback):
+        '''callback gets the list of changes of every poll that found some'''
+        self.subscribers.append(callback)
+
+    def poll(self, db):
+        '''Changes logged since the last poll (everything from now on, if the feed has no position yet), oldest first'''
+        if self.position is None:
+            self.tallies = {table: (0, 0) for table in FEED_TABLES}
+            self.tallies.update((table, (last_id, count)) for table, last_id, count in db.get_change_tallies())
+            self.position = max(last_id for last_id, _ in self.tallies.values())
+        now = time.monotonic()
+        self.__gaps = {log_id: seen for log_id, seen in self.__gaps.items() if now - seen < self.gap_timeout}
+        changes = []
+        for row in db.get_changes_since(self.position, self.page_size, self.__gaps):
+            change = Change(*row)
+            if change.log_id > self.position:
+                if change.log_id - self.position <= MAX_GAP:
+                    for missing_id in range(self.position + 1, change.log_id):
+                        self.__gaps[missing_id] = now
+                self.position = change.log_id
+            else:
+                self.__gaps.pop(change.log_id, None)
+            last_id, count = self.tallies.get(change.table_name, (0, 0))
+            self.tallies[change.table_name] = (max(last_id, change.log_id), count + 1)
+            changes.append(change)
+        return changes
+
+    def publish(self, db):
+        '''Polls until caught up, handing every batch of changes to the subscribers'''
+        while True:
+            changes = self.poll(db)
+            if changes:
+                for callback in self.subscribers:
+                    callback(changes)
+            if len(changes) < self.page_size:
+                return
+
+def invalidate(changes):
+    '''Bumps the cache version of every table the changes touch, once per table'''
+    cache.changed(*dict.fromkeys(change.table_name for change in changes))
+
+feed = None
+interval = 1.0
+last_poll = 0.0
+failing = False
+poll_lock = threading.Lock()
+
+def follow_changes():
+    '''Before each request: polls the feed if interval seconds have passed, unless another request of this process is at it'''
+    global last_poll, failing
+    if feed is None or time.monotonic() - last_poll < interval or not poll_lock.acquire(blocking=False):
+        return
+    try:
+        last_poll = time.monotonic()
+        feed.publish(get_db())
+        cache.follow(feed.tallies)
+        failing = False
+        cache.set_following(True)
+    except Exception:
+        # audit_logs missing or unreachable: the caches stop trusting the versions of this process until a poll succeeds
+        if not failing:
+            current_app.logger.exception('Change feed poll failed, caches stop relying on it until a poll succeeds')
+        failing = True
+        cache.set_following(False)
+    finally:
+        poll_lock.release()
+
+def init_change_feed(app):
+    global feed, interval, last_poll
+    feed = None
+    last_poll = 0.0
+    cache.set_following(False)
+    if app.config['CHANGE_FEED_INTERVAL'] > 0:
+        interval = app.config['CHANGE_FEED_INTERVAL']
+        feed = ChangeFeed(page_size=app.config['CHANGE_FEED_PAGE_SIZE'], gap_timeout=app.config['CHANGE_FEED_GAP_TIMEOUT'])
+        feed.subscribe(invalidate)
+        app.before_request(follow_changes)
+
+@click.command('changes')
+@click.option('--since', type=int, default=0, help='Print the changes logged after this log_id')
+@click.option('--follow', is_flag=True, help='Keep printing new changes as they are logged')
+@click.option('--interval', type=float, default=1.0, help='Seconds between polls with --follow')
+def changes_command(since, follow, interval):
+    '''Prints the audit_logs change feed as NDJSON, for syncing another store'''
+    def echo(changes):
+        for change in changes:
+            click.echo(json.dumps({**change._asdict(), 'change_time': str(change.change_time)}))
+    changes_feed = ChangeFeed(position=since)
+    changes_feed.subscribe(echo)
+    while True:
+        changes_feed.publish(get_db())
+        if not follow:
+            return
+        time.sleep(interval)
@@ -1,6 +1,8 @@
 from .element import Element
 
 class Competency:
+    __slots__ = ('competency_id', 'competency', 'competency_achievement', 'competency_type')
+
     def __init__(self, competency_id, competency, competency_achievement, competency_type):
         if not isinstance(competency_id, str):
             raise TypeError('competency_id must be a non-zero string')
@@ -15,6 +17,16 @@ class Competency:
         self.competency = competency
         self.competency_achievement = competency_achievement
         self.competency_type = competency_type
+
+    @classmethod
+    def from_row(cls, competency_id, competency, competency_achievement, competency_type):
+        '''Builds a competency from a database row without validating it. Doubles as a cursor rowfactory'''
+        new_competency = cls.__new__(cls)
+        new_competency.competency_id = competency_id
+        new_competency.competency = competency
+        new_competency.competency_achievement = competency_achievement
+        new_competency.competency_type = competency_type
+        return new_competency
         
     def __repr__(self):
         return f'Competency({self.competency_id}, {self.competency}, {self.competency_achievement}, {self.competency_type})' 
@@ -46,7 +58,7 @@ class Competency:
         return competency 
     
     def to_json(self, element=None):
-        competency_json = self.__dict__
+        competency_json = {name: getattr(self, name) for name in self.__slots__}
         
         if element is not None:
             competency_json['element_order'] = element.element_order
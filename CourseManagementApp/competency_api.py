@@ -2,6 +2,8 @@ from flask import Flask, Blueprint, request, url_for, make_response
 from .dbmanager import get_db
 from .competency import Competency
 from .element import Element
+from .pagination import decode_cursor, page_links, cursor_error
+from .conditional import conditional
 import math
 
 bp = Blueprint('competency_api', __name__, url_prefix = '/api/v1')
@@ -9,14 +11,8 @@ bp = Blueprint('competency_api', __name__, url_prefix = '/api/v1')
 ## THE FOLLOWING CHAIN COVERS ALL COMPETENCIES AND ELEMENTS, INCLUDING ANY THAT MAY NOT BE LINKED TO A SPECIFIC COURSE
 
 @bp.route('/competencies', methods=['GET', 'POST'])
+@conditional('competencies')
 def competencies():
-    try:
-        total_competencies = get_db().get_competencies()
-    except Exception as e:
-        error_infoset = {'id': 'Database Error',
-                        'description': 'Unable to connect to the database. Please try again later.'}
-        return make_response(error_infoset, 500)
-    
     if request.method == 'POST':
         competency_json = request.json
         
@@ -28,11 +24,17 @@ def competencies():
                          'description': 'Data must contain complete competency and element information, and formatted as dictionary object'}
                 return make_response(error_infoset, 400)
             
-            for competency in total_competencies:
-                if competency.competency_id == new_competency.competency_id:
-                    error_infoset = {'id': 'Data Error',
-                                'description': 'Specified competency id already exists'}
-                    return make_response(error_infoset, 400)
+            try:
+                competency_exists = get_db().competency_exists(new_competency.competency_id)
+            except Exception as e:
+                error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+                return make_response(error_infoset, 500)
+            
+            if competency_exists:
+                error_infoset = {'id': 'Data Error',
+                            'description': 'Specified competency id already exists'}
+                return make_response(error_infoset, 400)
                 
             if new_element.competency_id != new_competency.competency_id:
                 error_infoset = {'id': 'Data Error',
@@ -54,41 +56,56 @@ def competencies():
                     
         
     elif request.method == 'GET':
+        try:
+            count = get_db().count_competencies()
+        except Exception as e:
+            error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+            return make_response(error_infoset, 500)
+        
         page_number = 1
         page_size = 50
-        if request.args:
+        cursor = request.args.get('cursor')
+        if request.args and cursor is None:
             page = request.args.get('page')
             if page:
                 page_number = int(page)
-                max_page = math.ceil(len(total_competencies) / float(page_size))
+                max_page = math.ceil(count / float(page_size))
                 if page_number < 1 or page_number > max_page:
                     error_infoset = {'id' : 'Invalid Page Number',
                                 'description': f'Page number must be from 1, up to a maximum of {max_page}'}
                     return make_response(error_infoset, 404)
     
+    if cursor is not None:
+        try:
+            key, direction = decode_cursor(cursor, 'competency_api.competencies')
+        except ValueError:
+            return make_response(cursor_error(), 400)
+    
     try:
-        competencies, previous_page, next_page = get_db().get_competencies_for_api(page_size, page_number=page_number)
+        if cursor is not None:
+            competencies, has_previous, has_next = get_db().get_competencies_by_cursor(page_size, key, direction)
+        else:
+            competencies, previous_page, next_page = get_db().get_competencies_for_api(page_size, page_number=page_number)
+            has_previous = previous_page is not None
+            has_next = next_page is not None
+    except ValueError:
+        return make_response(cursor_error(), 400)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                     'description': 'Unable to connect to the database. Please try again later.'}
         return make_response(error_infoset, 500)
     
-    if previous_page is not None:
-        previous_page = url_for('competency_api.competencies', page=previous_page)
-    if next_page is not None:
-        next_page = url_for('competency_api.competencies', page=next_page)
-    current_page = url_for('competency_api.competencies', page=page_number)
+    links = page_links('competency_api.competencies', competencies, lambda competency: (competency.competency_id,), has_previous, has_next, page_number=page_number, cursor=cursor)
     
-    count = len(total_competencies)
-    json = {'count': count, 'current_page': current_page, 'previous_page': previous_page, 'next_page': next_page, 'results': [competency.to_json() for competency in competencies]}
+    json = {'count': count, **links, 'results': [competency.to_json() for competency in competencies]}
     return make_response(json, 200)
 
 @bp.route('/competencies/<competency_id>', methods=['GET', 'PUT', 'DELETE'])
+@conditional('competencies')
 def competency_by_id(competency_id):
     try:
         competency = get_db().get_competency(competency_id)
-        competencies = get_db().get_competencies()
-        competency_elements = get_db().get_elements_of_competency(competency_id)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                          'description': 'Unable to connect to the database. Please try again later.'}
@@ -105,17 +122,23 @@ def competency_by_id(competency_id):
                          'description': 'Data must contain complete competency information, and formatted as dictionary object'}
                 return make_response(error_infoset, 400)
             
-            for competency in competencies:
-                if competency.competency_id == new_competency.competency_id:
-                    try:
-                        get_db().edit_competency(new_competency)
-                        resp = make_response({'id': 'Request Complete', 'description': 'Update Competency Request Complete. New element resource, if provided, must be added separately'}, 201)
-                        resp.headers['Location'] = url_for('competency_api.competency_by_id', competency_id=competency_id)
-                        return resp
-                    except Exception as e:
-                        error_infoset = {'id': 'Database Error',
+            try:
+                competency_exists = get_db().competency_exists(new_competency.competency_id)
+            except Exception as e:
+                error_infoset = {'id': 'Database Error',
                          'description': 'Unable to connect to the database. Please try again later.'}
-                        return make_response(error_infoset, 500)
+                return make_response(error_infoset, 500)
+            
+            if competency_exists:
+                try:
+                    get_db().edit_competency(new_competency)
+                    resp = make_response({'id': 'Request Complete', 'description': 'Update Competency Request Complete. New element resource, if provided, must be added separately'}, 201)
+                    resp.headers['Location'] = url_for('competency_api.competency_by_id', competency_id=competency_id)
+                    return resp
+                except Exception as e:
+                    error_infoset = {'id': 'Database Error',
+                     'description': 'Unable to connect to the database. Please try again later.'}
+                    return make_response(error_infoset, 500)
                     
             try:
                 new_competency, new_element = Competency.from_json(competency_json)
@@ -146,7 +169,14 @@ def competency_by_id(competency_id):
                          'description': 'Specified competency id does not exist'}
             return make_response(error_infoset, 400)
         
-        if len(competency_elements) > 0:
+        try:
+            competency_elements = get_db().count_elements_of_competency(competency_id)
+        except Exception as e:
+            error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+            return make_response(error_infoset, 500)
+        
+        if competency_elements > 0:
             error_infoset = {'id': 'Data Error',
                          'description': 'Unable to delete competency: competency id is associated to 1 or more elements'}
             return make_response(error_infoset, 400)
@@ -170,9 +200,9 @@ def competency_by_id(competency_id):
         return make_response(json_competency, 200)
     
 @bp.route('/competencies/<competency_id>/elements', methods=['GET', 'POST'])
+@conditional('competencies', 'elements')
 def competency_elements(competency_id):
     try:
-        total_elements = get_db().get_elements_of_competency(competency_id)
         competency = get_db().get_competency(competency_id)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
@@ -200,11 +230,17 @@ def competency_elements(competency_id):
                          'description': 'Competency id specified in the URL does not exist'}
                 return make_response(error_infoset, 400) 
             
-            for element in total_elements:
-                if element.element == new_element.element:
-                    error_infoset = {'id': 'Data Error',
-                                     'description': 'Element name already exists for the provided competency id.'}
-                    return make_response(error_infoset, 400)
+            try:
+                name_exists, competency_exists = get_db().validate_element(new_element.element, competency_id)
+            except Exception as e:
+                error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+                return make_response(error_infoset, 500)
+            
+            if name_exists:
+                error_infoset = {'id': 'Data Error',
+                                 'description': 'Element name already exists for the provided competency id.'}
+                return make_response(error_infoset, 400)
             
             try:
                 get_db().add_element(new_element)
@@ -225,33 +261,49 @@ def competency_elements(competency_id):
                                  'description': 'The specified competency could not be found. Make sure it was entered correctly, or try again later.'}
             return make_response(error_infoset, 404)
         
+        try:
+            count = get_db().count_elements_of_competency(competency_id)
+        except Exception as e:
+            error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+            return make_response(error_infoset, 500)
+        
         page_number = 1
         page_size = 50
-        if request.args:
+        cursor = request.args.get('cursor')
+        if request.args and cursor is None:
             page = request.args.get('page')
             if page:
                 page_number = int(page)
-                max_page = math.ceil(len(total_elements) / float(page_size))
+                max_page = math.ceil(count / float(page_size))
                 if page_number < 1 or page_number > max_page:
                     error_infoset = {'id' : 'Invalid Page Number',
                                  'description': f'Page number must be from 1, up to a maximum of {max_page}'}
                     return make_response(error_infoset, 404)
     
+    if cursor is not None:
+        try:
+            key, direction = decode_cursor(cursor, 'competency_api.competency_elements', competency_id=competency_id)
+        except ValueError:
+            return make_response(cursor_error(), 400)
+    
     try:
-        elements, previous_page, next_page = get_db().get_competency_elements_for_api(competency_id, page_size, page_number=page_number)
+        if cursor is not None:
+            elements, has_previous, has_next = get_db().get_competency_elements_by_cursor(competency_id, page_size, key, direction)
+        else:
+            elements, previous_page, next_page = get_db().get_competency_elements_for_api(competency_id, page_size, page_number=page_number)
+            has_previous = previous_page is not None
+            has_next = next_page is not None
+    except ValueError:
+        return make_response(cursor_error(), 400)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                     'description': 'Unable to connect to the database. Please try again later.'}
         return make_response(error_infoset, 500)
     
-    if previous_page is not None:
-        previous_page = url_for('competency_api.competency_elements', competency_id=competency_id, page=previous_page)
-    if next_page is not None:
-        next_page = url_for('competency_api.competency_elements', competency_id=competency_id, page=next_page)
-    current_page = url_for('competency_api.competency_elements', competency_id=competency_id, page=page_number)
+    links = page_links('competency_api.competency_elements', elements, lambda element: (element.competency_id, element.element_id), has_previous, has_next, page_number=page_number, cursor=cursor, competency_id=competency_id)
     
-    count = len(total_elements)
-    json = {'count': count, 'current_page': current_page, 'previous_page': previous_page, 'next_page': next_page, 'results': [element.to_json() for element in elements]}
+    json = {'count': count, **links, 'results': [element.to_json() for element in elements]}
     return make_response(json, 200)
 
 ## Elements being distinguished by element_id makes it meaningless to have routes to specific elements, as well as putting and deleting them.
\ No newline at end of file
@@ -1,5 +1,8 @@
 from flask import (Blueprint, render_template, request, flash, redirect, url_for, abort)
 from .dbmanager import get_db
+from .program_graph import get_program_graph
+from .render_cache import cached_page
+from .grouping import group_by
 from .exceptions import ObjectAlreadyExists
 from .competency import Competency, CompetencyForm
 from flask_login import login_required, current_user
@@ -41,23 +44,28 @@ def add_competency():
     return render_template('form_competency.html', form=form, competency=None, element=None, action='Add')
 
 @bp.route('/reference/')
+@cached_page('competencies', 'elements', 'courses_elements', 'courses')
 def get_competencies():
     try:
-        competencies = get_db().get_competencies()
-        elements = get_db().get_elements()
-        course_competency_groupings = get_db().get_course_competency_groupings()
+        graph = get_program_graph()
+        competencies = graph.get_competencies()
+        elements = graph.get_elements()
+        course_competency_groupings = graph.get_course_competency_groupings()
     except:
         flash('Cannot reach the database')
         return redirect(url_for('home.index'))
     
-    return render_template('competencies_reference.html', competencies=competencies, elements=elements, course_competency_groupings=course_competency_groupings)
+    elements_by_competency = group_by(elements, lambda element: element.competency_id)
+    courses_by_competency = group_by(course_competency_groupings, lambda grouping: grouping[0])
+    return render_template('competencies_reference.html', competencies=competencies, elements_by_competency=elements_by_competency, courses_by_competency=courses_by_competency)
 
 @bp.route('/<id>/')
 def get_competency_by_id(id):
     try:
-        competency = get_db().get_competency(id)
-        competency_elements = get_db().get_elements_of_competency(id)
-        course_competency_groupings = get_db().get_course_competency_groupings()
+        graph = get_program_graph()
+        competency = graph.get_competency(id)
+        competency_elements = graph.get_elements_of_competency(id)
+        course_competency_groupings = graph.get_course_competency_groupings()
     except:
         flash('Cannot reach the database')
         return redirect(url_for('home.index'))
@@ -0,0 +1,50 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from flask import current_app, request, make_response
+from werkzeug.http import is_resource_modified
+from . import cache
+
+## Conditional GET for the /api/v1 handlers. A response is fully determined by the request url and the data in the tables it is built from,
+## so its ETag is derived from the versions of those tables (bumped by every Database write) instead of from the body.
+## That lets a 304 be answered before the handler runs, without a single query. The versions are only trusted while every write
+## reaches them (cache.versions_shared()); otherwise the handler always runs and the ETag is a hash of its body, unless the body is
+## streamed (the exports), which is sent as is rather than read into memory to be hashed.
+
+def conditional(*tables):
+    '''Adds ETag, Last-Modified and Cache-Control to the GET responses of a view built from the given tables, and answers 304 when the client copy is current'''
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+            if not cache.versions_shared():
+                # Another worker may have written without touching the versions of this one: validate against the body instead
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200 or resp.is_streamed:
+                    return resp
+                resp.add_etag()
+                resp.cache_control.public = True
+                resp.cache_control.max_age = current_app.config['API_CACHE_MAX_AGE']
+                resp.cache_control.must_revalidate = True
+                return resp.make_conditional(request)
+
+            versions = [cache.versions.version(table) for table in tables]
+            etag = hashlib.sha1('|'.join([request.full_path] + versions).encode('utf-8')).hexdigest()
+            changed_at = max(cache.versions.changed_at(table) for table in tables)
+            last_modified = datetime.fromtimestamp(int(changed_at), tz=timezone.utc)
+
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                resp = make_response('', 304)
+            else:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+            resp.set_etag(etag)
+            resp.last_modified = last_modified
+            resp.cache_control.public = True
+            resp.cache_control.max_age = current_app.config['API_CACHE_MAX_AGE']
+            resp.cache_control.must_revalidate = True
+            return resp
+        return wrapper
+    return decorator
@@ -1,4 +1,6 @@
 class Course:
+    __slots__ = ('course_id', 'course_title', 'theory_hours', 'lab_hours', 'work_hours', 'description', 'domain_id', 'term_id')
+
     def __init__(self, course_id, course_title, theory_hours, lab_hours, work_hours,  description, domain_id, term_id):
         if not isinstance(course_id, str) or len(course_id) == 0:
             raise TypeError('course_id must be a non-zero string')
@@ -25,6 +27,20 @@ class Course:
         self.description = description
         self.domain_id = domain_id
         self.term_id = term_id
+
+    @classmethod
+    def from_row(cls, course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id):
+        '''Builds a course from a database row without validating it. Doubles as a cursor rowfactory'''
+        course = cls.__new__(cls)
+        course.course_id = course_id
+        course.course_title = course_title
+        course.theory_hours = theory_hours
+        course.lab_hours = lab_hours
+        course.work_hours = work_hours
+        course.description = description
+        course.domain_id = domain_id
+        course.term_id = term_id
+        return course
         
     def __repr__(self):
         return f'Course({self.course_id}, {self.course_title}, {self.theory_hours}, {self.lab_hours}, {self.work_hours}, {self.description}, {self.domain_id}, {self.term_id})' 
@@ -44,7 +60,7 @@ class Course:
         return course
     
     def to_json(self):
-        return self.__dict__
+        return {name: getattr(self, name) for name in self.__slots__}
     
 from flask_wtf import FlaskForm
 from wtforms import StringField, IntegerField, SelectField, TextAreaField
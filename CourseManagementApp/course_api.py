@@ -1,22 +1,18 @@
 from flask import Flask, Blueprint, request, url_for, make_response
 from .dbmanager import get_db
+from .program_graph import get_program_graph
 from .course import Course
 from .element import Element
+from .pagination import decode_cursor, page_links, cursor_error
+from .conditional import conditional
+from .exceptions import CannotFindObject
 import math
 
 bp = Blueprint('course_api', __name__, url_prefix = '/api/v1')
 
 @bp.route('/courses', methods=['GET', 'POST'])
+@conditional('courses')
 def courses():
-    try:
-        total_courses = get_db().get_courses()
-        terms = get_db().get_terms()
-        domains = get_db().get_domains()
-    except Exception as e:
-        error_infoset = {'id': 'Database Error',
-                         'description': 'Unable to connect to the database. Please try again later.'}
-        return make_response(error_infoset, 500)
-    
     if request.method == 'POST':
         course_json = request.json
         
@@ -28,27 +24,23 @@ def courses():
                          'description': 'Data must contain complete course information, and formatted as dictionary object'}
                 return make_response(error_infoset, 400)
             
-            for course in total_courses:
-                if course.course_id == new_course.course_id:
-                    error_infoset = {'id': 'Data Error',
-                         'description': 'Specified course id already exists'}
-                    return make_response(error_infoset, 400)
+            try:
+                course_exists, valid_term, valid_domain = get_db().validate_course(new_course.course_id, new_course.term_id, new_course.domain_id)
+            except Exception as e:
+                error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+                return make_response(error_infoset, 500)
+            
+            if course_exists:
+                error_infoset = {'id': 'Data Error',
+                     'description': 'Specified course id already exists'}
+                return make_response(error_infoset, 400)
                 
-            valid_term = False
-            for term in terms:
-                if new_course.term_id == term.term_id:
-                    valid_term = True
-                    break
             if not valid_term:
                 error_infoset = {'id': 'Data Error',
                         'description': 'Specified term id does not exist'}
                 return make_response(error_infoset, 400)
                 
-            valid_domain = False
-            for domain in domains:
-                if new_course.domain_id == domain.domain_id:
-                    valid_domain = True
-                    break      
             if not valid_domain:
                 error_infoset = {'id': 'Data Error',
                         'description': 'Specified domain id does not exist'}
@@ -68,42 +60,56 @@ def courses():
                     
         
     elif request.method == 'GET':
+        try:
+            count = get_db().count_courses()
+        except Exception as e:
+            error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+            return make_response(error_infoset, 500)
+        
         page_number = 1
         page_size = 50
-        if request.args:
+        cursor = request.args.get('cursor')
+        if request.args and cursor is None:
             page = request.args.get('page')
             if page:
                 page_number = int(page)
-                max_page = math.ceil(len(total_courses) / float(page_size))
+                max_page = math.ceil(count / float(page_size))
                 if page_number < 1 or page_number > max_page:
                     error_infoset = {'id' : 'Invalid Page Number',
                                  'description': f'Page number must be from 1, up to a maximum of {max_page}'}
                     return make_response(error_infoset, 404)
     
+    if cursor is not None:
+        try:
+            key, direction = decode_cursor(cursor, 'course_api.courses')
+        except ValueError:
+            return make_response(cursor_error(), 400)
+    
     try:
-        courses, previous_page, next_page = get_db().get_courses_for_api(page_size, page_number=page_number)
+        if cursor is not None:
+            courses, has_previous, has_next = get_db().get_courses_by_cursor(page_size, key, direction)
+        else:
+            courses, previous_page, next_page = get_db().get_courses_for_api(page_size, page_number=page_number)
+            has_previous = previous_page is not None
+            has_next = next_page is not None
+    except ValueError:
+        return make_response(cursor_error(), 400)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                     'description': 'Unable to connect to the database. Please try again later.'}
         return make_response(error_infoset, 500)
     
-    if previous_page is not None:
-        previous_page = url_for('course_api.courses', page=previous_page)
-    if next_page is not None:
-        next_page = url_for('course_api.courses', page=next_page)
-    current_page = url_for('course_api.courses', page=page_number)
+    links = page_links('course_api.courses', courses, lambda course: (course.term_id, course.course_id), has_previous, has_next, page_number=page_number, cursor=cursor)
     
-    count = len(total_courses)
-    json = {'count': count, 'current_page': current_page, 'previous_page': previous_page, 'next_page': next_page, 'results': [course.to_json() for course in courses]}
+    json = {'count': count, **links, 'results': [course.to_json() for course in courses]}
     return make_response(json, 200)
 
 @bp.route('courses/<course_id>', methods=['GET', 'PUT', 'DELETE'])
+@conditional('courses')
 def course_by_id(course_id):
     try:
         course = get_db().get_course(course_id)
-        courses = get_db().get_courses()
-        terms = get_db().get_terms()
-        domains = get_db().get_domains()
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                          'description': 'Unable to connect to the database. Please try again later.'}
@@ -120,33 +126,33 @@ def course_by_id(course_id):
                          'description': 'Data must contain complete course information, and formatted as dictionary object'}
                 return make_response(error_infoset, 400)
             
-            for term in terms:
-                if new_course.term_id == term.term_id:
-                    break
-                else:
-                    error_infoset = {'id': 'Data Error',
-                         'description': 'Specified term id does not exist'}
-                    return make_response(error_infoset, 400)
+            try:
+                course_exists, valid_term, valid_domain = get_db().validate_course(new_course.course_id, new_course.term_id, new_course.domain_id)
+            except Exception as e:
+                error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+                return make_response(error_infoset, 500)
+            
+            if not valid_term:
+                error_infoset = {'id': 'Data Error',
+                     'description': 'Specified term id does not exist'}
+                return make_response(error_infoset, 400)
                 
-            for domain in domains:
-                if new_course.domain_id == domain.domain_id:
-                    break
-                else:
-                    error_infoset = {'id': 'Data Error',
-                         'description': 'Specified domain id does not exist'}
-                    return make_response(error_infoset, 400)
+            if not valid_domain:
+                error_infoset = {'id': 'Data Error',
+                     'description': 'Specified domain id does not exist'}
+                return make_response(error_infoset, 400)
             
-            for course in courses:
-                if course.course_id == new_course.course_id:
-                    try:
-                        get_db().edit_course(new_course)
-                        resp = make_response({'id': 'Request Complete', 'description': 'Update Course Request Complete'}, 201)
-                        resp.headers['Location'] = url_for('course_api.course_by_id', course_id=course_id)
-                        return resp
-                    except Exception as e:
-                        error_infoset = {'id': 'Database Error',
-                         'description': 'Unable to connect to the database. Please try again later.'}
-                        return make_response(error_infoset, 500)
+            if course_exists:
+                try:
+                    get_db().edit_course(new_course)
+                    resp = make_response({'id': 'Request Complete', 'description': 'Update Course Request Complete'}, 201)
+                    resp.headers['Location'] = url_for('course_api.course_by_id', course_id=course_id)
+                    return resp
+                except Exception as e:
+                    error_infoset = {'id': 'Database Error',
+                     'description': 'Unable to connect to the database. Please try again later.'}
+                    return make_response(error_infoset, 500)
             
             try:
                 get_db().add_course(new_course)
@@ -187,57 +193,69 @@ def course_by_id(course_id):
 ## It's still meaningful to view the connection between courses and competencies, due secondarily to the connected elements.
 
 @bp.route('/courses/<course_id>/competencies', methods=['GET'])
+@conditional('courses', 'courses_elements', 'elements', 'competencies')
 def course_competencies(course_id):
     try:
-        total_course_competencies = get_db().get_competencies_of_course(course_id)
+        count = get_db().count_competencies_of_course(course_id)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                          'description': 'Unable to connect to the database. Please try again later.'}
         return make_response(error_infoset, 500)
     
     if request.method == 'GET':
-        if len(total_course_competencies) == 0:
+        if count == 0:
             error_infoset = {'id' : 'Not Found',
                                  'description': 'The specified course could not be found. Make sure it was entered correctly, or try again later.'}
             return make_response(error_infoset, 404) 
         
         page_number = 1
         page_size = 50
-        if request.args:
+        cursor = request.args.get('cursor')
+        if request.args and cursor is None:
             page = request.args.get('page')
             if page:
                 page_number = int(page)
-                max_page = math.ceil(len(total_course_competencies) / float(page_size))
+                max_page = math.ceil(count / float(page_size))
                 if page_number < 1 or page_number > max_page:
                     error_infoset = {'id' : 'Invalid Page Number',
                                  'description': f'Page number must be from 1, up to a maximum of {max_page}'}
                     return make_response(error_infoset, 404)
                 
+    if cursor is not None:
+        try:
+            key, direction = decode_cursor(cursor, 'course_api.course_competencies', course_id=course_id)
+        except ValueError:
+            return make_response(cursor_error(), 400)
+    
     try:
-        competencies, previous_page, next_page = get_db().get_course_competencies_for_api(course_id, page_size, page_number=page_number)
+        if cursor is not None:
+            competencies, has_previous, has_next = get_db().get_course_competencies_by_cursor(course_id, page_size, key, direction)
+        else:
+            competencies, previous_page, next_page = get_db().get_course_competencies_for_api(course_id, page_size, page_number=page_number)
+            has_previous = previous_page is not None
+            has_next = next_page is not None
+    except ValueError:
+        return make_response(cursor_error(), 400)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
-            'description': 'Unable to connect to the database. Please try again later.'}
+                    'description': 'Unable to connect to the database. Please try again later.'}
         return make_response(error_infoset, 500)
     
-    if previous_page is not None:
-        previous_page = url_for('course_api.course_competencies', course_id=course_id, page=previous_page)
-    if next_page is not None:
-        next_page = url_for('course_api.course_competencies', course_id=course_id, page=next_page)
-    current_page = url_for('course_api.course_competencies', course_id=course_id, page=page_number)
+    links = page_links('course_api.course_competencies', competencies, lambda competency: (competency.competency_id,), has_previous, has_next, page_number=page_number, cursor=cursor, course_id=course_id)
     
-    count = len(total_course_competencies)
-    json = {'count': count, 'current_page': current_page, 'previous_page': previous_page, 'next_page': next_page, 'results': [competency.to_json() for competency in competencies]}
+    json = {'count': count, **links, 'results': [competency.to_json() for competency in competencies]}
     return make_response(json, 200)
 
 ## Due to the same reason as the above route, PUT requests are meaningless due to the lack of direct connection between courses and competencies.
 ## Likewise, delete has the potential to fail if a course isn't linked to a competency via any element. 
 
 @bp.route('/courses/<course_id>/competencies/<competency_id>', methods=['GET'])
+@conditional('courses', 'competencies')
 def course_competency_by_id(course_id, competency_id):
     try:
-        competency = get_db().get_competency(competency_id)
-        course = get_db().get_course(course_id)
+        graph = get_program_graph()
+        competency = graph.get_competency(competency_id)
+        course = graph.get_course(course_id)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                          'description': 'Unable to connect to the database. Please try again later.'}
@@ -254,12 +272,10 @@ def course_competency_by_id(course_id, competency_id):
         return make_response(json_competency, 200)
     
 @bp.route('/courses/<course_id>/competencies/<competency_id>/elements', methods=['GET', 'POST'])
+@conditional('courses', 'courses_elements', 'elements', 'competencies')
 def course_elements(course_id, competency_id):
     try:
-        total_competency_elements = get_db().get_elements_of_competency(competency_id)
-        course = get_db().get_course(course_id)
-        total_course_elements = get_db().get_elements_of_course(course_id)
-        course_competency = get_db().get_competency(competency_id)
+        course_exists, competency_exists, count = get_db().validate_course_competency(course_id, competency_id)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                          'description': 'Unable to connect to the database. Please try again later.'}
@@ -281,16 +297,22 @@ def course_elements(course_id, competency_id):
                          'description': 'Competency id specified in the URL must match the submitted element competency id'}
                 return make_response(error_infoset, 400)
             
-            if course_competency is None:
+            if not competency_exists:
                 error_infoset = {'id': 'Data Error',
                          'description': 'Competency id specified in the URL does not exist'}
                 return make_response(error_infoset, 400) 
             
-            for element in total_competency_elements:
-                if element.element == new_element.element:
-                    error_infoset = {'id': 'Data Error',
-                                     'description': 'Element name already exists for the provided competency id.'}
-                    return make_response(error_infoset, 400)
+            try:
+                name_exists, competency_exists = get_db().validate_element(new_element.element, competency_id)
+            except Exception as e:
+                error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+                return make_response(error_infoset, 500)
+            
+            if name_exists:
+                error_infoset = {'id': 'Data Error',
+                                 'description': 'Element name already exists for the provided competency id.'}
+                return make_response(error_infoset, 400)
             
             try:
                 get_db().add_element(new_element)
@@ -308,39 +330,89 @@ def course_elements(course_id, competency_id):
                     
         
     elif request.method == 'GET':
-        if len(total_course_elements) == 0 or course is None or course_competency is None:
+        if count == 0 or not course_exists or not competency_exists:
             error_infoset = {'id' : 'Not Found',
                                  'description': 'The specified course or competency could not be found. Make sure each was entered correctly, or try again later.'}
             return make_response(error_infoset, 404)
         
         page_number = 1
         page_size = 50
-        if request.args:
+        cursor = request.args.get('cursor')
+        if request.args and cursor is None:
             page = request.args.get('page')
             if page:
                 page_number = int(page)
-                max_page = math.ceil(len(total_course_elements) / float(page_size))
+                max_page = math.ceil(count / float(page_size))
                 if page_number < 1 or page_number > max_page:
                     error_infoset = {'id' : 'Invalid Page Number',
                                  'description': f'Page number must be from 1, up to a maximum of {max_page}'}
                     return make_response(error_infoset, 404)
     
+    if cursor is not None:
+        try:
+            key, direction = decode_cursor(cursor, 'course_api.course_elements', course_id=course_id, competency_id=competency_id)
+        except ValueError:
+            return make_response(cursor_error(), 400)
+    
     try:
-        elements, previous_page, next_page = get_db().get_course_elements_for_api(course_id, competency_id, page_size, page_number=page_number)
+        if cursor is not None:
+            elements, has_previous, has_next = get_db().get_course_elements_by_cursor(course_id, competency_id, page_size, key, direction)
+        else:
+            elements, previous_page, next_page = get_db().get_course_elements_for_api(course_id, competency_id, page_size, page_number=page_number)
+            has_previous = previous_page is not None
+            has_next = next_page is not None
+    except ValueError:
+        return make_response(cursor_error(), 400)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                     'description': 'Unable to connect to the database. Please try again later.'}
         return make_response(error_infoset, 500)
     
-    if previous_page is not None:
-        previous_page = url_for('course_api.course_elements', course_id=course_id, competency_id=competency_id, page=previous_page)
-    if next_page is not None:
-        next_page = url_for('course_api.course_elements', course_id=course_id, competency_id=competency_id, page=next_page)
-    current_page = url_for('course_api.course_elements', course_id=course_id, competency_id=competency_id, page=page_number)
+    links = page_links('course_api.course_elements', elements, lambda element: (element.competency_id, element.element_id), has_previous, has_next, page_number=page_number, cursor=cursor, course_id=course_id, competency_id=competency_id)
     
-    count = len(total_course_elements)
-    json = {'count': count, 'current_page': current_page, 'previous_page': previous_page, 'next_page': next_page, 'results': [element.to_json() for element in elements]}
+    json = {'count': count, **links, 'results': [element.to_json() for element in elements]}
     return make_response(json, 200)
 
 ## Since elements are uniquely distinguished by an element_id, a property that is never seen by the user as it's strictly database side, there is no use in having a
-## route for specific elements.
\ No newline at end of file
+## route for specific elements.
+## Batch changes to the course-element links: {"upserts": [{"course_id", "element_id", "element_hours"}], "deletes": [{"course_id", "element_id"}]}.
+## Everything is applied in one transaction (nothing is applied if any link is invalid), and the response gives the new element hour total
+## of every course touched next to the total it should reach, (theory_hours + lab_hours) * 15.
+
+@bp.route('/course_elements', methods=['POST'])
+def course_elements_batch():
+    batch_json = request.json
+    try:
+        upserts = [(link['course_id'], link['element_id'], link['element_hours']) for link in batch_json.get('upserts', [])]
+        deletes = [(link['course_id'], link['element_id']) for link in batch_json.get('deletes', [])]
+        for link in upserts + deletes:
+            if not isinstance(link[0], str) or not isinstance(link[1], int):
+                raise TypeError('course_id must be a string and element_id an int')
+        for link in upserts:
+            if not isinstance(link[2], (int, float)) or link[2] < 0:
+                raise TypeError('element_hours must be a positive number')
+    except Exception as e:
+        error_infoset = {'id': 'Data Error',
+                         'description': 'Data must be a dictionary of upserts (course_id, element_id, element_hours) and deletes (course_id, element_id)'}
+        return make_response(error_infoset, 400)
+    
+    if len(upserts) + len(deletes) == 0:
+        error_infoset = {'id': 'Data Error',
+                         'description': 'No upserts or deletes to apply'}
+        return make_response(error_infoset, 400)
+    
+    try:
+        totals = get_db().apply_course_element_changes(upserts, deletes)
+    except CannotFindObject as e:
+        error_infoset = {'id': 'Data Error',
+                         'description': 'A course or element in the batch does not exist. No changes were applied'}
+        return make_response(error_infoset, 400)
+    except Exception as e:
+        error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+        return make_response(error_infoset, 500)
+    
+    json = {'id': 'Request Complete', 'upserted': len(upserts), 'deleted': len(deletes),
+            'courses': [{'course_id': course_id, 'element_hours': element_hours, 'expected_hours': expected_hours, 'hours_match': element_hours == expected_hours}
+                        for course_id, element_hours, expected_hours in totals]}
+    return make_response(json, 200)
@@ -1,5 +1,7 @@
+import math
 from flask import (Blueprint, render_template, request, flash, abort, redirect, url_for)
 from .dbmanager import get_db
+from .program_graph import get_program_graph
 from .exceptions import ObjectAlreadyExists, CannotFindObject
 from flask_login import current_user
 bp = Blueprint('course_elements', __name__, url_prefix='/course_elements/form/')
@@ -30,33 +32,51 @@ def add_course_elements():
             flash('Cannot reach the database')
     return render_template('form_course_elements.html', elements=elements, competencies=competencies, courses=courses, terms=terms)
 
+def linked_pairing(grouping):
+    '''(course_id, element_id) of a "course_element" form value when that link exists, checked against the database itself since the form may come from a stale graph'''
+    course_id, _, element_id = grouping.rpartition('_')
+    try:
+        element_id = int(element_id)
+        if get_db().course_element_exists(course_id, element_id):
+            return course_id, element_id
+    except ValueError:
+        pass
+    return None, None
+
 @bp.route('/edit/', methods=['GET', 'POST'])
 def edit_course_elements():
     try:
-        course_element_groupings = get_db().get_course_element_groupings()
+        course_element_groupings = get_program_graph().get_course_element_groupings()
     except:
         flash('Cannot reach the database')
         return redirect(url_for('home.index'))
         
     if request.method == 'POST':
-        course_element_pairing = request.form['grouping'].split('_')
-        course_id = course_element_pairing[0]
-        element_id = int(course_element_pairing[1])
-        new_hours = request.form['element_hours'] 
         try:
-            get_db().edit_course_element_hours(course_id, element_id, new_hours)
-            course_element_groupings = get_db().get_course_element_groupings()
-            
-            exists = False
-            for grouping in course_element_groupings:
-                if grouping[0] == course_id and grouping[2] == element_id:
-                    exists = True
-                    break
-            if not exists:
-                flash('Course-element link does not exist')
-                return redirect(url_for('home'))
-            
-            flash('Course-Element link updated with new hours. Ensure total course-element hours match expected total course hours')
+            course_id, element_id = linked_pairing(request.form['grouping'])
+        except:
+            flash('Cannot reach the database')
+            return redirect(url_for('home.index'))
+        if course_id is None:
+            flash('Course-element link does not exist')
+            return redirect(url_for('home.index'))
+        try:
+            new_hours = float(request.form['element_hours'])
+        except ValueError:
+            new_hours = -1
+        if not math.isfinite(new_hours) or new_hours < 0:
+            flash('Element hours must be a positive number')
+            return render_template('form_course_elements_edit.html', course_element_groupings=course_element_groupings)
+        if new_hours.is_integer():
+            new_hours = int(new_hours)
+        
+        try:
+            totals = get_db().apply_course_element_changes([(course_id, element_id, new_hours)], [])
+            for total_course_id, element_hours, expected_hours in totals:
+                if element_hours != expected_hours:
+                    flash(f'Course-Element link updated with new hours. {total_course_id} element hours ({element_hours}) do not match the expected total course hours ({expected_hours})')
+                else:
+                    flash(f'Course-Element link updated with new hours. {total_course_id} element hours match the expected total course hours')
             return redirect(url_for('home.index'))
         except CannotFindObject as e:
             flash(str(e))
@@ -67,22 +87,18 @@ def edit_course_elements():
 @bp.route('/delete/', methods=['GET', 'POST'])
 def delete_course_elements():
     try:
-        course_element_groupings = get_db().get_course_element_groupings()
+        course_element_groupings = get_program_graph().get_course_element_groupings()
     except:
         flash('Cannot reach the database')
         return redirect(url_for('home.index'))
         
     if request.method == 'POST':
-        course_element_pairing = request.form['grouping'].split('_')
-        course_id = course_element_pairing[0]
-        element_id = int(course_element_pairing[1])
-        
-        exists = False
-        for grouping in course_element_groupings:
-            if grouping[0] == course_id and grouping[2] == element_id:
-                exists = True
-                break
-        if not exists:
+        try:
+            course_id, element_id = linked_pairing(request.form['grouping'])
+        except:
+            flash('Cannot reach the database')
+            return redirect(url_for('home.index'))
+        if course_id is None:
             flash('Course-element link does not exist')
             return redirect(url_for('home.index'))
         
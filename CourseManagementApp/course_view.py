@@ -2,27 +2,25 @@ from flask import (Blueprint, render_template, request, flash, redirect, url_for
 from .dbmanager import get_db
 from .exceptions import ObjectAlreadyExists, CannotFindObject
 from .course import Course, CourseForm
+from .render_cache import cached_page
+from .grouping import group_by
+from .program_graph import get_program_graph
 from flask_login import login_required, current_user
 bp = Blueprint('course', __name__, url_prefix='/course/')
 
 @bp.route('/<id>/')
+@cached_page('courses', 'domains', 'competencies', 'elements', 'courses_elements')
 def get_course_by_id(id):
     try:
-        course = get_db().get_course(id)
-        course_competencies = get_db().get_competencies_of_course(id)
-        course_elements = get_db().get_elements_of_course(id)
-        course_domain = get_db().get_domain_of_course(id)
-        course_element_hours = get_db().get_course_element_hours(id)
+        bundle = get_program_graph().get_course_bundle(id)
     except:
         flash('Cannot reach the database')
         return redirect(url_for('home.index'))
     
-    total_element_hours = 0
-    for element_hours in course_element_hours:
-        total_element_hours += element_hours[1]
-        
-    if course is not None and course_competencies is not None and course_elements is not None and course_domain is not None and course_element_hours is not None:
-        return render_template('specific_course.html', course=course, course_competencies=course_competencies, course_elements=course_elements, course_domain=course_domain, course_element_hours=course_element_hours, total_element_hours=total_element_hours)
+    if bundle is not None:
+        course, course_domain, course_competencies, course_elements, course_element_hours, total_element_hours = bundle
+        elements_by_competency = group_by(course_elements, lambda element: element.competency_id)
+        return render_template('specific_course.html', course=course, course_competencies=course_competencies, elements_by_competency=elements_by_competency, course_domain=course_domain, course_element_hours=dict(course_element_hours), total_element_hours=total_element_hours)
     else:
         flash('Specified course and related information not found')
         abort(404)
@@ -1,4 +1,3 @@
-import oracledb
 from .user import Member, AdminUser, ServerAdmin
 from .course import Course
 from .term import Term
@@ -6,27 +5,43 @@ from .domain import Domain
 from .competency import Competency
 from .element import Element
 from .exceptions import ObjectAlreadyExists, CannotFindObject
+from .backends import get_default_backend
+from . import cache
+from .instrumentation import instrument
+from contextlib import contextmanager
 import os
+
+# Oracle rejects IN lists longer than this
+IN_LIST_LIMIT = 1000
+
 class Database:
-    def __init__(self, autocommit=True):
+    def __init__(self, autocommit=True, backend=None):
+        if backend is None:
+            backend = get_default_backend()
+        self.__backend = backend
         self.__connection = self.__connect()
         self.__connection.autocommit = autocommit
 
+    @property
+    def backend(self):
+        return self.__backend
+
     def run_file(self, file_path):
-        statement_parts = []
-        with self.__connection.cursor() as cursor:
-            with open(file_path, 'r') as f:
-                for line in f:
-                    statement_parts.append(line)
-                    if line.strip('\n').strip('\n\r').strip().endswith(';'):
-                        statement = "".join(
-                            statement_parts).strip().rstrip(';')
-                        if statement:
-                            try:
-                                cursor.execute(statement)
-                            except Exception as e:
-                                print(e)
-                        statement_parts = []
+        self.__backend.run_file(self.__connection, file_path)
+
+    @contextmanager
+    def transaction(self):
+        '''Runs the enclosed writes as one transaction, committed at the end or rolled back on error'''
+        autocommit = self.__connection.autocommit
+        self.__connection.autocommit = False
+        try:
+            yield
+            self.__connection.commit()
+        except:
+            self.__connection.rollback()
+            raise
+        finally:
+            self.__connection.autocommit = autocommit
     
     # User Functions
     def add_user(self, user):
@@ -42,14 +57,15 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute("INSERT INTO course_users(name,password,email,access_group,date_created, blocked) VALUES(:name, :password, :email, :access_group, :date_created, :blocked)", 
                                name=user.name, password=user.password, email=user.email, access_group=access_group, date_created=user.date_created, blocked=blocked)
-        except oracledb.IntegrityError:
+        except self.__backend.IntegrityError:
             raise ObjectAlreadyExists('Email already taken')
         
     def edit_user(self, name, email):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute("update course_users set name=:name where email=:email", name=name, email=email)
-        except oracledb.IntegrityError:
+            cache.changed('course_users')
+        except self.__backend.IntegrityError:
             raise CannotFindObject('Object does not exist')
 
     def update_user_pwd(self, email, new_pwd):
@@ -57,7 +73,8 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute("update course_users set password=:new_password where email=:email",
                                new_password=new_pwd,email=email)
-        except oracledb.IntegrityError:
+            cache.changed('course_users')
+        except self.__backend.IntegrityError:
             raise CannotFindObject('Object does not exist')
         
     def get_users(self):
@@ -95,7 +112,7 @@ class Database:
                 for row in results:
                     user = self.convert_user_group(row)
                     return user
-        except oracledb.IntegrityError as e:
+        except self.__backend.IntegrityError as e:
             return None
         
     def block_user_db(self,email):
@@ -107,18 +124,25 @@ class Database:
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('UPDATE course_users SET blocked=:block_status WHERE email=:email', block_status=block, email=email)
-        except oracledb.IntegrityError as e:
+            cache.changed('course_users')
+        except self.__backend.IntegrityError as e:
             return CannotFindObject("User does not exist")
 
         
     def get_user_by_id(self, user_id):
+        if not cache.versions_shared():
+            # A block or deletion made by another worker would not evict the cached user: always read it
+            return self.__load_user(user_id)
+        return cache.user_cache.get_or_load('course_users', user_id, lambda: self.__load_user(user_id))
+
+    def __load_user(self, user_id):
         try:
             with self.__get_cursor() as cursor:
                 results = cursor.execute('SELECT name, password, email, access_group, user_id, date_created, blocked FROM course_users WHERE user_id=:user_id', user_id=user_id)
                 for row in results:
                     user = self.convert_user_group(row)
                     return user
-        except oracledb.IntegrityError as e:
+        except self.__backend.IntegrityError as e:
             return None
         
     def edit_user_group(self, new_group, email):
@@ -131,14 +155,16 @@ class Database:
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('UPDATE course_users SET access_group=:access_group WHERE email=:email', access_group=new_group, email=email)
-        except oracledb.IntegrityError as e:
+            cache.changed('course_users')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('User does not exist')
         
     def del_user(self, email):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('DELETE FROM course_users WHERE email=:email', email=email)
-        except oracledb.IntegrityError as e:
+            cache.changed('course_users')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('User does not exist')
     
     # Term Functions
@@ -147,31 +173,31 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute("INSERT INTO terms (term_id, term_name) VALUES(:term_id, :term_name)", 
                                term_id=term.term_id, term_name=term.term_name)
-        except oracledb.IntegrityError as e:
+            cache.changed('terms')
+        except self.__backend.IntegrityError as e:
             raise ObjectAlreadyExists('Term already exists')
     
     def get_term(self, term_id):
+        return cache.entity_cache.get_or_load('terms', term_id, lambda: self.__load_term(term_id))
+
+    def __load_term(self, term_id):
         try:
             with self.__get_cursor() as cursor:
                 results = cursor.execute('SELECT term_id, term_name FROM terms WHERE term_id=:term_id', term_id=term_id)
                 for row in results:
-                    term = Term(row[0])
-                    if 'Fall' not in row[1] and 'Winter' not in row[1]:
-                        term.term_name = row[1]
+                    term = Term.from_row(*row)
                     return term
-        except oracledb.IntegrityError as e:
+        except self.__backend.IntegrityError as e:
             return None
     
     def get_terms(self):
-        terms = []
+        return cache.entity_cache.get_or_load('terms', 'all', self.__load_terms)
+
+    def __load_terms(self):
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT term_id, term_name FROM terms ORDER BY term_id')
-            for row in results:
-                term = Term(row[0])
-                if 'Fall' not in row[1] and 'Winter' not in row[1]:
-                    term.term_name = row[1]
-                terms.append(term)
-        return terms
+            cursor.execute('SELECT term_id, term_name FROM terms ORDER BY term_id')
+            cursor.rowfactory = Term.from_row
+            return cursor.fetchall()
     
     def get_terms_for_api(self, page_size, page_number):
         terms = []
@@ -179,31 +205,45 @@ class Database:
         next_page = None
         offset = (page_number - 1) * page_size
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT term_id, term_name FROM terms ORDER BY term_id OFFSET :offset ROWS FETCH NEXT :page_size ROWS ONLY', 
+            results = cursor.execute('SELECT term_id, term_name FROM terms ORDER BY term_id ' + self.__backend.page_clause, 
                                         offset=offset, page_size=page_size)
             for row in results:
-                term = Term(row[0])
-                if 'Fall' not in row[1] and 'Winter' not in row[1]:
-                    term.term_name = row[1]
+                term = Term.from_row(*row)
                 terms.append(term)
         if page_number > 1:
             previous_page = page_number - 1
         if len(terms) > 0 and (len(terms) >= page_size):
             next_page = page_number + 1
         return terms, previous_page, next_page
+
+    def get_terms_by_cursor(self, page_size, key, direction):
+        terms = []
+        rows, has_previous, has_next = self.__seek_rows('SELECT term_id, term_name FROM terms', [], ['term_id'], key, direction, page_size)
+        for row in rows:
+            term = Term.from_row(*row)
+            terms.append(term)
+        return terms, has_previous, has_next
+        
+    def count_terms(self):
+        return self.__fetch_value('SELECT COUNT(*) FROM terms')
+    
+    def term_exists(self, term_id):
+        return self.__fetch_value('SELECT COUNT(*) FROM terms WHERE term_id=:term_id', term_id=term_id) > 0
         
     def edit_term(self, term_id, new_term):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('UPDATE terms SET term_name=:term_name WHERE term_id=:term_id', term_name=new_term.term_name, term_id=term_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('terms')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Term does not exist')
         
     def del_term(self, term_id):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('DELETE FROM terms WHERE term_id=:term_id', term_id=term_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('terms')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Term does not exist')
     
     # Domain Functions
@@ -212,29 +252,31 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute("INSERT INTO domains (domain, domain_description) VALUES(:domain, :domain_description)", 
                                domain=domain.domain, domain_description=domain.domain_description)
-        except oracledb.IntegrityError as e:
+            cache.changed('domains')
+        except self.__backend.IntegrityError as e:
             raise ObjectAlreadyExists('Domain already exists')
     
     def get_domain(self, domain_id):
+        return cache.entity_cache.get_or_load('domains', domain_id, lambda: self.__load_domain(domain_id))
+
+    def __load_domain(self, domain_id):
         try:
             with self.__get_cursor() as cursor:
                 results = cursor.execute('SELECT domain_id, domain, domain_description FROM domains WHERE domain_id=:domain_id', domain_id=domain_id)
                 for row in results:
-                    domain = Domain(row[1], row[2])
-                    domain.domain_id = row[0]
+                    domain = Domain.from_row(*row)
                     return domain
-        except oracledb.IntegrityError as e:
+        except self.__backend.IntegrityError as e:
             return None
     
     def get_domains(self):
-        domains = []
+        return cache.entity_cache.get_or_load('domains', 'all', self.__load_domains)
+
+    def __load_domains(self):
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT domain_id, domain, domain_description FROM domains ORDER BY domain_id')
-            for row in results:
-                domain = Domain(row[1], row[2])
-                domain.domain_id = row[0]
-                domains.append(domain)
-        return domains
+            cursor.execute('SELECT domain_id, domain, domain_description FROM domains ORDER BY domain_id')
+            cursor.rowfactory = Domain.from_row
+            return cursor.fetchall()
     
     def get_domains_for_api(self, page_size, page_number):
         domains = []
@@ -242,37 +284,56 @@ class Database:
         next_page = None
         offset = (page_number - 1) * page_size
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT domain_id, domain, domain_description FROM domains ORDER BY domain_id OFFSET :offset ROWS FETCH NEXT :page_size ROWS ONLY', 
+            results = cursor.execute('SELECT domain_id, domain, domain_description FROM domains ORDER BY domain_id ' + self.__backend.page_clause, 
                                         offset=offset, page_size=page_size)
             for row in results:
-                domain = Domain(row[1], row[2])
-                domain.domain_id = row[0]
+                domain = Domain.from_row(*row)
                 domains.append(domain)
         if page_number > 1:
             previous_page = page_number - 1
         if len(domains) > 0 and (len(domains) >= page_size):
             next_page = page_number + 1
         return domains, previous_page, next_page
+
+    def get_domains_by_cursor(self, page_size, key, direction):
+        domains = []
+        rows, has_previous, has_next = self.__seek_rows('SELECT domain_id, domain, domain_description FROM domains', [], ['domain_id'], key, direction, page_size)
+        for row in rows:
+            domain = Domain.from_row(*row)
+            domains.append(domain)
+        return domains, has_previous, has_next
+        
+    def count_domains(self):
+        return self.__fetch_value('SELECT COUNT(*) FROM domains')
+    
+    def domain_exists(self, domain_id):
+        return self.__fetch_value('SELECT COUNT(*) FROM domains WHERE domain_id=:domain_id', domain_id=domain_id) > 0
+    
+    def domain_name_exists(self, domain):
+        return self.__fetch_value('SELECT COUNT(*) FROM domains WHERE domain=:domain', domain=domain) > 0
         
     def edit_domain(self, updated_domain):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('UPDATE domains SET domain=:domain, domain_description=:domain_desc WHERE domain_id=:domain_id', domain=updated_domain.domain, domain_desc=updated_domain.domain_description, domain_id=updated_domain.domain_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('domains')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Domain does not exist')
         
     def del_domain(self, domain_id):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('DELETE FROM domains WHERE domain_id=:domain_id', domain_id=domain_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('domains')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Domain does not exist')
         
     def del_domain_for_unit_test(self, domain):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('DELETE FROM domains WHERE domain=:domain', domain=domain)
-        except oracledb.IntegrityError as e:
+            cache.changed('domains')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Domain does not exist')
     
     # Course Functions
@@ -281,7 +342,8 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute("INSERT INTO courses (course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id) VALUES(:course_id, :course_title, :theory_hours, :lab_hours, :work_hours, :description, :domain_id, :term_id)", 
                                course_id=course.course_id, course_title=course.course_title, theory_hours=course.theory_hours, lab_hours=course.lab_hours, work_hours=course.work_hours, description=course.description, domain_id=course.domain_id, term_id=course.term_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('courses')
+        except self.__backend.IntegrityError as e:
             raise ObjectAlreadyExists('Course already exists')
     
     def edit_course(self, course):
@@ -289,7 +351,8 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute("UPDATE courses SET course_title=:course_title,theory_hours=:theory_hours,lab_hours=:lab_hours,work_hours=:work_hours,description=:description,domain_id=:domain_id,term_id=:term_id where course_id=:course_id",
                                 course_title=course.course_title, theory_hours=course.theory_hours, lab_hours=course.lab_hours, work_hours=course.work_hours, description=course.description, domain_id=course.domain_id, term_id=course.term_id, course_id=course.course_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('courses')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Course does not exist')
 
     def get_course(self, course_id):
@@ -297,19 +360,16 @@ class Database:
             with self.__get_cursor() as cursor:
                 results = cursor.execute('SELECT course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id FROM courses WHERE course_id=:course_id', course_id=course_id)
                 for row in results:
-                    course = Course(row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7])
+                    course = Course.from_row(*row)
                     return course
-        except oracledb.IntegrityError as e:
+        except self.__backend.IntegrityError as e:
             return None
     
     def get_courses(self):
-        courses = []
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id FROM courses ORDER BY term_id, course_id')
-            for row in results:
-                course = Course(row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7])
-                courses.append(course)
-        return courses
+            cursor.execute('SELECT course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id FROM courses ORDER BY term_id, course_id')
+            cursor.rowfactory = Course.from_row
+            return cursor.fetchall()
         
     def get_courses_for_api(self, page_size, page_number):
         courses = []
@@ -317,22 +377,46 @@ class Database:
         next_page = None
         offset = (page_number - 1) * page_size
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id FROM courses ORDER BY term_id, course_id OFFSET :offset ROWS FETCH NEXT :page_size ROWS ONLY', 
+            results = cursor.execute('SELECT course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id FROM courses ORDER BY term_id, course_id ' + self.__backend.page_clause, 
                                         offset=offset, page_size=page_size)
             for row in results:
-                course = Course(row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7])
+                course = Course.from_row(*row)
                 courses.append(course)
         if page_number > 1:
             previous_page = page_number - 1
         if len(courses) > 0 and (len(courses) >= page_size):
             next_page = page_number + 1
         return courses, previous_page, next_page
+
+    def get_courses_by_cursor(self, page_size, key, direction):
+        courses = []
+        rows, has_previous, has_next = self.__seek_rows('SELECT course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id FROM courses', [], ['term_id', 'course_id'], key, direction, page_size)
+        for row in rows:
+            course = Course.from_row(*row)
+            courses.append(course)
+        return courses, has_previous, has_next
+        
+    def count_courses(self):
+        return self.__fetch_value('SELECT COUNT(*) FROM courses')
+    
+    def course_exists(self, course_id):
+        return self.__fetch_value('SELECT COUNT(*) FROM courses WHERE course_id=:course_id', course_id=course_id) > 0
+    
+    def count_courses_of_term(self, term_id):
+        return self.__fetch_value('SELECT COUNT(*) FROM courses WHERE term_id=:term_id', term_id=term_id)
+    
+    def validate_course(self, course_id, term_id, domain_id):
+        '''Checks in one round trip whether the course id is taken, and whether its term and domain exist'''
+        row = self.__fetch_row('SELECT (SELECT COUNT(*) FROM courses WHERE course_id=:course_id), (SELECT COUNT(*) FROM terms WHERE term_id=:term_id), (SELECT COUNT(*) FROM domains WHERE domain_id=:domain_id)' + self.__backend.dual_clause,
+                               course_id=course_id, term_id=term_id, domain_id=domain_id)
+        return row[0] > 0, row[1] > 0, row[2] > 0
         
     def del_course(self, course_id):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('DELETE FROM courses WHERE course_id=:course_id', course_id=course_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('courses', 'courses_elements')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Course does not exist')
     
     # Competency Functions
@@ -341,27 +425,31 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute("INSERT INTO competencies (competency_id, competency, competency_achievement, competency_type) VALUES(:competency_id, :competency, :competency_achievement, :competency_type)", 
                                competency_id=competency.competency_id, competency=competency.competency, competency_achievement=competency.competency_achievement, competency_type=competency.competency_type)
-        except oracledb.IntegrityError as e:
+            cache.changed('competencies')
+        except self.__backend.IntegrityError as e:
             raise ObjectAlreadyExists('Competency already exists')
     
     def get_competency(self, competency_id):
+        return cache.entity_cache.get_or_load('competencies', competency_id, lambda: self.__load_competency(competency_id))
+
+    def __load_competency(self, competency_id):
         try:
             with self.__get_cursor() as cursor:
                 results = cursor.execute('SELECT competency_id, competency, competency_achievement, competency_type FROM competencies WHERE competency_id=:competency_id', competency_id=competency_id)
                 for row in results:
-                    competency = Competency(row[0], row[1], row[2], row[3])
+                    competency = Competency.from_row(*row)
                     return competency
-        except oracledb.IntegrityError as e:
+        except self.__backend.IntegrityError as e:
             return None
     
     def get_competencies(self):
-        competencies = []
+        return cache.entity_cache.get_or_load('competencies', 'all', self.__load_competencies)
+
+    def __load_competencies(self):
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT competency_id, competency, competency_achievement, competency_type FROM competencies ORDER BY competency_id')
-            for row in results:
-                competency = Competency(row[0], row[1], row[2], row[3])
-                competencies.append(competency)
-        return competencies
+            cursor.execute('SELECT competency_id, competency, competency_achievement, competency_type FROM competencies ORDER BY competency_id')
+            cursor.rowfactory = Competency.from_row
+            return cursor.fetchall()
     
     def get_competencies_for_api(self, page_size, page_number):
         competencies = []
@@ -369,10 +457,10 @@ class Database:
         next_page = None
         offset = (page_number - 1) * page_size
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT competency_id, competency, competency_achievement, competency_type FROM competencies ORDER BY competency_id OFFSET :offset ROWS FETCH NEXT :page_size ROWS ONLY',
+            results = cursor.execute('SELECT competency_id, competency, competency_achievement, competency_type FROM competencies ORDER BY competency_id ' + self.__backend.page_clause,
                                         offset=offset, page_size=page_size)
             for row in results:
-                competency = Competency(row[0], row[1], row[2], row[3])
+                competency = Competency.from_row(*row)
                 competencies.append(competency)
         if page_number > 1:
             previous_page = page_number - 1
@@ -380,19 +468,35 @@ class Database:
             next_page = page_number + 1
         return competencies, previous_page, next_page
     
+    def get_competencies_by_cursor(self, page_size, key, direction):
+        competencies = []
+        rows, has_previous, has_next = self.__seek_rows('SELECT competency_id, competency, competency_achievement, competency_type FROM competencies', [], ['competency_id'], key, direction, page_size)
+        for row in rows:
+            competency = Competency.from_row(*row)
+            competencies.append(competency)
+        return competencies, has_previous, has_next
+    
+    def count_competencies(self):
+        return self.__fetch_value('SELECT COUNT(*) FROM competencies')
+    
+    def competency_exists(self, competency_id):
+        return self.__fetch_value('SELECT COUNT(*) FROM competencies WHERE competency_id=:competency_id', competency_id=competency_id) > 0
+    
     def edit_competency(self, updated_competency):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('UPDATE competencies SET competency=:competency, competency_achievement=:competency_achievement, competency_type=:competency_type WHERE competency_id=:competency_id', 
                                competency=updated_competency.competency, competency_achievement=updated_competency.competency_achievement, competency_type=updated_competency.competency_type, competency_id=updated_competency.competency_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('competencies')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Competency does not exist')
         
     def del_competency(self, competency_id):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('DELETE FROM competencies WHERE competency_id=:competency_id', competency_id=competency_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('competencies')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Competency does not exist')
 
     # Element Functions
@@ -401,39 +505,31 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute("INSERT INTO elements (element_order, element, element_criteria, competency_id) VALUES(:element_order, :element, :element_criteria, :competency_id)", 
                                element_order=element.element_order, element=element.element, element_criteria=element.element_criteria, competency_id=element.competency_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('elements')
+        except self.__backend.IntegrityError as e:
             raise ObjectAlreadyExists('Element already exists')
     
     def get_element(self, element_id):
         try:
             with self.__get_cursor() as cursor:
-                results = cursor.execute('SELECT element_order, element, element_criteria, competency_id FROM elements WHERE element_id=:element_id', element_id=element_id)
+                results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements WHERE element_id=:element_id', element_id=element_id)
                 for row in results:
-                    element = Element(row[0], row[1], row[2], row[3])
-                    element.element_id = element_id
+                    element = Element.from_row(*row)
                     return element
-        except oracledb.IntegrityError as e:
+        except self.__backend.IntegrityError as e:
             return None
     
     def get_elements(self):
-        elements = []
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements ORDER BY competency_id, element_id')
-            for row in results:
-                element = Element(row[1], row[2], row[3], row[4])
-                element.element_id = row[0]
-                elements.append(element)
-        return elements
+            cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements ORDER BY competency_id, element_id')
+            cursor.rowfactory = Element.from_row
+            return cursor.fetchall()
     
     def get_elements_of_competency(self, competency_id):
-        elements = []
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements WHERE competency_id=:competency_id ORDER BY competency_id, element_id', competency_id=competency_id)
-            for row in results:
-                element = Element(row[1], row[2], row[3], row[4])
-                element.element_id = row[0]
-                elements.append(element)
-        return elements
+            cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements WHERE competency_id=:competency_id ORDER BY competency_id, element_id', competency_id=competency_id)
+            cursor.rowfactory = Element.from_row
+            return cursor.fetchall()
 
     def get_competency_elements_for_api(self, competency_id, page_size, page_number):
         elements = []
@@ -441,11 +537,10 @@ class Database:
         next_page = None
         offset = (page_number - 1) * page_size
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements WHERE competency_id=:competency_id ORDER BY competency_id OFFSET :offset ROWS FETCH NEXT :page_size ROWS ONLY',
+            results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements WHERE competency_id=:competency_id ORDER BY competency_id, element_id ' + self.__backend.page_clause,
                                         competency_id=competency_id, offset=offset, page_size=page_size)
             for row in results:
-                element = Element(row[1], row[2], row[3], row[4])
-                element.element_id = row[0]
+                element = Element.from_row(*row)
                 elements.append(element)
         
         if page_number > 1:
@@ -453,6 +548,14 @@ class Database:
         if len(elements) > 0 and (len(elements) >= page_size):
             next_page = page_number + 1
         return elements, previous_page, next_page
+
+    def get_competency_elements_by_cursor(self, competency_id, page_size, key, direction):
+        elements = []
+        rows, has_previous, has_next = self.__seek_rows('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements', ['competency_id=:competency_id'], ['competency_id', 'element_id'], key, direction, page_size, competency_id=competency_id)
+        for row in rows:
+            element = Element.from_row(*row)
+            elements.append(element)
+        return elements, has_previous, has_next
     
     def get_elements_for_api(self, page_size, page_number):
         elements = []
@@ -460,11 +563,10 @@ class Database:
         next_page = None
         offset = (page_number - 1) * page_size
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements ORDER BY competency_id, element_id OFFSET :offset ROWS FETCH NEXT :page_size ROWS ONLY',
+            results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements ORDER BY competency_id, element_id ' + self.__backend.page_clause,
                                         offset=offset, page_size=page_size)
             for row in results:
-                element = Element(row[1], row[2], row[3], row[4])
-                element.element_id = row[0]
+                element = Element.from_row(*row)
                 elements.append(element)
         
         if page_number > 1:
@@ -473,16 +575,35 @@ class Database:
             next_page = page_number + 1
         return elements, previous_page, next_page
 
+    def get_elements_by_cursor(self, page_size, key, direction):
+        elements = []
+        rows, has_previous, has_next = self.__seek_rows('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements', [], ['competency_id', 'element_id'], key, direction, page_size)
+        for row in rows:
+            element = Element.from_row(*row)
+            elements.append(element)
+        return elements, has_previous, has_next
+
+    def count_elements(self):
+        return self.__fetch_value('SELECT COUNT(*) FROM elements')
+    
+    def count_elements_of_competency(self, competency_id):
+        return self.__fetch_value('SELECT COUNT(*) FROM elements WHERE competency_id=:competency_id', competency_id=competency_id)
+    
+    def validate_element(self, element, competency_id):
+        '''Checks in one round trip whether the competency already has an element with this name, and whether the competency exists'''
+        row = self.__fetch_row('SELECT (SELECT COUNT(*) FROM elements WHERE element=:element AND competency_id=:competency_id), (SELECT COUNT(*) FROM competencies WHERE competency_id=:competency_id)' + self.__backend.dual_clause,
+                               element=element, competency_id=competency_id)
+        return row[0] > 0, row[1] > 0
+
     def get_latest_element(self):
         try:
             with self.__get_cursor() as cursor:
-                results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements ORDER BY element_id DESC FETCH FIRST 1 ROW ONLY')
+                results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements ORDER BY element_id DESC ' + self.__backend.first_row_clause)
                 
                 for row in results:
-                    element = Element(row[1], row[2], row[3], row[4])
-                    element.element_id = row[0]
+                    element = Element.from_row(*row)
                     return element
-        except oracledb.Error as e:
+        except self.__backend.Error as e:
             return None
 
     def edit_element(self, updated_element):
@@ -490,14 +611,16 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute('UPDATE elements SET element_order=:element_order, element=:element, element_criteria=:element_criteria, competency_id=:competency_id WHERE element_id=:element_id', 
                                element_order=updated_element.element_order, element=updated_element.element, element_criteria=updated_element.element_criteria, competency_id=updated_element.competency_id, element_id=updated_element.element_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('elements')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Element does not exist')
         
     def del_element(self, element_id):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('DELETE FROM elements WHERE element_id=:element_id', element_id=element_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('elements', 'courses_elements')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Element does not exist')
         
     def del_element_for_unit_test(self, course_id, element, element_hours):
@@ -506,7 +629,8 @@ class Database:
                 cursor.execute('DELETE FROM courses_elements WHERE course_id=:course_id and element_hours=:element_hours',
                                course_id=course_id, element_hours=element_hours)
                 cursor.execute('DELETE FROM elements WHERE element=:element', element=element)
-        except oracledb.IntegrityError as e:
+            cache.changed('courses_elements', 'elements')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Element does not exist')
         
     # Courses & Elements (Bridging)
@@ -515,18 +639,15 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute("INSERT INTO courses_elements (course_id, element_id, element_hours) VALUES(:course_id, :element_id, :element_hours)", 
                                course_id=course_id, element_id=element_id, element_hours=element_hours)
-        except oracledb.IntegrityError as e:
+            cache.changed('courses_elements')
+        except self.__backend.IntegrityError as e:
             raise ObjectAlreadyExists('Courses & Elements already exists')
         
     def get_elements_of_course(self, course_id):
-        elements_of_course = []
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM courses_elements JOIN elements USING(element_id) WHERE course_id=:course_id ORDER BY competency_id, element_id', course_id=course_id)
-            for row in results:
-                element_of_course = Element(row[1], row[2], row[3], row[4])
-                element_of_course.element_id = row[0]
-                elements_of_course.append(element_of_course)
-        return elements_of_course
+            cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM courses_elements JOIN elements USING(element_id) WHERE course_id=:course_id ORDER BY competency_id, element_id', course_id=course_id)
+            cursor.rowfactory = Element.from_row
+            return cursor.fetchall()
     
     def get_course_elements_for_api(self, course_id, competency_id, page_size, page_number):
         elements = []
@@ -534,11 +655,10 @@ class Database:
         next_page = None
         offset = (page_number - 1) * page_size
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements JOIN courses_elements USING(element_id) WHERE course_id=:course_id AND competency_id=:competency_id ORDER BY competency_id, element_id OFFSET :offset ROWS FETCH NEXT :page_size ROWS ONLY',
+            results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements JOIN courses_elements USING(element_id) WHERE course_id=:course_id AND competency_id=:competency_id ORDER BY competency_id, element_id ' + self.__backend.page_clause,
                                         course_id=course_id, competency_id=competency_id, offset=offset, page_size=page_size)
             for row in results:
-                element = Element(row[1], row[2], row[3], row[4])
-                element.element_id = row[0]
+                element = Element.from_row(*row)
                 elements.append(element)
         
         if page_number > 1:
@@ -546,15 +666,29 @@ class Database:
         if len(elements) > 0 and (len(elements) >= page_size):
             next_page = page_number + 1
         return elements, previous_page, next_page
+
+    def get_course_elements_by_cursor(self, course_id, competency_id, page_size, key, direction):
+        elements = []
+        rows, has_previous, has_next = self.__seek_rows('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements JOIN courses_elements USING(element_id)', ['course_id=:course_id', 'competency_id=:competency_id'], ['competency_id', 'element_id'], key, direction, page_size, course_id=course_id, competency_id=competency_id)
+        for row in rows:
+            element = Element.from_row(*row)
+            elements.append(element)
+        return elements, has_previous, has_next
+        
+    def count_elements_of_course(self, course_id):
+        return self.__fetch_value('SELECT COUNT(*) FROM courses_elements WHERE course_id=:course_id', course_id=course_id)
+    
+    def validate_course_competency(self, course_id, competency_id):
+        '''Returns in one round trip whether the course and competency exist, and how many elements are linked to the course'''
+        row = self.__fetch_row('SELECT (SELECT COUNT(*) FROM courses WHERE course_id=:course_id), (SELECT COUNT(*) FROM competencies WHERE competency_id=:competency_id), (SELECT COUNT(*) FROM courses_elements WHERE course_id=:course_id)' + self.__backend.dual_clause,
+                               course_id=course_id, competency_id=competency_id)
+        return row[0] > 0, row[1] > 0, row[2]
         
     def get_courses_of_element(self, element_id):
-        courses_of_element = []
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id FROM courses_elements JOIN courses USING(course_id) WHERE element_id=:element_id ORDER BY term_id, course_id', element_id=element_id)
-            for row in results:
-                course_of_element = Course(row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7])
-                courses_of_element.append(course_of_element)
-        return courses_of_element
+            cursor.execute('SELECT course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id FROM courses_elements JOIN courses USING(course_id) WHERE element_id=:element_id ORDER BY term_id, course_id', element_id=element_id)
+            cursor.rowfactory = Course.from_row
+            return cursor.fetchall()
     
     def get_course_element_hours(self, course_id):
         element_hour_pairings = []
@@ -579,7 +713,8 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute('UPDATE courses_elements SET element_id=:new_element_id, element_hours=:new_element_hours WHERE course_id=:course_id', 
                                new_element_id=new_element_id, new_element_hours=new_element_hours, course_id=course_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('courses_elements')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Course does not exist or does not have any elements')
         
     def edit_courses_of_element(self, element_id, new_course_id):
@@ -587,7 +722,8 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute('UPDATE courses_elements SET course_id=:new_course_id WHERE element_id=:element_id', 
                                new_course_id=new_course_id, element_id=element_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('courses_elements')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Element does not exist or does not have any courses')
         
     def edit_course_element_hours(self, course_id, element_id, new_hours):
@@ -595,40 +731,68 @@ class Database:
             with self.__get_cursor() as cursor:
                 cursor.execute('UPDATE courses_elements SET element_hours=:new_hours WHERE course_id=:course_id AND element_id=:element_id',
                                new_hours=new_hours, course_id=course_id, element_id=element_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('courses_elements')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Course or element does not exist')
         
     def del_elements_of_course(self, course_id):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('DELETE FROM courses_elements WHERE course_id=:course_id', course_id=course_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('courses_elements')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Course does not exist')
         
     def del_courses_of_element(self, element_id):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('DELETE FROM courses_elements WHERE element_id=:element_id', element_id=element_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('courses_elements')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Element does not exist')
         
+    def course_element_exists(self, course_id, element_id):
+        '''Checks the one course-element link, instead of reading the whole bridging table'''
+        return self.__fetch_value('SELECT COUNT(*) FROM courses_elements WHERE course_id=:course_id AND element_id=:element_id',
+                                  course_id=course_id, element_id=element_id) > 0
+    
     def del_course_element_pairing(self, course_id, element_id):
         try:
             with self.__get_cursor() as cursor:
                 cursor.execute('DELETE FROM courses_elements WHERE course_id=:course_id AND element_id=:element_id',
                                course_id=course_id, element_id=element_id)
-        except oracledb.IntegrityError as e:
+            cache.changed('courses_elements')
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Course or element does not exist')
         
+    def apply_course_element_changes(self, upserts, deletes):
+        '''Upserts (course_id, element_id, element_hours) links and deletes (course_id, element_id) links in one transaction.
+        Returns (course_id, element_hours, expected_hours) for every course touched, as calculate_total_hours computes it'''
+        course_ids = sorted({change[0] for change in upserts + deletes})
+        try:
+            with self.transaction():
+                with self.__get_cursor() as cursor:
+                    if upserts:
+                        cursor.executemany(self.__backend.upsert_course_element_statement,
+                                           [{'course_id': course_id, 'element_id': element_id, 'element_hours': element_hours} for course_id, element_id, element_hours in upserts])
+                    if deletes:
+                        cursor.executemany('DELETE FROM courses_elements WHERE course_id=:course_id AND element_id=:element_id',
+                                           [{'course_id': course_id, 'element_id': element_id} for course_id, element_id in deletes])
+                    totals = []
+                    for in_list, binds in self.__in_lists(course_ids):
+                        results = cursor.execute('SELECT course_id, COALESCE(SUM(element_hours), 0), (theory_hours + lab_hours) * 15 FROM courses LEFT JOIN courses_elements USING(course_id) WHERE course_id IN ' + in_list + ' GROUP BY course_id, theory_hours, lab_hours ORDER BY course_id', **binds)
+                        totals.extend(tuple(row) for row in results)
+        except self.__backend.IntegrityError as e:
+            raise CannotFindObject('Course or element does not exist')
+        cache.changed('courses_elements')
+        return totals
+        
     #Courses & Competencies
     def get_competencies_of_course(self, course_id):
-        competencies = []
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT DISTINCT competency_id, competency, competency_achievement, competency_type FROM competencies JOIN elements USING(competency_id) JOIN courses_elements USING(element_id) JOIN courses USING(course_id) WHERE course_id=:course_id ORDER BY competency_id', course_id=course_id)
-            for row in results:
-                competency = Competency(row[0], row[1], row[2], row[3])
-                competencies.append(competency)
-        return competencies
+            cursor.execute('SELECT DISTINCT competency_id, competency, competency_achievement, competency_type FROM competencies JOIN elements USING(competency_id) JOIN courses_elements USING(element_id) JOIN courses USING(course_id) WHERE course_id=:course_id ORDER BY competency_id', course_id=course_id)
+            cursor.rowfactory = Competency.from_row
+            return cursor.fetchall()
         
     def get_courses_of_competency(self, competency_id):
         try:
@@ -636,12 +800,15 @@ class Database:
             with self.__get_cursor() as cursor:
                 results = cursor.execute('SELECT DISTINCT course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id FROM courses JOIN courses_elements USING(course_id) JOIN courses_elements USING(element_id) JOIN competencies USING(competency_id) WHERE course_id=:course_id WHERE competency_id=:competency_id ORDER BY course_id', competency_id=competency_id)
                 for row in results:
-                    course = Course(row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7])
+                    course = Course.from_row(*row)
                     courses.append(course)
             return courses
-        except oracledb.IntegrityError as e:
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Competency does not exist')
         
+    def count_competencies_of_course(self, course_id):
+        return self.__fetch_value('SELECT COUNT(DISTINCT competency_id) FROM elements JOIN courses_elements USING(element_id) WHERE course_id=:course_id', course_id=course_id)
+        
     def get_course_competency_groupings(self):
         groupings = []
         with self.__get_cursor() as cursor:
@@ -657,16 +824,24 @@ class Database:
         next_page = None
         offset = (page_number - 1) * page_size
         with self.__get_cursor() as cursor:
-            results = cursor.execute('SELECT DISTINCT competency_id, competency, competency_achievement, competency_type FROM competencies JOIN elements USING(competency_id) JOIN courses_elements USING(element_id) JOIN courses USING(course_id) WHERE course_id=:course_id ORDER BY competency_id OFFSET :offset ROWS FETCH NEXT :page_size ROWS ONLY',
+            results = cursor.execute('SELECT DISTINCT competency_id, competency, competency_achievement, competency_type FROM competencies JOIN elements USING(competency_id) JOIN courses_elements USING(element_id) JOIN courses USING(course_id) WHERE course_id=:course_id ORDER BY competency_id ' + self.__backend.page_clause,
                                         course_id=course_id, offset=offset, page_size=page_size)
             for row in results:
-                competency = Competency(row[0], row[1], row[2], row[3])
+                competency = Competency.from_row(*row)
                 competencies.append(competency)
         if page_number > 1:
             previous_page = page_number - 1
         if len(competencies) > 0 and (len(competencies) >= page_size):
             next_page = page_number + 1
         return competencies, previous_page, next_page
+
+    def get_course_competencies_by_cursor(self, course_id, page_size, key, direction):
+        competencies = []
+        rows, has_previous, has_next = self.__seek_rows('SELECT DISTINCT competency_id, competency, competency_achievement, competency_type FROM competencies JOIN elements USING(competency_id) JOIN courses_elements USING(element_id)', ['course_id=:course_id'], ['competency_id'], key, direction, page_size, course_id=course_id)
+        for row in rows:
+            competency = Competency.from_row(*row)
+            competencies.append(competency)
+        return competencies, has_previous, has_next
     
     #Competencies & Elements
     def get_elements_of_competency(self, competency_id):
@@ -674,8 +849,7 @@ class Database:
         with self.__get_cursor() as cursor:
             results = cursor.execute('SELECT element_id, element_order, element, element_criteria, competency_id FROM elements WHERE competency_id=:competency_id ORDER BY competency_id, element_id', competency_id=competency_id)
             for row in results:
-                element_of_competency = Element(row[1], row[2], row[3], row[4])
-                element_of_competency.element_id = row[0]
+                element_of_competency = Element.from_row(*row)
                 elements_of_competency.append(element_of_competency)
         return elements_of_competency 
         
@@ -685,68 +859,206 @@ class Database:
             with self.__get_cursor() as cursor:
                 results = cursor.execute('SELECT domain_id, domain, domain_description FROM domains JOIN courses USING(domain_id) WHERE course_id=:course_id', course_id=course_id)
                 for row in results:
-                    domain = Domain(row[1], row[2])
-                    domain.domain_id = row[0]
+                    domain = Domain.from_row(*row)
                     return domain
-        except oracledb.IntegrityError as e:
+        except self.__backend.IntegrityError as e:
             raise CannotFindObject('Course does not exist')
         
-    #Search Results
-    def get_search_results(self, query):
-        query = '%' + query + '%'
-        course_results = []
-        competency_results = []
-        element_results = []
-        domain_results = []
+    #Course Page
+    def get_course_bundle(self, course_id):
+        '''Loads everything the course page shows in one round trip: (course, domain or None, competencies, elements, element_hours, total_element_hours), or None'''
+        with self.__get_cursor() as cursor:
+            results = cursor.execute('SELECT course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id, domain, domain_description, element_id, element_order, element, element_criteria, competency_id, element_hours, competency, competency_achievement, competency_type, COALESCE(SUM(element_hours) OVER (), 0) FROM courses LEFT JOIN domains USING(domain_id) LEFT JOIN courses_elements USING(course_id) LEFT JOIN elements USING(element_id) LEFT JOIN competencies USING(competency_id) WHERE course_id=:course_id ORDER BY competency_id, element_id', course_id=course_id)
+            rows = results.fetchall()
+        if len(rows) == 0:
+            return None
         
-        try:
-            with self.__get_cursor() as cursor:
-                results = cursor.execute('SELECT course_id, course_title FROM courses JOIN terms USING(term_id) WHERE UPPER(course_id) LIKE UPPER(:query) OR UPPER(course_title) LIKE UPPER(:query) OR UPPER(description) LIKE UPPER(:query) OR UPPER(domain_id) LIKE UPPER(:query) OR UPPER(term_name) LIKE UPPER(:query) ORDER BY term_id, course_id', query=query)
-                for row in results:
-                    course_result = (row[0], row[1])
-                    course_results.append(course_result)
-        except oracledb.Error as e:
-            course_results = None
-            
-        try:
-            with self.__get_cursor() as cursor:
-                results = cursor.execute('SELECT competency_id, competency FROM competencies WHERE UPPER(competency_id) LIKE UPPER(:query) OR UPPER(competency) LIKE UPPER(:query) OR UPPER(competency_achievement) LIKE UPPER(:query) OR UPPER(competency_type) LIKE UPPER(:query) ORDER BY competency_id', query=query)
-                for row in results:
-                    competency_result = (row[0], row[1])
-                    competency_results.append(competency_result)
-        except oracledb.Error as e:
-            competency_results = None
-            
-        try:
+        first = rows[0]
+        course = Course.from_row(*first[:8])
+        domain = Domain.from_row(first[6], first[8], first[9]) if first[6] is not None else None
+        competencies = []
+        elements = []
+        element_hours = []
+        for row in rows:
+            if row[10] is None:
+                continue
+            element = Element.from_row(row[10], row[11], row[12], row[13], row[14])
+            elements.append(element)
+            element_hours.append((row[10], row[15]))
+            if len(competencies) == 0 or competencies[-1].competency_id != row[14]:
+                competencies.append(Competency.from_row(row[14], row[16], row[17], row[18]))
+        return course, domain, competencies, elements, element_hours, first[19]
+        
+    #Program Graph
+    def get_course_element_links(self):
+        '''Every course-element link as (course_id, element_id, element_hours)'''
+        with self.__get_cursor() as cursor:
+            return cursor.execute('SELECT course_id, element_id, element_hours FROM courses_elements').fetchall()
+
+    def get_program_snapshot(self):
+        '''Terms, domains, courses, competencies, elements and course-element links, read past the entity cache in one read only transaction so they agree with each other'''
+        with self.transaction():
             with self.__get_cursor() as cursor:
-                results = cursor.execute('SELECT element_id, element, competency_id FROM elements WHERE UPPER(element) LIKE UPPER(:query) OR UPPER(element_criteria) LIKE UPPER(:query) OR UPPER(competency_id) LIKE UPPER(:query) ORDER BY competency_id', query=query)
-                for row in results:
-                    element_result = (row[0], row[1], row[2])
-                    element_results.append(element_result)
-        except oracledb.Error as e:
-            element_results = None
-            
+                cursor.execute(self.__backend.snapshot_statement)
+            return (self.__load_terms(), self.__load_domains(), self.get_courses(), self.__load_competencies(), self.get_elements(),
+                    self.get_course_element_links())
+        
+    #Change Feed
+    def get_changes_since(self, log_id, page_size, missing_ids=()):
+        '''Up to page_size audit_logs rows after log_id, and any of missing_ids, as (log_id, table_name, operation, row_key, change_time) oldest first'''
+        filters = 'log_id > :log_id'
+        binds = {}
+        missing_ids = list(missing_ids)[:IN_LIST_LIMIT]
+        if missing_ids:
+            in_list, binds = next(self.__in_lists(missing_ids))
+            filters += ' OR log_id IN ' + in_list
+        with self.__get_cursor() as cursor:
+            return cursor.execute('SELECT log_id, table_name, operation, row_key, change_time FROM audit_logs WHERE ' + filters + ' ORDER BY log_id ' + self.__backend.limit_clause,
+                                  log_id=log_id, page_size=page_size, **binds).fetchall()
+        
+    def get_change_tallies(self):
+        '''(table_name, last log_id, number of changes) of every table audit_logs holds changes of'''
+        with self.__get_cursor() as cursor:
+            return cursor.execute('SELECT table_name, MAX(log_id), COUNT(*) FROM audit_logs GROUP BY table_name').fetchall()
+        
+    #Reports
+    def get_program_report_rows(self):
+        '''One row per course-element link, or per course without links: course_id, course_title, term_id, theory/lab/work hours, competency_id, element_hours'''
+        with self.__get_cursor() as cursor:
+            return cursor.execute('SELECT course_id, course_title, term_id, theory_hours, lab_hours, work_hours, competency_id, element_hours FROM courses LEFT JOIN courses_elements USING(course_id) LEFT JOIN elements USING(element_id) ORDER BY term_id, course_id').fetchall()
+        
+    #Search Results
+    search_queries = {
+        'courses': 'SELECT course_id, course_title FROM courses JOIN terms USING(term_id) WHERE UPPER(course_id) LIKE UPPER(:query) OR UPPER(course_title) LIKE UPPER(:query) OR UPPER(description) LIKE UPPER(:query) OR UPPER(domain_id) LIKE UPPER(:query) OR UPPER(term_name) LIKE UPPER(:query) ORDER BY term_id, course_id',
+        'competencies': 'SELECT competency_id, competency FROM competencies WHERE UPPER(competency_id) LIKE UPPER(:query) OR UPPER(competency) LIKE UPPER(:query) OR UPPER(competency_achievement) LIKE UPPER(:query) OR UPPER(competency_type) LIKE UPPER(:query) ORDER BY competency_id',
+        'elements': 'SELECT element_id, element, competency_id FROM elements WHERE UPPER(element) LIKE UPPER(:query) OR UPPER(element_criteria) LIKE UPPER(:query) OR UPPER(competency_id) LIKE UPPER(:query) ORDER BY competency_id',
+        'domains': 'SELECT domain_id, domain FROM domains WHERE UPPER(domain) LIKE UPPER(:query) OR UPPER(domain_description) LIKE UPPER(:query) ORDER BY domain_id'
+    }
+    
+    def get_search_results(self, query, fulltext=False):
+        '''Searches every category with LIKE, or with the backend full-text indexes (Oracle Text, FTS5 locally) ranked by relevance'''
+        return [self.get_search_category(category, query, fulltext) for category in self.search_queries]
+    
+    def get_search_category(self, category, query, fulltext=False):
+        '''Returns the matches of one search category, or None when its query fails'''
+        if fulltext:
+            statement = self.__backend.fulltext_queries[category]
+            query = self.__backend.fulltext_query(query)
+            if not query:
+                return []
+        else:
+            statement = self.search_queries[category]
+            query = '%' + query + '%'
+        category_results = []
         try:
             with self.__get_cursor() as cursor:
-                results = cursor.execute('SELECT domain_id, domain FROM domains WHERE UPPER(domain) LIKE UPPER(:query) OR UPPER(domain_description) LIKE UPPER(:query) ORDER BY domain_id', query=query)
+                results = cursor.execute(statement, query=query)
                 for row in results:
-                    domain_result = (row[0], row[1])
-                    domain_results.append(domain_result)
-        except oracledb.Error as e:
-            domain_results = None
+                    category_results.append(tuple(row))
+        except self.__backend.Error as e:
+            category_results = None
+        return category_results
+
+    search_document_queries = {
+        'courses': 'SELECT course_id, course_title, description, domain_id, term_name FROM courses JOIN terms USING(term_id) ORDER BY term_id, course_id',
+        'competencies': 'SELECT competency_id, competency, competency_achievement, competency_type FROM competencies ORDER BY competency_id',
+        'elements': 'SELECT element_id, element, element_criteria, competency_id FROM elements ORDER BY competency_id, element_id',
+        'domains': 'SELECT domain_id, domain, domain_description FROM domains ORDER BY domain_id'
+    }
+    
+    def get_search_documents(self, category):
+        '''Returns every searchable row of a category, in the order get_search_results lists them'''
+        with self.__get_cursor() as cursor:
+            return cursor.execute(self.search_document_queries[category]).fetchall()
         
-        return [course_results, competency_results, element_results, domain_results]
+    #Export
+    export_queries = {
+        'courses': 'SELECT course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id FROM courses ORDER BY term_id, course_id',
+        'competencies': 'SELECT competency_id, competency, competency_achievement, competency_type FROM competencies ORDER BY competency_id',
+        'elements': 'SELECT element_id, element_order, element, element_criteria, competency_id FROM elements ORDER BY competency_id, element_id',
+        'courses_elements': 'SELECT course_id, element_id, element_hours FROM courses_elements ORDER BY course_id, element_id'
+    }
+    
+    def iter_export_rows(self, collection, arraysize=1000):
+        '''Yields the column names of an exported collection, then its rows, fetched arraysize at a time from a single cursor'''
+        with self.__get_cursor() as cursor:
+            cursor.arraysize = arraysize
+            cursor.execute(self.export_queries[collection])
+            yield [column[0].lower() for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(arraysize)
+                if not rows:
+                    break
+                yield from rows
+
+    #Import
+    import_statements = {
+        'courses': 'INSERT INTO courses (course_id, course_title, theory_hours, lab_hours, work_hours, description, domain_id, term_id) VALUES(:course_id, :course_title, :theory_hours, :lab_hours, :work_hours, :description, :domain_id, :term_id)',
+        'competencies': 'INSERT INTO competencies (competency_id, competency, competency_achievement, competency_type) VALUES(:competency_id, :competency, :competency_achievement, :competency_type)',
+        'elements': 'INSERT INTO elements (element_order, element, element_criteria, competency_id) VALUES(:element_order, :element, :element_criteria, :competency_id)',
+        'courses_elements': 'INSERT INTO courses_elements (course_id, element_id, element_hours) VALUES(:course_id, :element_id, :element_hours)'
+    }
+    
+    def bulk_insert(self, collection, rows):
+        '''Inserts rows with one array DML call in a single transaction. Returns (offset, message) for each row the database rejected'''
+        with self.transaction():
+            with self.__get_cursor() as cursor:
+                cursor.executemany(self.import_statements[collection], rows, batcherrors=True)
+                failures = [(error.offset, error.message) for error in cursor.getbatcherrors()]
+        cache.changed(collection)
+        return failures
+
+    def __in_lists(self, values):
+        '''Splits values into bind lists of at most IN_LIST_LIMIT items, yielding each as an "(:in_0, :in_1, ...)" clause and its binds'''
+        values = list(values)
+        for start in range(0, len(values), IN_LIST_LIMIT):
+            binds = {f'in_{i}': value for i, value in enumerate(values[start:start + IN_LIST_LIMIT])}
+            yield '(' + ', '.join(':' + bind for bind in binds) + ')', binds
+    
+    def __fetch_row(self, statement, **binds):
+        with self.__get_cursor() as cursor:
+            results = cursor.execute(statement, **binds)
+            for row in results:
+                return row
+    
+    def __fetch_value(self, statement, **binds):
+        return self.__fetch_row(statement, **binds)[0]
+    
+    #Keyset Pagination
+    def __seek_rows(self, select, filters, key_columns, key, direction, page_size, **binds):
+        '''Fetches the page of rows that follows (or precedes) key in key_columns order, and whether rows exist before and after it'''
+        if len(key) != len(key_columns):
+            raise ValueError('Cursor does not match this collection')
+        operator = '<' if direction == 'prev' else '>'
+        order = ' DESC' if direction == 'prev' else ''
+        key_binds = {}
+        predicate = None
+        for i in reversed(range(len(key_columns))):
+            key_binds[f'key_{i}'] = key[i]
+            condition = f'{key_columns[i]} {operator} :key_{i}'
+            if predicate is not None:
+                condition = f'({condition} OR ({key_columns[i]} = :key_{i} AND {predicate}))'
+            predicate = condition
+        statement = select + ' WHERE ' + ' AND '.join(filters + [predicate]) + ' ORDER BY ' + ', '.join(column + order for column in key_columns) + ' ' + self.__backend.limit_clause
+        with self.__get_cursor() as cursor:
+            rows = list(cursor.execute(statement, page_size=page_size + 1, **key_binds, **binds))
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if direction == 'prev':
+            rows.reverse()
+            return rows, more, True
+        return rows, True, more
         
     def close(self):
-        '''Closes the connection'''
+        '''Closes the connection, or hands it back to the pool when pooled'''
         if self.__connection is not None:
-            self.__connection.close()
+            self.__backend.release(self.__connection)
             self.__connection = None
 
     def __get_cursor(self):
             for i in range(3):
                 try:
-                    return self.__connection.cursor()
+                    return instrument(self.__connection.cursor())
                 except Exception as e:
                     # Might need to reconnect
                     self.__reconnect()
@@ -754,13 +1066,12 @@ class Database:
     def __reconnect(self):
         try:
             self.close()
-        except oracledb.Error as f:
+        except self.__backend.Error as f:
             pass
         self.__connection = self.__connect()
 
     def __connect(self):
-        return oracledb.connect(user=os.environ['DBUSER'], password=os.environ['DBPWD'],
-                                             host="198.168.52.211", port=1521, service_name="pdbora19c.dawsoncollege.qc.ca")
+        return self.__backend.connect()
 
 if __name__ == '__main__':
     print('Provide file to initialize database')
@@ -1,10 +1,28 @@
-import click, os
+import click, os, json
 from flask import current_app, g
 from .db import Database
+from .backends import create_backend, set_default_backend, get_default_backend, SQL_DIR
+from .importer import IMPORT_FIELDS, IMPORT_FORMATS, read_records, import_records
+
+def init_backend(app):
+    pool_options = None
+    if app.config['DB_POOL']:
+        pool_options = {'min': app.config['DB_POOL_MIN'], 'max': app.config['DB_POOL_MAX'],
+                        'increment': app.config['DB_POOL_INCREMENT'], 'ping_interval': app.config['DB_POOL_PING_INTERVAL'],
+                        'wait_timeout': app.config['DB_POOL_WAIT_TIMEOUT']}
+    backend = create_backend(app.config['DB_BACKEND'], sqlite_path=app.config['DB_SQLITE_PATH'], pool_options=pool_options)
+    set_default_backend(backend)
+    return backend
+
+def get_backend():
+    return get_default_backend()
+
+def get_pool_stats():
+    return get_backend().stats()
 
 def get_db():
     if 'db' not in g:
-        g.db = Database()
+        g.db = Database(backend=get_backend())
     return g.db
 
 def close_db():
@@ -13,15 +31,23 @@ def close_db():
         db.close()
 
 def init_db():
-    get_db().run_file(os.path.join(current_app.root_path, 'sql', 'remove.sql'))
-    get_db().run_file(os.path.join(current_app.root_path, 'sql', 'project_type.sql'))
-    get_db().run_file(os.path.join(current_app.root_path, 'sql', 'setup.sql'))
-    get_db().run_file(os.path.join(current_app.root_path, 'sql', 'inserting.sql'))
-    get_db().run_file(os.path.join(current_app.root_path, 'sql', 'logging.sql'))
-    get_db().run_file(os.path.join(current_app.root_path, 'sql', 'views.sql'))
-    get_db().run_file(os.path.join(current_app.root_path, 'sql', 'courses_package.sql'))
+    for script in get_backend().setup_scripts:
+        get_db().run_file(os.path.join(SQL_DIR, script))
 
 @click.command('init-db')
 def init_db_command():
     init_db()
     click.echo('Initialized the databse')
+
+@click.command('import-data')
+@click.argument('collection', type=click.Choice(list(IMPORT_FIELDS)))
+@click.argument('file', type=click.File('r'))
+@click.option('--format', 'data_format', type=click.Choice(list(IMPORT_FORMATS)), default=None, help='Defaults to the file extension')
+def import_data_command(collection, file, data_format):
+    if data_format is None:
+        data_format = os.path.splitext(file.name)[1].lstrip('.').lower()
+        if data_format not in IMPORT_FORMATS:
+            raise click.UsageError('Cannot tell the format from the file extension, use --format')
+    records = read_records(file.read(), data_format)
+    report = import_records(get_db(), collection, records, current_app.config['IMPORT_CHUNK_SIZE'])
+    click.echo(json.dumps(report, indent=2))
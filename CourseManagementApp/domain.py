@@ -1,4 +1,6 @@
 class Domain:
+    __slots__ = ('domain', 'domain_description', 'domain_id')
+
     def __init__(self, domain, domain_description):
         if not isinstance(domain, str) or len(domain) == 0:
             raise TypeError('domain must be a non-zero string')
@@ -8,6 +10,15 @@ class Domain:
         self.domain = domain
         self.domain_description = domain_description
         self.domain_id = None
+
+    @classmethod
+    def from_row(cls, domain_id, domain, domain_description):
+        '''Builds a domain from a database row without validating it. Doubles as a cursor rowfactory'''
+        new_domain = cls.__new__(cls)
+        new_domain.domain = domain
+        new_domain.domain_description = domain_description
+        new_domain.domain_id = domain_id
+        return new_domain
         
     def __repr__(self):
         return f'Domain({self.domain}, {self.domain_description})' 
@@ -27,7 +38,7 @@ class Domain:
         return domain
     
     def to_json(self):
-        return self.__dict__
+        return {name: getattr(self, name) for name in self.__slots__}
     
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField
@@ -1,19 +1,15 @@
 from flask import Flask, Blueprint, request, url_for, make_response
 from .dbmanager import get_db
 from .domain import Domain
+from .pagination import decode_cursor, page_links, cursor_error
+from .conditional import conditional
 import math
 
 bp = Blueprint('domain_api', __name__, url_prefix = '/api/v1')
 
 @bp.route('/domains', methods=['GET', 'POST'])
+@conditional('domains')
 def domains():
-    try:
-        total_domains = get_db().get_domains()
-    except Exception as e:
-        error_infoset = {'id': 'Database Error',
-                         'description': 'Unable to connect to the database. Please try again later.'}
-        return make_response(error_infoset, 500)
-    
     if request.method == 'POST':
         domain_json = request.json
         
@@ -25,11 +21,17 @@ def domains():
                          'description': 'Data must contain complete domain information, and formatted as dictionary object'}
                 return make_response(error_infoset, 400)
             
-            for domain in total_domains:
-                if domain.domain == new_domain.domain:
-                    error_infoset = {'id': 'Data Error',
-                                     'description': 'Domain name already exists'}
-                    return make_response(error_infoset, 400)
+            try:
+                domain_exists = get_db().domain_name_exists(new_domain.domain)
+            except Exception as e:
+                error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+                return make_response(error_infoset, 500)
+            
+            if domain_exists:
+                error_infoset = {'id': 'Data Error',
+                                 'description': 'Domain name already exists'}
+                return make_response(error_infoset, 400)
             
             try:
                 get_db().add_domain(new_domain)
@@ -45,33 +47,49 @@ def domains():
                     
         
     elif request.method == 'GET':
+        try:
+            count = get_db().count_domains()
+        except Exception as e:
+            error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+            return make_response(error_infoset, 500)
+        
         page_number = 1
         page_size = 50
-        if request.args:
+        cursor = request.args.get('cursor')
+        if request.args and cursor is None:
             page = request.args.get('page')
             if page:
                 page_number = int(page)
-                max_page = math.ceil(len(total_domains) / float(page_size))
+                max_page = math.ceil(count / float(page_size))
                 if page_number < 1 or page_number > max_page:
                     error_infoset = {'id' : 'Invalid Page Number',
                                  'description': f'Page number must be from 1, up to a maximum of {max_page}'}
                     return make_response(error_infoset, 404)
     
+    if cursor is not None:
+        try:
+            key, direction = decode_cursor(cursor, 'domain_api.domains')
+        except ValueError:
+            return make_response(cursor_error(), 400)
+    
     try:
-        domains, previous_page, next_page = get_db().get_domains_for_api(page_size, page_number=page_number)
+        if cursor is not None:
+            domains, has_previous, has_next = get_db().get_domains_by_cursor(page_size, key, direction)
+        else:
+            domains, previous_page, next_page = get_db().get_domains_for_api(page_size, page_number=page_number)
+            has_previous = previous_page is not None
+            has_next = next_page is not None
+    except ValueError:
+        return make_response(cursor_error(), 400)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                     'description': 'Unable to connect to the database. Please try again later.'}
         return make_response(error_infoset, 500)
     
-    if previous_page is not None:
-        previous_page = url_for('domain_api.domains', page=previous_page)
-    if next_page is not None:
-        next_page = url_for('domain_api.domains', page=next_page)
-    current_page = url_for('domain_api.domains', page=page_number)
+    links = page_links('domain_api.domains', domains, lambda domain: (domain.domain_id,), has_previous, has_next, page_number=page_number, cursor=cursor)
     
-    count = len(total_domains)
-    json = {'count': count, 'current_page': current_page, 'previous_page': previous_page, 'next_page': next_page, 'results': [domain.to_json() for domain in domains]}
+    json = {'count': count, **links, 'results': [domain.to_json() for domain in domains]}
     return make_response(json, 200)
 
 ## Similar to elements, domains being distinguished by domain_id makes it meaningless to have routes to specific domains, as well as putting and deleting them.
\ No newline at end of file
@@ -2,14 +2,17 @@ from flask import (Blueprint, render_template, request, flash, redirect, url_for
 from .dbmanager import get_db
 from .domain import Domain, DomainForm
 from .exceptions import ObjectAlreadyExists
+from .grouping import group_by
+from .program_graph import get_program_graph
 from flask_login import login_required, current_user
 bp = Blueprint('domain', __name__, url_prefix='/domain/')
 
 @bp.route('/<int:id>/')
 def get_domain_by_id(id):
     try:
-        domain = get_db().get_domain(id)
-        courses = get_db().get_courses()
+        graph = get_program_graph()
+        domain = graph.get_domain(id)
+        courses = graph.get_courses_of_domain(id)
     except:
         flash('Cannot reach the database')
         return redirect(url_for('home.index'))
@@ -117,10 +120,12 @@ def delete_domain(domain_id):
 @bp.route('/reference/')
 def get_domains():
     try:
-        domains = get_db().get_domains()
-        courses = get_db().get_courses()
+        graph = get_program_graph()
+        domains = graph.get_domains()
+        courses = graph.get_courses()
     except:
         flash('Cannot reach the database')
         return redirect(url_for('home.index'))
     
-    return render_template('domains_reference.html', domains=domains, courses=courses)
\ No newline at end of file
+    courses_by_domain = group_by(courses, lambda course: course.domain_id)
+    return render_template('domains_reference.html', domains=domains, courses_by_domain=courses_by_domain)
\ No newline at end of file
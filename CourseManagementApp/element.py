@@ -1,4 +1,6 @@
 class Element:
+    __slots__ = ('element_order', 'element', 'element_criteria', 'competency_id', 'element_id')
+
     def __init__(self, element_order, element, element_criteria, competency_id):
         if not isinstance(element_order, int):
             raise TypeError('element_order must be an int')
@@ -14,6 +16,17 @@ class Element:
         self.element_criteria = element_criteria
         self.competency_id = competency_id
         self.element_id = None
+
+    @classmethod
+    def from_row(cls, element_id, element_order, element, element_criteria, competency_id):
+        '''Builds an element from a database row without validating it. Doubles as a cursor rowfactory'''
+        new_element = cls.__new__(cls)
+        new_element.element_order = element_order
+        new_element.element = element
+        new_element.element_criteria = element_criteria
+        new_element.competency_id = competency_id
+        new_element.element_id = element_id
+        return new_element
         
     def __repr__(self):
         return f'Element({self.element_order}, {self.element}, {self.element_criteria}, {self.competency_id})' 
@@ -33,7 +46,7 @@ class Element:
         return element
     
     def to_json(self):
-        return self.__dict__
+        return {name: getattr(self, name) for name in self.__slots__}
     
 from flask_wtf import FlaskForm
 from wtforms import StringField, IntegerField, SelectField, TextAreaField
@@ -1,20 +1,15 @@
 from flask import Flask, Blueprint, request, url_for, make_response
 from .dbmanager import get_db
 from .element import Element
+from .pagination import decode_cursor, page_links, cursor_error
+from .conditional import conditional
 import math
 
 bp = Blueprint('element_api', __name__, url_prefix = '/api/v1')
 
 @bp.route('/elements', methods=['GET', 'POST'])
+@conditional('elements')
 def elements():
-    try:
-        total_elements = get_db().get_elements()
-        competencies = get_db().get_competencies()
-    except Exception as e:
-        error_infoset = {'id': 'Database Error',
-                         'description': 'Unable to connect to the database. Please try again later.'}
-        return make_response(error_infoset, 500)
-    
     if request.method == 'POST':
         element_json = request.json
         
@@ -26,19 +21,19 @@ def elements():
                          'description': 'Data must contain complete element information, and formatted as dictionary object'}
                 return make_response(error_infoset, 400)
             
-            for element in total_elements:
-                if element.element == new_element.element and element.competency_id == new_element.competency_id:
-                    error_infoset = {'id': 'Data Error',
-                                     'description': 'Element name already exists for an existing competency id.'}
-                    return make_response(error_infoset, 400)
-                
-            invalid_data = True
-            for competency in competencies:
-                if competency.competency_id == new_element.competency_id:
-                    invalid_data = False
-                    break
+            try:
+                name_exists, competency_exists = get_db().validate_element(new_element.element, new_element.competency_id)
+            except Exception as e:
+                error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+                return make_response(error_infoset, 500)
+            
+            if name_exists:
+                error_infoset = {'id': 'Data Error',
+                                 'description': 'Element name already exists for an existing competency id.'}
+                return make_response(error_infoset, 400)
             
-            if invalid_data:
+            if not competency_exists:
                 error_infoset = {'id': 'Data Error',
                                     'description': 'Specified competency id does not exist'}
                 return make_response(error_infoset, 400)
@@ -57,33 +52,49 @@ def elements():
                     
         
     elif request.method == 'GET':
+        try:
+            count = get_db().count_elements()
+        except Exception as e:
+            error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+            return make_response(error_infoset, 500)
+        
         page_number = 1
         page_size = 50
-        if request.args:
+        cursor = request.args.get('cursor')
+        if request.args and cursor is None:
             page = request.args.get('page')
             if page:
                 page_number = int(page)
-                max_page = math.ceil(len(total_elements) / float(page_size))
+                max_page = math.ceil(count / float(page_size))
                 if page_number < 1 or page_number > max_page:
                     error_infoset = {'id' : 'Invalid Page Number',
                                  'description': f'Page number must be from 1, up to a maximum of {max_page}'}
                     return make_response(error_infoset, 404)
     
+    if cursor is not None:
+        try:
+            key, direction = decode_cursor(cursor, 'element_api.elements')
+        except ValueError:
+            return make_response(cursor_error(), 400)
+    
     try:
-        elements, previous_page, next_page = get_db().get_elements_for_api(page_size, page_number=page_number)
+        if cursor is not None:
+            elements, has_previous, has_next = get_db().get_elements_by_cursor(page_size, key, direction)
+        else:
+            elements, previous_page, next_page = get_db().get_elements_for_api(page_size, page_number=page_number)
+            has_previous = previous_page is not None
+            has_next = next_page is not None
+    except ValueError:
+        return make_response(cursor_error(), 400)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                     'description': 'Unable to connect to the database. Please try again later.'}
         return make_response(error_infoset, 500)
     
-    if previous_page is not None:
-        previous_page = url_for('element_api.elements', page=previous_page)
-    if next_page is not None:
-        next_page = url_for('element_api.elements', page=next_page)
-    current_page = url_for('element_api.elements', page=page_number)
+    links = page_links('element_api.elements', elements, lambda element: (element.competency_id, element.element_id), has_previous, has_next, page_number=page_number, cursor=cursor)
     
-    count = len(total_elements)
-    json = {'count': count, 'current_page': current_page, 'previous_page': previous_page, 'next_page': next_page, 'results': [element.to_json() for element in elements]}
+    json = {'count': count, **links, 'results': [element.to_json() for element in elements]}
     return make_response(json, 200)
 
 ## As explained above, elements being distinguished by element_id makes it meaningless to have routes to specific elements, as well as putting and deleting them.
\ No newline at end of file
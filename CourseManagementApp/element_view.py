@@ -1,5 +1,8 @@
 from flask import (Blueprint, render_template, request, flash, redirect, url_for, abort)
 from .dbmanager import get_db
+from .program_graph import get_program_graph
+from .render_cache import cached_page
+from .grouping import group_by
 from .exceptions import ObjectAlreadyExists
 from .element import Element, ElementForm
 from .course_view import get_course_by_id
@@ -9,8 +12,9 @@ bp = Blueprint('element', __name__, url_prefix='/element/')
 @bp.route('/<int:id>/')
 def get_element_by_id(id):
     try:
-        element = get_db().get_element(id)
-        courses = get_db().get_courses_of_element(id)
+        graph = get_program_graph()
+        element = graph.get_element(id)
+        courses = graph.get_courses_of_element(id)
     except:
         flash('Cannot reach the database')
         return redirect(url_for('home.index'))
@@ -22,15 +26,18 @@ def get_element_by_id(id):
         abort(404)
         
 @bp.route('/reference/')
+@cached_page('elements', 'courses_elements', 'courses')
 def get_elements():
     try:
-        elements = get_db().get_elements()
-        course_element_groupings = get_db().get_course_element_groupings()
+        graph = get_program_graph()
+        elements = graph.get_elements()
+        course_element_groupings = graph.get_course_element_groupings()
     except:
         flash('Cannot reach the database')
         return redirect(url_for('home.index'))
         
-    return render_template('elements_reference.html', elements=elements, course_element_groupings=course_element_groupings)
+    courses_by_element = group_by(course_element_groupings, lambda grouping: grouping[2])
+    return render_template('elements_reference.html', elements=elements, courses_by_element=courses_by_element)
 
 @bp.route('/form/add/', methods=['GET', 'POST'])
 @login_required
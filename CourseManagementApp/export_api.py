@@ -0,0 +1,100 @@
+from flask import Blueprint, request, make_response, current_app, Response
+from .db import Database
+from .conditional import conditional
+import csv
+import io
+import json
+
+bp = Blueprint('export_api', __name__, url_prefix = '/api/v1')
+
+## Bulk export of the whole program, so a client can mirror it in a handful of requests instead of paging through every collection.
+## The rows are streamed straight from the database cursor as they are fetched, so memory use does not grow with the catalogue.
+## Each export gets its own Database, closed when the response is closed, since g is torn down before the body streams.
+
+EXPORT_TYPES = {'courses': 'course', 'competencies': 'competency', 'elements': 'element', 'courses_elements': 'course_element'}
+
+def ndjson_chunks(db, collections, arraysize, tagged):
+    for collection in collections:
+        rows = db.iter_export_rows(collection, arraysize)
+        columns = next(rows)
+        lines = []
+        for row in rows:
+            record = dict(zip(columns, row))
+            if tagged:
+                record = {'type': EXPORT_TYPES[collection], **record}
+            lines.append(json.dumps(record) + '\n')
+            if len(lines) >= arraysize:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+
+def csv_chunks(db, collection, arraysize):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    rows = db.iter_export_rows(collection, arraysize)
+    writer.writerow(next(rows))
+    written = 0
+    for row in rows:
+        writer.writerow(row)
+        written += 1
+        if written % arraysize == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def open_export_db():
+    try:
+        return Database()
+    except Exception as e:
+        return None
+
+def database_error():
+    error_infoset = {'id': 'Database Error',
+                     'description': 'Unable to connect to the database. Please try again later.'}
+    return make_response(error_infoset, 500)
+
+@bp.route('/export', methods=['GET'])
+@conditional('courses', 'competencies', 'elements', 'courses_elements')
+def export_program():
+    ## The whole program as one NDJSON stream, each line tagged with the type of record it holds
+    if request.args.get('format', 'ndjson') != 'ndjson':
+        error_infoset = {'id': 'Format Error',
+                         'description': 'The whole program can only be exported as ndjson. Export single collections for csv'}
+        return make_response(error_infoset, 400)
+
+    db = open_export_db()
+    if db is None:
+        return database_error()
+    chunks = ndjson_chunks(db, list(EXPORT_TYPES), current_app.config['EXPORT_ARRAYSIZE'], True)
+    resp = Response(chunks, mimetype='application/x-ndjson')
+    resp.headers['Content-Disposition'] = 'attachment; filename=program.ndjson'
+    resp.call_on_close(db.close)
+    return resp
+
+@bp.route('/export/<collection>', methods=['GET'])
+@conditional('courses', 'competencies', 'elements', 'courses_elements')
+def export_collection(collection):
+    if collection not in EXPORT_TYPES:
+        error_infoset = {'id': 'Not Found',
+                         'description': 'Exportable collections are: ' + ', '.join(EXPORT_TYPES)}
+        return make_response(error_infoset, 404)
+
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        error_infoset = {'id': 'Format Error',
+                         'description': 'Format must be ndjson or csv'}
+        return make_response(error_infoset, 400)
+
+    db = open_export_db()
+    if db is None:
+        return database_error()
+    arraysize = current_app.config['EXPORT_ARRAYSIZE']
+    if export_format == 'csv':
+        resp = Response(csv_chunks(db, collection, arraysize), mimetype='text/csv')
+    else:
+        resp = Response(ndjson_chunks(db, [collection], arraysize, False), mimetype='application/x-ndjson')
+    resp.headers['Content-Disposition'] = f'attachment; filename={collection}.{export_format}'
+    resp.call_on_close(db.close)
+    return resp
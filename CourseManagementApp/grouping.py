@@ -0,0 +1,9 @@
+## Template data grouped once in the view, so a template renders each group with a dict lookup instead of scanning every
+## row once per group.
+
+def group_by(items, key):
+    '''Lists of items keyed by key(item), in the order the items came'''
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return groups
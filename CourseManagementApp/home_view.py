@@ -1,14 +1,18 @@
-from flask import (Blueprint, render_template, flash, redirect, url_for, request, abort)
+from flask import (Blueprint, render_template, flash, redirect, url_for, request, abort, current_app)
 from .dbmanager import get_db
 from .search import SearchForm
+from .search_index import search_program
+from .grouping import group_by
+from .program_graph import get_program_graph
 bp = Blueprint('home', __name__, url_prefix='/')
 
 @bp.route('/', methods=['GET', 'POST'])
 def index():
     form = SearchForm()
     try:
-        courses = get_db().get_courses()
-        terms = get_db().get_terms()
+        graph = get_program_graph()
+        courses = graph.get_courses()
+        terms = graph.get_terms()
     except:
         flash('Unable to connect to database')
         abort(404)
@@ -18,12 +22,13 @@ def index():
             search_query = request.form['search_query']
             return redirect(url_for('home.search', search_query=search_query))
     
-    return render_template('home.html', courses=courses, terms=terms, form=form)
+    courses_by_term = group_by(courses, lambda course: course.term_id)
+    return render_template('home.html', courses_by_term=courses_by_term, terms=terms, form=form)
 
 @bp.route('/<search_query>/')
 def search(search_query):
     try:
-        search_results = get_db().get_search_results(search_query)
+        search_results = search_program(get_db(), search_query, current_app.config['SEARCH_MODE'], current_app.config['SEARCH_CATEGORY_TIMEOUT'])
     except:
         flash('Database Error')
         return redirect(url_for('home.index'))
@@ -0,0 +1,39 @@
+from flask import Blueprint, request, make_response, current_app
+from .dbmanager import get_db
+from .importer import IMPORT_FIELDS, IMPORT_FORMATS, read_records, import_records
+
+bp = Blueprint('import_api', __name__, url_prefix = '/api/v1')
+
+## The format is taken from the format query parameter, or else from the Content-Type (text/csv, application/x-ndjson, application/json).
+## The response is a report of how many rows were imported, with the row number and reason for each one that was not.
+
+CONTENT_TYPE_FORMATS = {'text/csv': 'csv', 'application/x-ndjson': 'ndjson', 'application/json': 'json'}
+
+@bp.route('/import/<collection>', methods=['POST'])
+def import_collection(collection):
+    if collection not in IMPORT_FIELDS:
+        error_infoset = {'id': 'Not Found',
+                         'description': 'Importable collections are: ' + ', '.join(IMPORT_FIELDS)}
+        return make_response(error_infoset, 404)
+
+    data_format = request.args.get('format', CONTENT_TYPE_FORMATS.get(request.mimetype, 'json'))
+    if data_format not in IMPORT_FORMATS:
+        error_infoset = {'id': 'Format Error',
+                         'description': 'Format must be json, ndjson or csv'}
+        return make_response(error_infoset, 400)
+
+    try:
+        records = read_records(request.get_data(as_text=True), data_format)
+    except Exception as e:
+        error_infoset = {'id': 'Data Error',
+                         'description': f'Unable to read the {data_format} data: {e}'}
+        return make_response(error_infoset, 400)
+
+    try:
+        report = import_records(get_db(), collection, records, current_app.config['IMPORT_CHUNK_SIZE'])
+    except Exception as e:
+        error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+        return make_response(error_infoset, 500)
+
+    return make_response(report, 200)
@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+import math
+from .course import Course
+from .competency import Competency
+from .element import Element
+
+## Bulk import of program data (the reverse of export_api). Rows are checked with the same rules as the model constructors,
+## then written a chunk at a time with a single array DML call in one transaction per chunk. A row that fails validation or is
+## rejected by the database is reported by its row number (1 is the first data row) and the rest of its chunk is still kept.
+## element_id is an identity column, so imported elements get new ids and an exported element_id is not carried over.
+
+IMPORT_FIELDS = {
+    'courses': ['course_id', 'course_title', 'theory_hours', 'lab_hours', 'work_hours', 'description', 'domain_id', 'term_id'],
+    'competencies': ['competency_id', 'competency', 'competency_achievement', 'competency_type'],
+    'elements': ['element_order', 'element', 'element_criteria', 'competency_id'],
+    'courses_elements': ['course_id', 'element_id', 'element_hours']
+}
+
+## CSV values are all strings, so these are converted before validation
+INT_FIELDS = {'theory_hours', 'lab_hours', 'work_hours', 'domain_id', 'term_id', 'element_order', 'element_id'}
+## Like the course_elements batch API, courses_elements takes fractional hours
+NUMBER_FIELDS = {'element_hours'}
+
+IMPORT_FORMATS = ('json', 'ndjson', 'csv')
+
+def read_records(data, data_format):
+    '''Parses a json array, ndjson or csv with a header row into a list of dicts'''
+    if data_format == 'csv':
+        return list(csv.DictReader(io.StringIO(data)))
+    if data_format == 'ndjson':
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+    records = json.loads(data)
+    if not isinstance(records, list):
+        raise ValueError('Expected a list of records')
+    return records
+
+def validate_record(collection, record):
+    '''Returns the bind values for one record, or raises TypeError/ValueError describing why it cannot be imported'''
+    if not isinstance(record, dict):
+        raise TypeError('Expected type dict as record')
+    values = []
+    for field in IMPORT_FIELDS[collection]:
+        if field not in record:
+            raise ValueError(f'Missing field {field}')
+        value = record[field]
+        if field in INT_FIELDS and isinstance(value, str) and value.strip().lstrip('-').isdigit():
+            value = int(value)
+        elif field in NUMBER_FIELDS and isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+            else:
+                if value.is_integer():
+                    value = int(value)
+        values.append(value)
+
+    if collection == 'courses':
+        Course(*values)
+    elif collection == 'competencies':
+        Competency(*values)
+    elif collection == 'elements':
+        Element(*values)
+    else:
+        if not isinstance(values[0], str) or len(values[0]) == 0:
+            raise TypeError('course_id must be a non-zero string')
+        if not isinstance(values[1], int):
+            raise TypeError('element_id must be an int')
+        if not isinstance(values[2], (int, float)) or isinstance(values[2], bool) or not math.isfinite(values[2]) or values[2] < 0:
+            raise TypeError('element_hours must be a positive number')
+    return dict(zip(IMPORT_FIELDS[collection], values))
+
+def import_records(db, collection, records, chunk_size=500):
+    '''Validates and inserts records chunk_size at a time, returning a report of how many were imported and why the others were not'''
+    report = {'collection': collection, 'received': len(records), 'imported': 0, 'errors': []}
+    for start in range(0, len(records), chunk_size):
+        rows = []
+        row_numbers = []
+        for number, record in enumerate(records[start:start + chunk_size], start + 1):
+            try:
+                rows.append(validate_record(collection, record))
+                row_numbers.append(number)
+            except (TypeError, ValueError) as e:
+                report['errors'].append({'row': number, 'error': str(e)})
+
+        if rows:
+            failures = db.bulk_insert(collection, rows)
+            for offset, message in failures:
+                report['errors'].append({'row': row_numbers[offset], 'error': message})
+            report['imported'] += len(rows) - len(failures)
+
+    report['errors'].sort(key=lambda error: error['row'])
+    return report
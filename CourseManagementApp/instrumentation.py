@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+from flask import g, has_request_context, request
+
+## Query instrumentation for Database. Every cursor it hands out is wrapped so each statement records its text, bind count,
+## duration (execute plus fetches) and rows fetched. Within a request the records are kept on g.queries and summed up in a
+## Server-Timing header; statements slower than SLOW_QUERY_MS are logged with the route that ran them; and per statement
+## counters are kept for the whole process (see /admin/query-stats/).
+
+logger = logging.getLogger('CourseManagementApp.sql')
+
+enabled = False
+slow_query_ms = 100
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+class InstrumentedCursor:
+    '''Wraps a cursor of either backend, timing and counting everything run through it'''
+    def __init__(self, cursor):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_record', None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = next(self._cursor)
+        except StopIteration:
+            self._add(start, 0)
+            raise
+        self._add(start, 1)
+        return row
+
+    def execute(self, statement, parameters=None, **kwargs):
+        self._finish()
+        start = time.perf_counter()
+        self._begin(statement, len(parameters) if parameters else len(kwargs))
+        self._cursor.execute(statement, parameters, **kwargs)
+        self._add(start, 0)
+        return self
+
+    def executemany(self, statement, parameters, **kwargs):
+        self._finish()
+        start = time.perf_counter()
+        self._begin(statement, len(parameters[0]) if parameters else 0)
+        self._cursor.executemany(statement, parameters, **kwargs)
+        self._add(start, 0)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._add(start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(size) if size else self._cursor.fetchmany()
+        self._add(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._add(start, len(rows))
+        return rows
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+    def _begin(self, statement, bind_count):
+        record = {'statement': statement, 'binds': bind_count, 'ms': 0.0, 'rows': 0,
+                  'route': request.endpoint if has_request_context() else None}
+        object.__setattr__(self, '_record', record)
+
+    def _add(self, start, rows):
+        if self._record is not None:
+            self._record['ms'] += (time.perf_counter() - start) * 1000
+            self._record['rows'] += rows
+
+    def _finish(self):
+        record = self._record
+        if record is None:
+            return
+        object.__setattr__(self, '_record', None)
+        record_query(record)
+
+def record_query(record):
+    if has_request_context():
+        g.setdefault('queries', []).append(record)
+    if record['ms'] >= slow_query_ms:
+        logger.warning('Slow query (%.1f ms, %d rows, %d binds) in %s: %s', record['ms'], record['rows'], record['binds'], record['route'], record['statement'])
+    with _stats_lock:
+        stats = _stats.get(record['statement'])
+        if stats is None:
+            stats = _stats[record['statement']] = {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0}
+        stats['calls'] += 1
+        stats['total_ms'] += record['ms']
+        stats['max_ms'] = max(stats['max_ms'], record['ms'])
+        stats['rows'] += record['rows']
+
+def instrument(cursor):
+    if not enabled:
+        return cursor
+    return InstrumentedCursor(cursor)
+
+def query_stats(limit=50):
+    '''The statements that took the most time in total, slowest first'''
+    with _stats_lock:
+        stats = [{'statement': statement, **values} for statement, values in _stats.items()]
+    stats.sort(key=lambda stat: stat['total_ms'], reverse=True)
+    for stat in stats:
+        stat['total_ms'] = round(stat['total_ms'], 3)
+        stat['max_ms'] = round(stat['max_ms'], 3)
+        stat['avg_ms'] = round(stat['total_ms'] / stat['calls'], 3)
+    return stats[:limit]
+
+def add_server_timing(response):
+    queries = g.get('queries')
+    if queries:
+        total = sum(query['ms'] for query in queries)
+        response.headers.add('Server-Timing', f'db;dur={total:.1f};desc="{len(queries)} queries"')
+    return response
+
+def init_instrumentation(app):
+    global enabled, slow_query_ms
+    enabled = app.config['QUERY_INSTRUMENTATION']
+    slow_query_ms = app.config['SLOW_QUERY_MS']
+    if enabled:
+        app.after_request(add_server_timing)
@@ -0,0 +1,215 @@
+import atexit
+import json
+import os
+import threading
+import time
+from flask import Response, g, request
+from . import cache
+from .backends import get_default_backend
+
+## Prometheus text-format metrics at /metrics: request latency, in-flight requests, DB time per request (from the query
+## instrumentation), connection pool usage, cache hits and API error ids, labelled by blueprint and endpoint.
+## Each process keeps its own series in memory. With METRICS_DIR set (one directory shared by every gunicorn worker), each
+## worker also writes a snapshot of them to METRICS_DIR/metrics-<pid>.json at most every METRICS_FLUSH_INTERVAL seconds, and
+## /metrics adds up the snapshots of every worker. Gauges of workers that have exited are dropped; their counters are kept.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    'http_request_duration_seconds': ('histogram', 'Request latency'),
+    'http_request_db_seconds': ('histogram', 'Time spent in database statements per request'),
+    'http_requests_in_flight': ('gauge', 'Requests being handled'),
+    'http_requests_total': ('counter', 'Requests handled, by status code'),
+    'api_errors_total': ('counter', 'Error responses, by the id of their error infoset'),
+    'db_pool_connections': ('gauge', 'Pooled Oracle connections, by state'),
+    'db_pool_acquired_total': ('counter', 'Connections acquired from the pool'),
+    'db_pool_wait_seconds_total': ('counter', 'Time spent waiting for a pooled connection'),
+    'cache_requests_total': ('counter', 'Cache lookups, by cache and result')
+}
+
+class Registry:
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def add_gauge(self, name, labels, value):
+        key = (name, labels)
+        with self.lock:
+            self.gauges[key] = self.gauges.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = (name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * len(LATENCY_BUCKETS), 0.0, 0]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def snapshot(self):
+        '''This process' series, with the gauges and counters read from the pool and the caches at this moment'''
+        with self.lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            histograms = {key: [list(value[0]), value[1], value[2]] for key, value in self.histograms.items()}
+        pool = get_default_backend().stats()
+        if pool is not None:
+            gauges[('db_pool_connections', (('state', 'open'),))] = pool['open']
+            gauges[('db_pool_connections', (('state', 'busy'),))] = pool['busy']
+            gauges[('db_pool_connections', (('state', 'max'),))] = pool['max']
+            counters[('db_pool_acquired_total', ())] = pool['acquired']
+            counters[('db_pool_wait_seconds_total', ())] = pool['total_wait_ms'] / 1000
+        for cache_name, entries in cached_stores().items():
+            counters[('cache_requests_total', (('cache', cache_name), ('result', 'hit')))] = entries.hits
+            counters[('cache_requests_total', (('cache', cache_name), ('result', 'miss')))] = entries.misses
+        return {'pid': os.getpid(),
+                'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+                'gauges': [[name, labels, value] for (name, labels), value in gauges.items()],
+                'histograms': [[name, labels, value] for (name, labels), value in histograms.items()]}
+
+registry = Registry()
+metrics_dir = None
+flush_interval = 1.0
+_last_flush = 0.0
+
+def cached_stores():
+    from .search_index import suggestion_cache
+    from .reports import report_cache
+    return {'entity': cache.entity_cache.entries, 'users': cache.user_cache.entries, 'suggestions': suggestion_cache, 'reports': report_cache}
+
+def flush():
+    global _last_flush
+    _last_flush = time.monotonic()
+    path = os.path.join(metrics_dir, f'metrics-{os.getpid()}.json')
+    with open(f'{path}.tmp', 'w') as f:
+        json.dump(registry.snapshot(), f)
+    os.replace(f'{path}.tmp', path)
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def collect():
+    '''Every process' snapshot: this one from memory, the others from METRICS_DIR'''
+    snapshots = [registry.snapshot()]
+    if metrics_dir is not None:
+        for file_name in os.listdir(metrics_dir):
+            if not file_name.startswith('metrics-') or not file_name.endswith('.json') or file_name == f'metrics-{os.getpid()}.json':
+                continue
+            try:
+                with open(os.path.join(metrics_dir, file_name)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if not process_alive(snapshot['pid']):
+                snapshot['gauges'] = []
+            snapshots.append(snapshot)
+    return snapshots
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label_value(value)}"' for name, value in labels) + '}'
+
+def exposition():
+    counters = {}
+    gauges = {}
+    histograms = {}
+    for snapshot in collect():
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(tuple(label) for label in labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, value in snapshot['gauges']:
+            key = (name, tuple(tuple(label) for label in labels))
+            gauges[key] = gauges.get(key, 0) + value
+        for name, labels, value in snapshot['histograms']:
+            key = (name, tuple(tuple(label) for label in labels))
+            total = histograms.setdefault(key, [[0] * len(LATENCY_BUCKETS), 0.0, 0])
+            total[0] = [a + b for a, b in zip(total[0], value[0])]
+            total[1] += value[1]
+            total[2] += value[2]
+
+    lines = []
+    for name, (metric_type, description) in METRICS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        if metric_type == 'histogram':
+            for (series, labels), (buckets, total, count) in sorted(histograms.items()):
+                if series != name:
+                    continue
+                for bound, bucket in zip(LATENCY_BUCKETS, buckets):
+                    lines.append(f'{name}_bucket{format_labels(labels + (("le", bound),))} {bucket}')
+                lines.append(f'{name}_bucket{format_labels(labels + (("le", "+Inf"),))} {count}')
+                lines.append(f'{name}_sum{format_labels(labels)} {total}')
+                lines.append(f'{name}_count{format_labels(labels)} {count}')
+        else:
+            series_values = counters if metric_type == 'counter' else gauges
+            for (series, labels), value in sorted(series_values.items()):
+                if series == name:
+                    lines.append(f'{name}{format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+def request_labels():
+    return (('blueprint', request.blueprint or ''), ('endpoint', request.endpoint or ''))
+
+def start_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_labels = request_labels()
+    registry.add_gauge('http_requests_in_flight', g.metrics_labels, 1)
+
+def observe_response(response):
+    labels = g.get('metrics_labels')
+    if labels is None:
+        return response
+    registry.observe('http_request_duration_seconds', labels, time.perf_counter() - g.metrics_start)
+    registry.inc('http_requests_total', labels + (('status', response.status_code),))
+    queries = g.get('queries')
+    if queries:
+        registry.observe('http_request_db_seconds', labels, sum(query['ms'] for query in queries) / 1000)
+    if response.status_code >= 400 and response.is_json:
+        body = response.get_json(silent=True)
+        if isinstance(body, dict) and 'id' in body:
+            registry.inc('api_errors_total', labels + (('error_id', body['id']),))
+    return response
+
+def end_request(exception):
+    labels = g.pop('metrics_labels', None)
+    if labels is not None:
+        registry.add_gauge('http_requests_in_flight', labels, -1)
+    if metrics_dir is not None and time.monotonic() - _last_flush >= flush_interval:
+        flush()
+
+def metrics_view():
+    return Response(exposition(), mimetype='text/plain; version=0.0.4')
+
+def init_metrics(app):
+    global metrics_dir, flush_interval
+    if not app.config['METRICS']:
+        return
+    metrics_dir = app.config['METRICS_DIR']
+    flush_interval = app.config['METRICS_FLUSH_INTERVAL']
+    if metrics_dir is not None:
+        os.makedirs(metrics_dir, exist_ok=True)
+        atexit.register(flush)
+    app.before_request(start_request)
+    app.after_request(observe_response)
+    app.teardown_request(end_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
@@ -0,0 +1,55 @@
+import base64
+import json
+from flask import url_for
+
+## Keyset (seek) pagination for the /api/v1 collections. A cursor token is an opaque, url-safe encoding of the sort key of the
+## row it was taken from, the direction to read in from there, and the collection it belongs to. Reading from a key is an indexed range scan, so deep pages
+## cost the same as page 1, unlike OFFSET which scans and discards every skipped row. Cursors of nested collections also hold
+## the ids of their parent, so one taken from a course's elements cannot be replayed against another course.
+
+def encode_cursor(key, direction, collection, parent=None):
+    payload = json.dumps({'c': collection, 'p': parent or {}, 'k': list(key), 'd': direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token, collection, **parent):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('utf-8'))
+        key = payload['k']
+        direction = payload['d']
+    except Exception:
+        raise ValueError('Malformed cursor')
+    if payload.get('c') != collection or payload.get('p', {}) != parent:
+        raise ValueError('Cursor belongs to another collection')
+    if not isinstance(key, list) or len(key) == 0 or direction not in ('next', 'prev'):
+        raise ValueError('Malformed cursor')
+    for value in key:
+        if not isinstance(value, (int, str)) or isinstance(value, bool):
+            raise ValueError('Malformed cursor')
+    return tuple(key), direction
+
+def page_links(endpoint, items, key, has_previous, has_next, page_number=None, cursor=None, **url_args):
+    '''Builds the current/previous/next links of a collection response, plus the cursor tokens for keyset navigation'''
+    previous_cursor = None
+    next_cursor = None
+    if len(items) > 0:
+        if has_previous:
+            previous_cursor = encode_cursor(key(items[0]), 'prev', endpoint, url_args)
+        if has_next:
+            next_cursor = encode_cursor(key(items[-1]), 'next', endpoint, url_args)
+
+    if cursor is not None:
+        current_page = url_for(endpoint, cursor=cursor, **url_args)
+        previous_page = url_for(endpoint, cursor=previous_cursor, **url_args) if previous_cursor else None
+        next_page = url_for(endpoint, cursor=next_cursor, **url_args) if next_cursor else None
+    else:
+        current_page = url_for(endpoint, page=page_number, **url_args)
+        previous_page = url_for(endpoint, page=page_number - 1, **url_args) if has_previous else None
+        next_page = url_for(endpoint, page=page_number + 1, **url_args) if has_next else None
+
+    return {'current_page': current_page, 'previous_page': previous_page, 'next_page': next_page,
+            'previous_cursor': previous_cursor, 'next_cursor': next_cursor}
+
+def cursor_error():
+    error_infoset = {'id': 'Invalid Cursor',
+                     'description': 'Cursor must be a previous_cursor or next_cursor value returned by this collection'}
+    return error_infoset
@@ -0,0 +1,170 @@
+import copy
+import threading
+import time
+from types import MappingProxyType
+from . import cache
+from .dbmanager import get_db
+
+## In-memory snapshot of the whole program graph: every term, domain, course, competency and element, and the adjacency
+## between them (course <-> element <-> competency, domain -> courses, term -> courses). It is built in one bulk load, read
+## past the entity cache in a single read only transaction, and never changed afterwards; when a write bumps the version of
+## one of GRAPH_TABLES, the next reader builds a new snapshot and swaps it in, while requests already holding the old one keep
+## using it. A snapshot older than ttl seconds (PROGRAM_GRAPH_TTL) is rebuilt as well, which bounds how long a write the
+## versions of this process never saw stays hidden. Entities are handed out as copies.
+## Orders match the SQL the snapshot replaces: courses by term then id, elements by competency then id.
+
+GRAPH_TABLES = ('terms', 'domains', 'courses', 'competencies', 'elements', 'courses_elements')
+
+def freeze(groups):
+    return MappingProxyType({key: tuple(values) for key, values in groups.items()})
+
+class ProgramGraph:
+    def __init__(self, version, terms, domains, courses, competencies, elements, links):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.terms = MappingProxyType({term.term_id: term for term in terms})
+        self.domains = MappingProxyType({domain.domain_id: domain for domain in domains})
+        self.courses = MappingProxyType({course.course_id: course for course in courses})
+        self.competencies = MappingProxyType({competency.competency_id: competency for competency in competencies})
+        self.elements = MappingProxyType({element.element_id: element for element in elements})
+        self.hours = MappingProxyType({(course_id, element_id): element_hours for course_id, element_id, element_hours in links})
+
+        course_order = {course_id: i for i, course_id in enumerate(self.courses)}
+        element_order = {element_id: i for i, element_id in enumerate(self.elements)}
+        course_elements = {}
+        element_courses = {}
+        for course_id, element_id in sorted(self.hours, key=lambda link: (course_order[link[0]], element_order[link[1]])):
+            course_elements.setdefault(course_id, []).append(element_id)
+        for course_id, element_id in sorted(self.hours, key=lambda link: (element_order[link[1]], course_order[link[0]])):
+            element_courses.setdefault(element_id, []).append(course_id)
+        competency_elements = {}
+        for element in self.elements.values():
+            competency_elements.setdefault(element.competency_id, []).append(element.element_id)
+        competency_courses = {}
+        for competency_id, element_ids in competency_elements.items():
+            linked = {course_id for element_id in element_ids for course_id in element_courses.get(element_id, ())}
+            if linked:
+                competency_courses[competency_id] = sorted(linked, key=course_order.get)
+        course_competencies = {}
+        for course_id, element_ids in course_elements.items():
+            course_competencies[course_id] = list(dict.fromkeys(self.elements[element_id].competency_id for element_id in element_ids))
+        domain_courses = {}
+        term_courses = {}
+        for course in self.courses.values():
+            domain_courses.setdefault(course.domain_id, []).append(course.course_id)
+            term_courses.setdefault(course.term_id, []).append(course.course_id)
+
+        self.course_elements = freeze(course_elements)
+        self.element_courses = freeze(element_courses)
+        self.competency_elements = freeze(competency_elements)
+        self.competency_courses = freeze(competency_courses)
+        self.course_competencies = freeze(course_competencies)
+        self.domain_courses = freeze(domain_courses)
+        self.term_courses = freeze(term_courses)
+
+    def __entity(self, entities, key):
+        entity = entities.get(key)
+        return None if entity is None else copy.copy(entity)
+
+    def __entities(self, entities, keys):
+        return [copy.copy(entities[key]) for key in keys]
+
+    def get_course(self, course_id):
+        return self.__entity(self.courses, course_id)
+
+    def get_competency(self, competency_id):
+        return self.__entity(self.competencies, competency_id)
+
+    def get_element(self, element_id):
+        return self.__entity(self.elements, element_id)
+
+    def get_domain(self, domain_id):
+        return self.__entity(self.domains, domain_id)
+
+    def get_terms(self):
+        return self.__entities(self.terms, self.terms)
+
+    def get_domains(self):
+        return self.__entities(self.domains, self.domains)
+
+    def get_courses(self):
+        return self.__entities(self.courses, self.courses)
+
+    def get_competencies(self):
+        return self.__entities(self.competencies, self.competencies)
+
+    def get_elements(self):
+        return self.__entities(self.elements, self.elements)
+
+    def get_courses_of_term(self, term_id):
+        return self.__entities(self.courses, self.term_courses.get(term_id, ()))
+
+    def get_courses_of_domain(self, domain_id):
+        return self.__entities(self.courses, self.domain_courses.get(domain_id, ()))
+
+    def get_courses_of_element(self, element_id):
+        return self.__entities(self.courses, self.element_courses.get(element_id, ()))
+
+    def get_courses_of_competency(self, competency_id):
+        return self.__entities(self.courses, self.competency_courses.get(competency_id, ()))
+
+    def get_elements_of_competency(self, competency_id):
+        return self.__entities(self.elements, self.competency_elements.get(competency_id, ()))
+
+    def get_elements_of_course(self, course_id):
+        return self.__entities(self.elements, self.course_elements.get(course_id, ()))
+
+    def get_competencies_of_course(self, course_id):
+        return self.__entities(self.competencies, sorted(self.course_competencies.get(course_id, ())))
+
+    def get_course_competency_groupings(self):
+        '''(competency_id, course_id, course_title) for every competency a course reaches through an element'''
+        return [(competency_id, course_id, self.courses[course_id].course_title)
+                for competency_id in sorted(self.competency_courses) for course_id in self.competency_courses[competency_id]]
+
+    def get_course_element_groupings(self):
+        '''(course_id, course_title, element_id, element, element_hours, competency_id) for every course-element link'''
+        groupings = []
+        for course_id, element_ids in self.course_elements.items():
+            course = self.courses[course_id]
+            for element_id in element_ids:
+                element = self.elements[element_id]
+                groupings.append((course_id, course.course_title, element_id, element.element, self.hours[(course_id, element_id)], element.competency_id))
+        return groupings
+
+    def get_course_bundle(self, course_id):
+        '''The same (course, domain, competencies, elements, element_hours, total_element_hours) as Database.get_course_bundle, or None'''
+        course = self.get_course(course_id)
+        if course is None:
+            return None
+        element_ids = self.course_elements.get(course_id, ())
+        element_hours = [(element_id, self.hours[(course_id, element_id)]) for element_id in element_ids]
+        return (course, self.get_domain(course.domain_id), self.get_competencies_of_course(course_id),
+                self.__entities(self.elements, element_ids), element_hours, sum(hours for _, hours in element_hours))
+
+def build_program_graph(db, version):
+    return ProgramGraph(version, *db.get_program_snapshot())
+
+_graph = None
+_lock = threading.Lock()
+ttl = 60
+
+def _current(graph, version):
+    return graph is not None and graph.version == version and time.monotonic() - graph.built_at < ttl
+
+def get_program_graph():
+    '''The current snapshot, rebuilt first if GRAPH_TABLES changed since it was built or it is older than ttl seconds'''
+    global _graph
+    version = tuple(cache.versions.version(table) for table in GRAPH_TABLES)
+    graph = _graph
+    if _current(graph, version):
+        return graph
+    with _lock:
+        if not _current(_graph, version):
+            # Stamped with the versions read before loading, so a write made during the load triggers another rebuild
+            _graph = build_program_graph(get_db(), version)
+        return _graph
+
+def init_program_graph(app):
+    global ttl
+    ttl = app.config['PROGRAM_GRAPH_TTL']
@@ -0,0 +1,66 @@
+from functools import wraps
+from flask import Response, request, session
+from flask.globals import request_ctx
+from flask_login import current_user
+from markupsafe import Markup
+from . import cache
+
+## Render cache for the public catalogue pages. @cached_page keeps whole responses for anonymous visitors; the
+## cached_fragment template global keeps rendered blocks of a template for everyone else. Keys include the endpoint (or
+## fragment name) and its arguments, who is looking (anonymous, reader or editor, the only distinction the templates make)
+## and the version of every table the markup is built from, so any write through Database makes the old markup unreachable.
+## Pages that show flashed messages are never stored. Nothing is cached while writes made by other workers do not reach the
+## versions (cache.versions_shared()), since the TTL alone would leave their markup stale for minutes.
+
+enabled = True
+page_cache = cache.TTLCache(maxsize=256, ttl=300)
+fragment_cache = cache.TTLCache(maxsize=1024, ttl=300)
+
+def data_version(tables):
+    return tuple(cache.versions.version(table) for table in tables)
+
+def audience():
+    if not current_user.is_authenticated:
+        return 'anonymous'
+    if current_user.blocked:
+        return 'reader'
+    return 'editor'
+
+def cached_page(*tables):
+    '''Serves anonymous GETs of the decorated view from the page cache while the given tables are unchanged'''
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not enabled or not cache.versions_shared() or request.method != 'GET' or current_user.is_authenticated or '_flashes' in session:
+                return view(*args, **kwargs)
+            key = (request.endpoint, request.full_path, data_version(tables))
+            page = page_cache.get(key)
+            if page is not None:
+                return Response(page[0], mimetype=page[1], headers={'X-Render-Cache': 'hit'})
+            response = view(*args, **kwargs)
+            if isinstance(response, str):
+                response = Response(response)
+            if isinstance(response, Response) and response.status_code == 200 and not request_ctx.flashes:
+                page_cache.set(key, (response.get_data(), response.mimetype))
+                response.headers['X-Render-Cache'] = 'miss'
+            return response
+        return wrapper
+    return decorator
+
+def cached_fragment(name, *tables, caller, **args):
+    '''Template global, used as {% call cached_fragment(name, table, ..., key=value) %}markup{% endcall %}'''
+    if not enabled or not cache.versions_shared():
+        return caller()
+    key = (name, tuple(sorted(args.items())), audience(), data_version(tables))
+    markup = fragment_cache.get(key)
+    if markup is None:
+        markup = caller()
+        fragment_cache.set(key, markup)
+    return Markup(markup)
+
+def init_render_cache(app):
+    global enabled, page_cache, fragment_cache
+    enabled = app.config['RENDER_CACHE']
+    page_cache = cache.TTLCache(app.config['RENDER_CACHE_PAGES'], app.config['RENDER_CACHE_TTL'])
+    fragment_cache = cache.TTLCache(app.config['RENDER_CACHE_FRAGMENTS'], app.config['RENDER_CACHE_TTL'])
+    app.jinja_env.globals['cached_fragment'] = cached_fragment
@@ -0,0 +1,17 @@
+from flask import Blueprint, make_response
+from .dbmanager import get_db
+from .reports import REPORT_TABLES, get_program_report
+from .conditional import conditional
+
+bp = Blueprint('report_api', __name__, url_prefix = '/api/v1')
+
+@bp.route('/reports/program', methods=['GET'])
+@conditional(*REPORT_TABLES)
+def program_report():
+    try:
+        report = get_program_report(get_db())
+    except Exception as e:
+        error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+        return make_response(error_infoset, 500)
+    return make_response(report, 200)
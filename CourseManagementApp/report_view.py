@@ -0,0 +1,13 @@
+from flask import (Blueprint, render_template, flash, redirect, url_for)
+from .dbmanager import get_db
+from .reports import get_program_report
+bp = Blueprint('report', __name__, url_prefix='/reports/')
+
+@bp.route('/')
+def program_report():
+    try:
+        report = get_program_report(get_db())
+    except:
+        flash('Cannot reach the database')
+        return redirect(url_for('home.index'))
+    return render_template('program_report.html', report=report)
@@ -0,0 +1,64 @@
+from . import cache
+
+## Whole-program reports: hours and credits per course and per term, the course x competency coverage matrix and the competencies
+## no course covers. Everything is aggregated in one pass over the joined course-element rows, with the same formulas as
+## courses_package.calculate_total_hours ((theory + lab) * 15) and calculate_credits ((theory + lab + work) / 3).
+## A report is kept until the next write to one of the tables it is built from, and only while writes made by other workers
+## reach the versions (cache.versions_shared()); otherwise it is built for every request.
+
+REPORT_TABLES = ('courses', 'courses_elements', 'elements', 'competencies', 'terms')
+
+report_cache = cache.TTLCache(maxsize=4, ttl=3600)
+
+def build_program_report(rows, terms, competencies):
+    competency_ids = [competency.competency_id for competency in competencies]
+    column = {competency_id: i for i, competency_id in enumerate(competency_ids)}
+    courses = {}
+    matrix = {}
+    covered = set()
+    for course_id, course_title, term_id, theory_hours, lab_hours, work_hours, competency_id, element_hours in rows:
+        course = courses.get(course_id)
+        if course is None:
+            course = {'course_id': course_id, 'course_title': course_title, 'term_id': term_id,
+                      'total_hours': (theory_hours + lab_hours) * 15, 'credits': round((theory_hours + lab_hours + work_hours) / 3, 2),
+                      'element_hours': 0}
+            courses[course_id] = course
+            matrix[course_id] = [0] * len(competency_ids)
+        if element_hours is not None:
+            course['element_hours'] += element_hours
+            if competency_id in column:
+                matrix[course_id][column[competency_id]] += element_hours
+                covered.add(competency_id)
+
+    term_totals = {term.term_id: {'term_id': term.term_id, 'term_name': term.term_name, 'courses': 0, 'total_hours': 0, 'credits': 0, 'element_hours': 0}
+                   for term in terms}
+    for course in courses.values():
+        course['element_hours'] = round(course['element_hours'], 2)
+        course['hours_match'] = course['element_hours'] == course['total_hours']
+        term = term_totals.get(course['term_id'])
+        if term is not None:
+            term['courses'] += 1
+            term['total_hours'] += course['total_hours']
+            term['credits'] = round(term['credits'] + course['credits'], 2)
+            term['element_hours'] = round(term['element_hours'] + course['element_hours'], 2)
+
+    return {'courses': list(courses.values()),
+            'terms': list(term_totals.values()),
+            'totals': {'courses': len(courses),
+                       'total_hours': sum(course['total_hours'] for course in courses.values()),
+                       'credits': round(sum(course['credits'] for course in courses.values()), 2)},
+            'coverage': {'competencies': competency_ids,
+                         'courses': [{'course_id': course_id, 'hours': [round(hours, 2) for hours in row]} for course_id, row in matrix.items()]},
+            'uncovered_competencies': [{'competency_id': competency.competency_id, 'competency': competency.competency}
+                                       for competency in competencies if competency.competency_id not in covered]}
+
+def get_program_report(db):
+    '''The program report, rebuilt only after a write to one of REPORT_TABLES. Shared between requests, so treat it as read-only'''
+    if not cache.versions_shared():
+        return build_program_report(db.get_program_report_rows(), db.get_terms(), db.get_competencies())
+    key = tuple(cache.versions.version(table) for table in REPORT_TABLES)
+    report = report_cache.get(key)
+    if report is None:
+        report = build_program_report(db.get_program_report_rows(), db.get_terms(), db.get_competencies())
+        report_cache.set(key, report)
+    return report
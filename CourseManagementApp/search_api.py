@@ -0,0 +1,36 @@
+from flask import Blueprint, request, make_response
+from .dbmanager import get_db
+from .search_index import program_index
+from .conditional import conditional
+
+bp = Blueprint('search_api', __name__, url_prefix = '/api/v1')
+
+## Typeahead for search boxes: the best completions of q in each category, served from the search index
+
+@bp.route('/search/suggest', methods=['GET'])
+@conditional('courses', 'terms', 'competencies', 'elements')
+def suggest():
+    query = request.args.get('q', '').strip()
+    if len(query) == 0:
+        error_infoset = {'id': 'Query Error',
+                         'description': 'q must contain the text to complete'}
+        return make_response(error_infoset, 400)
+
+    limit = request.args.get('limit', '10')
+    if not limit.isdigit() or not 1 <= int(limit) <= 50:
+        error_infoset = {'id': 'Limit Error',
+                         'description': 'limit must be a number between 1 and 50'}
+        return make_response(error_infoset, 400)
+
+    try:
+        suggestions = program_index.suggest(get_db(), query, int(limit))
+    except Exception as e:
+        error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+        return make_response(error_infoset, 500)
+
+    json = {'query': query,
+            'courses': [{'course_id': course[0], 'course_title': course[1]} for course in suggestions['courses']],
+            'competencies': [{'competency_id': competency[0], 'competency': competency[1]} for competency in suggestions['competencies']],
+            'elements': [{'element_id': element[0], 'element': element[1], 'competency_id': element[2]} for element in suggestions['elements']]}
+    return make_response(json, 200)
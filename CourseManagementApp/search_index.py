@@ -0,0 +1,180 @@
+import heapq
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_left
+from . import cache
+from .db import Database
+
+## In-memory inverted index over the searchable text of the program, answering home_view.search without the leading-wildcard
+## LIKE scans of Database.get_search_results. Each category maps tokens to the rows containing them, and a trigram index over the
+## tokens finds matches inside words (like LIKE '%q%' does) for terms of 3 characters or more; shorter terms match by prefix.
+## A category is rebuilt from the database the first time it is searched after a write to one of its tables, or once it is
+## older than SEARCH_INDEX_TTL seconds, which bounds how long a write the versions of this process missed can stay hidden.
+
+## Each category lists the tables it is built from, how to turn a row into the result tuple the template expects,
+## and the weight of each column when ranking (ids and titles count more than descriptions)
+SEARCH_CATEGORIES = {
+    'courses': {'tables': ('courses', 'terms'), 'result': lambda row: (row[0], row[1]), 'weights': (3, 3, 1, 1, 1)},
+    'competencies': {'tables': ('competencies',), 'result': lambda row: (row[0], row[1]), 'weights': (3, 3, 1, 1)},
+    'elements': {'tables': ('elements',), 'result': lambda row: (row[0], row[1], row[3]), 'weights': (0, 3, 1, 1)},
+    'domains': {'tables': ('domains',), 'result': lambda row: (row[0], row[1]), 'weights': (0, 3, 1)}
+}
+
+EXACT, PREFIX, INFIX = 3, 2, 1
+
+## Typeahead only completes courses, competencies and elements. Answers for hot prefixes are kept in a small LRU, keyed by
+## the table versions so a write is never hidden by it, and kept SEARCH_SUGGEST_TTL seconds at most for writes they miss
+SUGGEST_CATEGORIES = ('courses', 'competencies', 'elements')
+suggestion_cache = cache.TTLCache(maxsize=512, ttl=30)
+
+def tokenize(text):
+    return re.findall(r'\w+', str(text).lower())
+
+def trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+class CategoryIndex:
+    '''Inverted index over the rows of one search category'''
+    def __init__(self, rows, result, weights):
+        self.results = [result(row) for row in rows]
+        self.postings = {}
+        for number, row in enumerate(rows):
+            for value, weight in zip(row, weights):
+                if value is None or weight == 0:
+                    continue
+                for token in tokenize(value):
+                    documents = self.postings.setdefault(token, {})
+                    documents[number] = max(documents.get(number, 0), weight)
+        self.tokens = sorted(self.postings)
+        self.trigrams = {}
+        for token in self.tokens:
+            for trigram in trigrams(token):
+                self.trigrams.setdefault(trigram, set()).add(token)
+
+    def matching_tokens(self, term, infix=True):
+        '''Yields each indexed token containing term, with how well it matches'''
+        i = bisect_left(self.tokens, term)
+        while i < len(self.tokens) and self.tokens[i].startswith(term):
+            yield self.tokens[i], EXACT if self.tokens[i] == term else PREFIX
+            i += 1
+        if infix and len(term) >= 3:
+            candidates = None
+            for trigram in trigrams(term):
+                tokens = self.trigrams.get(trigram, set())
+                candidates = tokens if candidates is None else candidates & tokens
+                if not candidates:
+                    return
+            for token in candidates:
+                if term in token and not token.startswith(term):
+                    yield token, INFIX
+
+    def search(self, terms, infix=True, limit=None):
+        '''Returns the results matching every term, best match first, ties in the usual listing order'''
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for token, quality in self.matching_tokens(term, infix):
+                for number, weight in self.postings[token].items():
+                    term_scores[number] = max(term_scores.get(number, 0), quality * weight)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {number: scores[number] + score for number, score in term_scores.items() if number in scores}
+            if not scores:
+                return []
+        rank = lambda number: (-scores[number], number)
+        if limit is not None:
+            return [self.results[number] for number in heapq.nsmallest(limit, scores, key=rank)]
+        return [self.results[number] for number in sorted(scores, key=rank)]
+
+class ProgramIndex:
+    '''The search index of every category, each stamped with the versions of the tables it was built from and when'''
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self.__categories = {}
+        self.__lock = threading.Lock()
+
+    def category(self, db, name):
+        spec = SEARCH_CATEGORIES[name]
+        versions = tuple(cache.versions.version(table) for table in spec['tables'])
+        built = self.__categories.get(name)
+        if self.__current(built, versions):
+            return built[2]
+        with self.__lock:
+            built = self.__categories.get(name)
+            if not self.__current(built, versions):
+                built = (versions, time.monotonic(), CategoryIndex(db.get_search_documents(name), spec['result'], spec['weights']))
+                self.__categories[name] = built
+        return built[2]
+
+    def __current(self, built, versions):
+        return built is not None and built[0] == versions and time.monotonic() - built[1] < self.ttl
+
+    def search(self, db, query):
+        '''Same result groups as Database.get_search_results: [courses, competencies, elements, domains], None for a category that failed'''
+        terms = tokenize(query)
+        results = []
+        for name in SEARCH_CATEGORIES:
+            try:
+                results.append(self.category(db, name).search(terms) if terms else [])
+            except db.backend.Error as e:
+                results.append(None)
+        return results
+
+    def suggest(self, db, query, limit=10):
+        '''Top completions per category for a query as it is being typed, matching each word by prefix only'''
+        terms = tokenize(query)
+        tables = sorted({table for name in SUGGEST_CATEGORIES for table in SEARCH_CATEGORIES[name]['tables']})
+        key = (tuple(terms), limit, tuple(cache.versions.version(table) for table in tables))
+        suggestions = suggestion_cache.get(key)
+        if suggestions is None:
+            suggestions = {}
+            for name in SUGGEST_CATEGORIES:
+                suggestions[name] = self.category(db, name).search(terms, False, limit) if terms else []
+            suggestion_cache.set(key, suggestions)
+        return suggestions
+
+    def clear(self):
+        with self.__lock:
+            self.__categories = {}
+
+program_index = ProgramIndex()
+
+## Parallel mode still runs the LIKE queries, but each category on its own connection (from the pool when DB_POOL is on),
+## so a search takes as long as the slowest query instead of the sum of all four. A category that has not answered within
+## the timeout is reported as failed (None) and its query is left to finish in the background.
+
+search_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='search')
+
+def search_category(backend, category, query):
+    db = Database(backend=backend)
+    try:
+        return db.get_search_category(category, query)
+    finally:
+        db.close()
+
+def parallel_search(backend, query, timeout):
+    futures = [search_executor.submit(search_category, backend, category, query) for category in Database.search_queries]
+    deadline = time.monotonic() + timeout
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result(timeout=max(0, deadline - time.monotonic())))
+        except Exception as e:
+            results.append(None)
+    return results
+
+def search_program(db, query, mode='index', timeout=2.0):
+    if mode == 'like':
+        return db.get_search_results(query)
+    if mode == 'fulltext':
+        return db.get_search_results(query, fulltext=True)
+    if mode == 'parallel':
+        return parallel_search(db.backend, query, timeout)
+    return program_index.search(db, query)
+
+def init_search_index(app):
+    program_index.ttl = app.config['SEARCH_INDEX_TTL']
+    suggestion_cache.ttl = app.config['SEARCH_SUGGEST_TTL']
@@ -1,49 +1,111 @@
 
---table to hold logs
+--table to hold logs, read in log_id order by the change feed (change_feed.py)
+--every row is one change to one row of table_name: operation is INSERT, UPDATE or DELETE and row_key is its primary key
+--(course_id || '/' || element_id for courses_elements); an update that changes the key is logged as a DELETE and an INSERT
 create table audit_logs (
     --to keep track of logs in order
-    log_id number generated always as identity,
+    log_id number generated always as identity primary key,
     log_user varchar2(100),
-    change_time timestamp,
-    message varchar2(100)
+    change_time timestamp default current_timestamp,
+    table_name varchar2(30) not null,
+    operation varchar2(6) not null,
+    row_key varchar2(100) not null
 );
 
+--terms
+create or replace trigger audit_terms after insert or update or delete on terms for each row
+begin
+    if deleting or (updating and :OLD.term_id <> :NEW.term_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'terms', 'DELETE', :OLD.term_id);
+    end if;
+    if inserting or (updating and :OLD.term_id <> :NEW.term_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'terms', 'INSERT', :NEW.term_id);
+    elsif updating then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'terms', 'UPDATE', :NEW.term_id);
+    end if;
+end;
+/
+
+--domains
+create or replace trigger audit_domains after insert or update or delete on domains for each row
+begin
+    if deleting or (updating and :OLD.domain_id <> :NEW.domain_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'domains', 'DELETE', :OLD.domain_id);
+    end if;
+    if inserting or (updating and :OLD.domain_id <> :NEW.domain_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'domains', 'INSERT', :NEW.domain_id);
+    elsif updating then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'domains', 'UPDATE', :NEW.domain_id);
+    end if;
+end;
+/
+
 --courses
-    --update
-    create or replace trigger after_courses_updated after update on courses for each row
-    begin
-        insert into audit_logs (log_user, change_time, message) values (USER, current_timestamp, 'updated: ' || :NEW.course_id);
-    end;
-    /
-    --insert
-    create or replace trigger after_courses_inserted after insert on courses for each row
-    begin
-        insert into audit_logs (log_user, change_time, message) values (USER, current_timestamp, 'updated: ' || :NEW.course_id);
-    end;
-    /
-    --delete
-    create or replace trigger after_courses_deleted after delete on courses for each row
-    begin
-        insert into audit_logs (log_user, change_time, message) values (USER, current_timestamp, 'deleted');
-    end;
-    /
-    
+create or replace trigger audit_courses after insert or update or delete on courses for each row
+begin
+    if deleting or (updating and :OLD.course_id <> :NEW.course_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'courses', 'DELETE', :OLD.course_id);
+    end if;
+    if inserting or (updating and :OLD.course_id <> :NEW.course_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'courses', 'INSERT', :NEW.course_id);
+    elsif updating then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'courses', 'UPDATE', :NEW.course_id);
+    end if;
+end;
+/
+
 --competencies
-    --update
-    create or replace trigger after_competencies_updated after update on competencies for each row
-    begin
-        insert into audit_logs (log_user, change_time, message) values (USER, current_timestamp, 'updated: ' || :NEW.competency_id);
-    end;
-    /
-    --insert
-    create or replace trigger after_competencies_inserted after insert on competencies for each row
-    begin
-        insert into audit_logs (log_user, change_time, message) values (USER, current_timestamp, 'updated: ' || :NEW.competency_id);
-    end;
-    /
-    --delete
-    create or replace trigger after_competencies_deleted after delete on competencies for each row
-    begin
-        insert into audit_logs (log_user, change_time, message) values (USER, current_timestamp, 'deleted');
-    end;
-    /
\ No newline at end of file
+create or replace trigger audit_competencies after insert or update or delete on competencies for each row
+begin
+    if deleting or (updating and :OLD.competency_id <> :NEW.competency_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'competencies', 'DELETE', :OLD.competency_id);
+    end if;
+    if inserting or (updating and :OLD.competency_id <> :NEW.competency_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'competencies', 'INSERT', :NEW.competency_id);
+    elsif updating then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'competencies', 'UPDATE', :NEW.competency_id);
+    end if;
+end;
+/
+
+--elements
+create or replace trigger audit_elements after insert or update or delete on elements for each row
+begin
+    if deleting or (updating and :OLD.element_id <> :NEW.element_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'elements', 'DELETE', :OLD.element_id);
+    end if;
+    if inserting or (updating and :OLD.element_id <> :NEW.element_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'elements', 'INSERT', :NEW.element_id);
+    elsif updating then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'elements', 'UPDATE', :NEW.element_id);
+    end if;
+end;
+/
+
+--courses_elements
+create or replace trigger audit_courses_elements after insert or update or delete on courses_elements for each row
+begin
+    if deleting or (updating and (:OLD.course_id <> :NEW.course_id or :OLD.element_id <> :NEW.element_id)) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'courses_elements', 'DELETE', :OLD.course_id || '/' || :OLD.element_id);
+    end if;
+    if inserting or (updating and (:OLD.course_id <> :NEW.course_id or :OLD.element_id <> :NEW.element_id)) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'courses_elements', 'INSERT', :NEW.course_id || '/' || :NEW.element_id);
+    elsif updating then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'courses_elements', 'UPDATE', :NEW.course_id || '/' || :NEW.element_id);
+    end if;
+end;
+/
+
+--course_users
+create or replace trigger audit_course_users after insert or update or delete on course_users for each row
+begin
+    if deleting or (updating and :OLD.user_id <> :NEW.user_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'course_users', 'DELETE', :OLD.user_id);
+    end if;
+    if inserting or (updating and :OLD.user_id <> :NEW.user_id) then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'course_users', 'INSERT', :NEW.user_id);
+    elsif updating then
+        insert into audit_logs (log_user, change_time, table_name, operation, row_key) values (USER, current_timestamp, 'course_users', 'UPDATE', :NEW.user_id);
+    end if;
+end;
+/
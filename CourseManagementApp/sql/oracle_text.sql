@@ -0,0 +1,11 @@
+--Oracle Text indexes for SEARCH_MODE='fulltext' (needs the CTXAPP role)
+--SYNC (ON COMMIT) keeps each index current as soon as a write commits
+drop index courses_description_ctx;
+drop index competencies_achievement_ctx;
+drop index elements_criteria_ctx;
+drop index domains_description_ctx;
+
+create index courses_description_ctx on courses(description) indextype is ctxsys.context parameters ('SYNC (ON COMMIT)');
+create index competencies_achievement_ctx on competencies(competency_achievement) indextype is ctxsys.context parameters ('SYNC (ON COMMIT)');
+create index elements_criteria_ctx on elements(element_criteria) indextype is ctxsys.context parameters ('SYNC (ON COMMIT)');
+create index domains_description_ctx on domains(domain_description) indextype is ctxsys.context parameters ('SYNC (ON COMMIT)');
@@ -55,4 +55,5 @@ CREATE OR REPLACE TYPE course_typ AS OBJECT(
         course_description VARCHAR2(500),
         domain domain_typ,
         term term_typ
-    );
\ No newline at end of file
+    );
+/
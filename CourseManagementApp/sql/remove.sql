@@ -14,14 +14,13 @@ drop table audit_logs;
 drop table course_users;
 
 --Drop Triggers
---courses
-drop trigger after_courses_updated;
-drop trigger after_courses_inserted;
-drop trigger after_courses_deleted;
---competencies
-drop trigger after_competencies_updated;
-drop trigger after_competencies_inserted;
-drop trigger after_competencies_deleted;
+drop trigger audit_terms;
+drop trigger audit_domains;
+drop trigger audit_courses;
+drop trigger audit_competencies;
+drop trigger audit_elements;
+drop trigger audit_courses_elements;
+drop trigger audit_course_users;
 
 --Drop Views
 drop view view_courses;
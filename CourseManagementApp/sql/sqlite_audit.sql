@@ -0,0 +1,117 @@
+--SQLite version of the audit_logs table and triggers of logging.sql, read by the change feed (change_feed.py)
+--AUTOINCREMENT keeps log_id increasing even after the newest rows are deleted
+drop trigger if exists audit_terms_inserted;
+drop trigger if exists audit_terms_deleted;
+drop trigger if exists audit_terms_updated;
+drop trigger if exists audit_domains_inserted;
+drop trigger if exists audit_domains_deleted;
+drop trigger if exists audit_domains_updated;
+drop trigger if exists audit_courses_inserted;
+drop trigger if exists audit_courses_deleted;
+drop trigger if exists audit_courses_updated;
+drop trigger if exists audit_competencies_inserted;
+drop trigger if exists audit_competencies_deleted;
+drop trigger if exists audit_competencies_updated;
+drop trigger if exists audit_elements_inserted;
+drop trigger if exists audit_elements_deleted;
+drop trigger if exists audit_elements_updated;
+drop trigger if exists audit_courses_elements_inserted;
+drop trigger if exists audit_courses_elements_deleted;
+drop trigger if exists audit_courses_elements_updated;
+drop trigger if exists audit_course_users_inserted;
+drop trigger if exists audit_course_users_deleted;
+drop trigger if exists audit_course_users_updated;
+drop table if exists audit_logs;
+
+create table audit_logs (
+    log_id integer primary key autoincrement,
+    log_user varchar(100),
+    change_time timestamp default current_timestamp,
+    table_name varchar(30) not null,
+    operation varchar(6) not null,
+    row_key varchar(100) not null
+);
+
+--terms
+create trigger audit_terms_inserted after insert on terms begin
+    insert into audit_logs (table_name, operation, row_key) values ('terms', 'INSERT', new.term_id);
+end;
+create trigger audit_terms_deleted after delete on terms begin
+    insert into audit_logs (table_name, operation, row_key) values ('terms', 'DELETE', old.term_id);
+end;
+create trigger audit_terms_updated after update on terms begin
+    insert into audit_logs (table_name, operation, row_key) select 'terms', 'DELETE', old.term_id where not (old.term_id = new.term_id);
+    insert into audit_logs (table_name, operation, row_key) values ('terms', case when old.term_id = new.term_id then 'UPDATE' else 'INSERT' end, new.term_id);
+end;
+
+--domains
+create trigger audit_domains_inserted after insert on domains begin
+    insert into audit_logs (table_name, operation, row_key) values ('domains', 'INSERT', new.domain_id);
+end;
+create trigger audit_domains_deleted after delete on domains begin
+    insert into audit_logs (table_name, operation, row_key) values ('domains', 'DELETE', old.domain_id);
+end;
+create trigger audit_domains_updated after update on domains begin
+    insert into audit_logs (table_name, operation, row_key) select 'domains', 'DELETE', old.domain_id where not (old.domain_id = new.domain_id);
+    insert into audit_logs (table_name, operation, row_key) values ('domains', case when old.domain_id = new.domain_id then 'UPDATE' else 'INSERT' end, new.domain_id);
+end;
+
+--courses
+create trigger audit_courses_inserted after insert on courses begin
+    insert into audit_logs (table_name, operation, row_key) values ('courses', 'INSERT', new.course_id);
+end;
+create trigger audit_courses_deleted after delete on courses begin
+    insert into audit_logs (table_name, operation, row_key) values ('courses', 'DELETE', old.course_id);
+end;
+create trigger audit_courses_updated after update on courses begin
+    insert into audit_logs (table_name, operation, row_key) select 'courses', 'DELETE', old.course_id where not (old.course_id = new.course_id);
+    insert into audit_logs (table_name, operation, row_key) values ('courses', case when old.course_id = new.course_id then 'UPDATE' else 'INSERT' end, new.course_id);
+end;
+
+--competencies
+create trigger audit_competencies_inserted after insert on competencies begin
+    insert into audit_logs (table_name, operation, row_key) values ('competencies', 'INSERT', new.competency_id);
+end;
+create trigger audit_competencies_deleted after delete on competencies begin
+    insert into audit_logs (table_name, operation, row_key) values ('competencies', 'DELETE', old.competency_id);
+end;
+create trigger audit_competencies_updated after update on competencies begin
+    insert into audit_logs (table_name, operation, row_key) select 'competencies', 'DELETE', old.competency_id where not (old.competency_id = new.competency_id);
+    insert into audit_logs (table_name, operation, row_key) values ('competencies', case when old.competency_id = new.competency_id then 'UPDATE' else 'INSERT' end, new.competency_id);
+end;
+
+--elements
+create trigger audit_elements_inserted after insert on elements begin
+    insert into audit_logs (table_name, operation, row_key) values ('elements', 'INSERT', new.element_id);
+end;
+create trigger audit_elements_deleted after delete on elements begin
+    insert into audit_logs (table_name, operation, row_key) values ('elements', 'DELETE', old.element_id);
+end;
+create trigger audit_elements_updated after update on elements begin
+    insert into audit_logs (table_name, operation, row_key) select 'elements', 'DELETE', old.element_id where not (old.element_id = new.element_id);
+    insert into audit_logs (table_name, operation, row_key) values ('elements', case when old.element_id = new.element_id then 'UPDATE' else 'INSERT' end, new.element_id);
+end;
+
+--courses_elements
+create trigger audit_courses_elements_inserted after insert on courses_elements begin
+    insert into audit_logs (table_name, operation, row_key) values ('courses_elements', 'INSERT', new.course_id || '/' || new.element_id);
+end;
+create trigger audit_courses_elements_deleted after delete on courses_elements begin
+    insert into audit_logs (table_name, operation, row_key) values ('courses_elements', 'DELETE', old.course_id || '/' || old.element_id);
+end;
+create trigger audit_courses_elements_updated after update on courses_elements begin
+    insert into audit_logs (table_name, operation, row_key) select 'courses_elements', 'DELETE', old.course_id || '/' || old.element_id where not (old.course_id = new.course_id and old.element_id = new.element_id);
+    insert into audit_logs (table_name, operation, row_key) values ('courses_elements', case when old.course_id = new.course_id and old.element_id = new.element_id then 'UPDATE' else 'INSERT' end, new.course_id || '/' || new.element_id);
+end;
+
+--course_users
+create trigger audit_course_users_inserted after insert on course_users begin
+    insert into audit_logs (table_name, operation, row_key) values ('course_users', 'INSERT', new.user_id);
+end;
+create trigger audit_course_users_deleted after delete on course_users begin
+    insert into audit_logs (table_name, operation, row_key) values ('course_users', 'DELETE', old.user_id);
+end;
+create trigger audit_course_users_updated after update on course_users begin
+    insert into audit_logs (table_name, operation, row_key) select 'course_users', 'DELETE', old.user_id where not (old.user_id = new.user_id);
+    insert into audit_logs (table_name, operation, row_key) values ('course_users', case when old.user_id = new.user_id then 'UPDATE' else 'INSERT' end, new.user_id);
+end;
@@ -0,0 +1,71 @@
+--FTS5 stand-ins for the Oracle Text indexes of oracle_text.sql, used by SEARCH_MODE='fulltext' on the SQLite backend
+--Each table indexes one column next to the (unindexed) key of its row, and is kept in sync by triggers
+drop trigger if exists courses_fts_inserted;
+drop trigger if exists courses_fts_deleted;
+drop trigger if exists courses_fts_updated;
+drop trigger if exists competencies_fts_inserted;
+drop trigger if exists competencies_fts_deleted;
+drop trigger if exists competencies_fts_updated;
+drop trigger if exists elements_fts_inserted;
+drop trigger if exists elements_fts_deleted;
+drop trigger if exists elements_fts_updated;
+drop trigger if exists domains_fts_inserted;
+drop trigger if exists domains_fts_deleted;
+drop trigger if exists domains_fts_updated;
+drop table if exists courses_fts;
+drop table if exists competencies_fts;
+drop table if exists elements_fts;
+drop table if exists domains_fts;
+
+create virtual table courses_fts using fts5(course_id UNINDEXED, description);
+insert into courses_fts(course_id, description) select course_id, description from courses;
+create virtual table competencies_fts using fts5(competency_id UNINDEXED, competency_achievement);
+insert into competencies_fts(competency_id, competency_achievement) select competency_id, competency_achievement from competencies;
+create virtual table elements_fts using fts5(element_id UNINDEXED, element_criteria);
+insert into elements_fts(element_id, element_criteria) select element_id, element_criteria from elements;
+create virtual table domains_fts using fts5(domain_id UNINDEXED, domain_description);
+insert into domains_fts(domain_id, domain_description) select domain_id, domain_description from domains;
+
+create trigger courses_fts_inserted after insert on courses begin
+    insert into courses_fts(course_id, description) values (new.course_id, new.description);
+end;
+create trigger courses_fts_deleted after delete on courses begin
+    delete from courses_fts where course_id = old.course_id;
+end;
+create trigger courses_fts_updated after update of course_id, description on courses begin
+    delete from courses_fts where course_id = old.course_id;
+    insert into courses_fts(course_id, description) values (new.course_id, new.description);
+end;
+
+create trigger competencies_fts_inserted after insert on competencies begin
+    insert into competencies_fts(competency_id, competency_achievement) values (new.competency_id, new.competency_achievement);
+end;
+create trigger competencies_fts_deleted after delete on competencies begin
+    delete from competencies_fts where competency_id = old.competency_id;
+end;
+create trigger competencies_fts_updated after update of competency_id, competency_achievement on competencies begin
+    delete from competencies_fts where competency_id = old.competency_id;
+    insert into competencies_fts(competency_id, competency_achievement) values (new.competency_id, new.competency_achievement);
+end;
+
+create trigger elements_fts_inserted after insert on elements begin
+    insert into elements_fts(element_id, element_criteria) values (new.element_id, new.element_criteria);
+end;
+create trigger elements_fts_deleted after delete on elements begin
+    delete from elements_fts where element_id = old.element_id;
+end;
+create trigger elements_fts_updated after update of element_id, element_criteria on elements begin
+    delete from elements_fts where element_id = old.element_id;
+    insert into elements_fts(element_id, element_criteria) values (new.element_id, new.element_criteria);
+end;
+
+create trigger domains_fts_inserted after insert on domains begin
+    insert into domains_fts(domain_id, domain_description) values (new.domain_id, new.domain_description);
+end;
+create trigger domains_fts_deleted after delete on domains begin
+    delete from domains_fts where domain_id = old.domain_id;
+end;
+create trigger domains_fts_updated after update of domain_id, domain_description on domains begin
+    delete from domains_fts where domain_id = old.domain_id;
+    insert into domains_fts(domain_id, domain_description) values (new.domain_id, new.domain_description);
+end;
@@ -0,0 +1,59 @@
+--SQLite version of setup.sql, used by the local/offline backend
+
+--drop tables
+drop table if exists courses_elements;
+drop table if exists elements;
+drop table if exists competencies;
+drop table if exists courses;
+drop table if exists terms;
+drop table if exists domains;
+drop table if exists course_users;
+
+--Creating tables
+--User
+create table course_users (
+    user_id integer primary key,
+    name varchar(100) not null,
+    password varchar(102) not null,
+    email varchar(100) not null unique,
+    access_group integer not null,
+    date_created timestamp not null,
+    blocked char(1) not null
+);
+--Term
+create table terms (term_id integer PRIMARY KEY, 
+                    term_name char(6) NOT NULL);
+
+--Domain
+create table domains (domain_id integer PRIMARY KEY, 
+                        domain varchar(50) NOT NULL, 
+                        domain_description varchar(1000) NOT NULL);
+
+--Course
+create table courses (course_id varchar(10) PRIMARY KEY, 
+                    course_title varchar(50) NOT NULL,
+                    theory_hours integer NOT NULL, 
+                    lab_hours integer NOT NULL, 
+                    work_hours integer NOT NULL,
+                    description varchar(1000) NOT NULL, 
+                    domain_id integer REFERENCES domains(domain_id), 
+                    term_id integer REFERENCES terms(term_id));
+
+--Competency
+create table competencies (competency_id char(4) PRIMARY KEY, 
+                            competency varchar(250) NOT NULL,
+                            competency_achievement varchar(1000) NOT NULL,
+                            competency_type varchar(10) NOT NULL);
+                        
+--Element
+create table elements (element_id integer PRIMARY KEY, 
+                        element_order integer NOT NULL, 
+                        element varchar(250) NOT NULL,
+                        element_criteria varchar(1000) NOT NULL, 
+                        competency_id char(4) REFERENCES competencies(competency_id));
+                    
+--Courses_Elements (Bridging)
+create table courses_elements (course_id varchar(10) REFERENCES courses(course_id) ON DELETE CASCADE, 
+                                element_id integer REFERENCES elements(element_id) ON DELETE CASCADE, 
+                                element_hours number NOT NULL,
+                                CONSTRAINT course_element PRIMARY KEY(course_id, element_id));
@@ -1,4 +1,6 @@
 class Term:
+    __slots__ = ('term_id', 'term_name')
+
     def __init__(self, term_id):
         if not isinstance(term_id, int):
             raise TypeError('term_id must be an int')
@@ -7,6 +9,18 @@ class Term:
         self.term_name = 'Fall'
         if term_id % 2 == 0:
             self.term_name = 'Winter'
+
+    @classmethod
+    def from_row(cls, term_id, term_name):
+        '''Builds a term from a database row without validating it. Doubles as a cursor rowfactory.
+        Fall and Winter (padded by Oracle's CHAR) follow from the term id, like in the constructor'''
+        term = cls.__new__(cls)
+        term.term_id = term_id
+        if 'Fall' in term_name or 'Winter' in term_name:
+            term.term_name = 'Winter' if term_id % 2 == 0 else 'Fall'
+        else:
+            term.term_name = term_name
+        return term
         
     def __repr__(self):
         return f'Term({self.term_id}, {self.term_name})' 
@@ -22,7 +36,7 @@ class Term:
         return new_term
     
     def to_json(self):
-        return self.__dict__
+        return {name: getattr(self, name) for name in self.__slots__}
     
 from flask_wtf import FlaskForm
 from wtforms import IntegerField
@@ -1,19 +1,15 @@
 from flask import Flask, Blueprint, request, url_for, make_response
 from .dbmanager import get_db
 from .term import Term
+from .pagination import decode_cursor, page_links, cursor_error
+from .conditional import conditional
 import math
 
 bp = Blueprint('term_api', __name__, url_prefix = '/api/v1')
 
 @bp.route('/terms', methods=['GET', 'POST'])
+@conditional('terms')
 def terms():
-    try:
-        total_terms = get_db().get_terms()
-    except Exception as e:
-        error_infoset = {'id': 'Database Error',
-                         'description': 'Unable to connect to the database. Please try again later.'}
-        return make_response(error_infoset, 500)
-    
     if request.method == 'POST':
         term_json = request.json
         
@@ -25,11 +21,17 @@ def terms():
                          'description': 'Data must contain complete term information, and formatted as dictionary object'}
                 return make_response(error_infoset, 400)
             
-            for term in total_terms:
-                if term.term_id == new_term.term_id:
-                    error_infoset = {'id': 'Data Error',
-                                     'description': 'Term id already exists'}
-                    return make_response(error_infoset, 400)
+            try:
+                term_exists = get_db().term_exists(new_term.term_id)
+            except Exception as e:
+                error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+                return make_response(error_infoset, 500)
+            
+            if term_exists:
+                error_infoset = {'id': 'Data Error',
+                                 'description': 'Term id already exists'}
+                return make_response(error_infoset, 400)
             
             try:
                 get_db().add_term(new_term)
@@ -45,42 +47,58 @@ def terms():
                     
         
     elif request.method == 'GET':
+        try:
+            count = get_db().count_terms()
+        except Exception as e:
+            error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+            return make_response(error_infoset, 500)
+        
         page_number = 1
         page_size = 50
-        if request.args:
+        cursor = request.args.get('cursor')
+        if request.args and cursor is None:
             page = request.args.get('page')
             if page:
                 page_number = int(page)
-                max_page = math.ceil(len(total_terms) / float(page_size))
+                max_page = math.ceil(count / float(page_size))
                 if page_number < 1 or page_number > max_page:
                     error_infoset = {'id' : 'Invalid Page Number',
                                  'description': f'Page number must be from 1, up to a maximum of {max_page}'}
                     return make_response(error_infoset, 404)
     
+    if cursor is not None:
+        try:
+            key, direction = decode_cursor(cursor, 'term_api.terms')
+        except ValueError:
+            return make_response(cursor_error(), 400)
+    
     try:
-        terms, previous_page, next_page = get_db().get_terms_for_api(page_size, page_number=page_number)
+        if cursor is not None:
+            terms, has_previous, has_next = get_db().get_terms_by_cursor(page_size, key, direction)
+        else:
+            terms, previous_page, next_page = get_db().get_terms_for_api(page_size, page_number=page_number)
+            has_previous = previous_page is not None
+            has_next = next_page is not None
+    except ValueError:
+        return make_response(cursor_error(), 400)
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                     'description': 'Unable to connect to the database. Please try again later.'}
         return make_response(error_infoset, 500)
     
-    if previous_page is not None:
-        previous_page = url_for('term_api.terms', page=previous_page)
-    if next_page is not None:
-        next_page = url_for('term_api.terms', page=next_page)
-    current_page = url_for('term_api.terms', page=page_number)
+    links = page_links('term_api.terms', terms, lambda term: (term.term_id,), has_previous, has_next, page_number=page_number, cursor=cursor)
     
-    count = len(total_terms)
-    json = {'count': count, 'current_page': current_page, 'previous_page': previous_page, 'next_page': next_page, 'results': [term.to_json() for term in terms]}
+    json = {'count': count, **links, 'results': [term.to_json() for term in terms]}
     return make_response(json, 200)
 
 ## Terms are not updated directly; only by adding and deleting. As such, supporting PUT would be redundant to POST
 
 @bp.route('/terms/<int:term_id>', methods=['GET', 'DELETE'])
+@conditional('terms')
 def term_by_id(term_id):
     try:
         term = get_db().get_term(term_id)
-        courses = get_db().get_courses()
     except Exception as e:
         error_infoset = {'id': 'Database Error',
                          'description': 'Unable to connect to the database. Please try again later.'}
@@ -92,11 +110,17 @@ def term_by_id(term_id):
                          'description': 'Specified term id does not exist'}
             return make_response(error_infoset, 400)
         
-        for course in courses:
-            if course.term_id == term_id:
-                error_infoset = {'id': 'Data Error',
-                         'description': 'Unable to delete term resource: term id is associated to 1 or more courses'}
-                return make_response(error_infoset, 400)
+        try:
+            term_courses = get_db().count_courses_of_term(term_id)
+        except Exception as e:
+            error_infoset = {'id': 'Database Error',
+                         'description': 'Unable to connect to the database. Please try again later.'}
+            return make_response(error_infoset, 500)
+        
+        if term_courses > 0:
+            error_infoset = {'id': 'Data Error',
+                     'description': 'Unable to delete term resource: term id is associated to 1 or more courses'}
+            return make_response(error_infoset, 400)
         
         try:
             get_db().del_term(term_id)
@@ -0,0 +1,172 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .seed import add_size_arguments, seed_database, sizes_from_arguments
+
+## Drives the web and API routes in-process through the Flask test client against a seeded SQLite program, and reports
+## latency percentiles and throughput per route. Results can be saved as a JSON baseline (benchmarks/baselines/<name>.json)
+## and later runs compared against it: a route whose p95 grows, or whose throughput drops, by more than the tolerance fails
+## the run.
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+DEFAULT_DB = os.path.join(tempfile.gettempdir(), 'course_management_benchmark.sqlite')
+
+def load_samples(path, seed):
+    '''Ids and words to request, read from the seeded database and shuffled the same way on every run'''
+    rng = random.Random(seed)
+    connection = sqlite3.connect(path)
+    try:
+        samples = {
+            'courses': [row[0] for row in connection.execute('SELECT course_id FROM courses ORDER BY course_id')],
+            'competencies': [row[0] for row in connection.execute('SELECT competency_id FROM competencies ORDER BY competency_id')],
+            'terms': [row[0] for row in connection.execute('SELECT term_id FROM terms ORDER BY term_id')],
+            'course_competencies': connection.execute('SELECT DISTINCT course_id, competency_id FROM courses_elements JOIN elements USING(element_id) '
+                                                      'ORDER BY course_id, competency_id').fetchall(),
+            'words': sorted(set(word.lower() for (title,) in connection.execute('SELECT course_title FROM courses') for word in title.split()))
+        }
+    finally:
+        connection.close()
+    for values in samples.values():
+        rng.shuffle(values)
+    return samples
+
+def scenarios(samples):
+    '''Route name, whether it needs a logged in user, and the URL of its i-th request'''
+    courses, competencies, terms = samples['courses'], samples['competencies'], samples['terms']
+    pairs, words = samples['course_competencies'], samples['words']
+    pick = lambda values, i: values[i % len(values)]
+    return [
+        ('home.index', False, lambda i: '/'),
+        ('home.search', False, lambda i: f'/{pick(words, i)}/'),
+        ('course.get_course_by_id', True, lambda i: f'/course/{pick(courses, i)}/'),
+        ('competency.get_competencies', True, lambda i: '/competency/reference/'),
+        ('element.get_elements', False, lambda i: '/element/reference/'),
+        ('domain.get_domains', False, lambda i: '/domain/reference/'),
+        ('search_api.suggest', False, lambda i: f'/api/v1/search/suggest?q={pick(words, i)[:3]}'),
+        ('course_api.courses', False, lambda i: '/api/v1/courses'),
+        ('course_api.course_by_id', False, lambda i: f'/api/v1/courses/{pick(courses, i)}'),
+        ('course_api.course_competencies', False, lambda i: f'/api/v1/courses/{pick(courses, i)}/competencies'),
+        ('course_api.course_competency_by_id', False, lambda i: '/api/v1/courses/{}/competencies/{}'.format(*pick(pairs, i))),
+        ('course_api.course_elements', False, lambda i: '/api/v1/courses/{}/competencies/{}/elements'.format(*pick(pairs, i))),
+        ('competency_api.competencies', False, lambda i: '/api/v1/competencies'),
+        ('competency_api.competency_by_id', False, lambda i: f'/api/v1/competencies/{pick(competencies, i)}'),
+        ('competency_api.competency_elements', False, lambda i: f'/api/v1/competencies/{pick(competencies, i)}/elements'),
+        ('element_api.elements', False, lambda i: '/api/v1/elements'),
+        ('domain_api.domains', False, lambda i: '/api/v1/domains'),
+        ('term_api.terms', False, lambda i: '/api/v1/terms'),
+        ('term_api.term_by_id', False, lambda i: f'/api/v1/terms/{pick(terms, i)}'),
+        ('report_api.program_report', False, lambda i: '/api/v1/reports/program')
+    ]
+
+def percentile(sorted_values, fraction):
+    '''Nearest-rank percentile'''
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+def client_for(app, login):
+    client = app.test_client()
+    if login:
+        with client.session_transaction() as session:
+            session['_user_id'] = '1'
+            session['_fresh'] = True
+    return client
+
+def run_scenario(app, login, url, requests, warmup, concurrency):
+    def worker(indexes):
+        client = client_for(app, login)
+        timings, errors = [], 0
+        for i in indexes:
+            start = time.perf_counter()
+            resp = client.get(url(i))
+            timings.append(time.perf_counter() - start)
+            if resp.status_code != 200:
+                errors += 1
+        return timings, errors
+
+    worker(range(warmup))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(worker, [range(n, requests, concurrency) for n in range(concurrency)]))
+    elapsed = time.perf_counter() - start
+    timings = sorted(timing for worker_timings, _ in results for timing in worker_timings)
+    return {'requests': requests, 'errors': sum(errors for _, errors in results),
+            'p50_ms': round(percentile(timings, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+            'rps': round(requests / elapsed, 1)}
+
+def compare(results, baseline, tolerance):
+    '''Routes slower (p95) or with lower throughput than the baseline by more than tolerance'''
+    regressions = []
+    for name, result in results.items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        if result['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']} ms -> {result['p95_ms']} ms")
+        if result['rps'] < previous['rps'] / (1 + tolerance):
+            regressions.append(f"{name}: {previous['rps']} -> {result['rps']} requests/sec")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the web and API routes against a synthetic program')
+    parser.add_argument('--db', default=DEFAULT_DB, help='SQLite file to seed and run against')
+    parser.add_argument('--no-seed', action='store_true', help='Reuse the database already at --db')
+    add_size_arguments(parser)
+    parser.add_argument('--requests', type=int, default=200, help='Timed requests per route')
+    parser.add_argument('--warmup', type=int, default=20, help='Untimed requests per route before timing')
+    parser.add_argument('--concurrency', type=int, default=1, help='Threads sending requests at once')
+    parser.add_argument('--only', action='append', help='Run only this route (repeatable)')
+    parser.add_argument('--config', action='append', default=[], metavar='KEY=VALUE', help='Override an app setting, VALUE read as JSON (repeatable)')
+    parser.add_argument('--save', metavar='NAME', help='Save the results as baselines/NAME.json')
+    parser.add_argument('--compare', metavar='NAME', help='Compare the results against baselines/NAME.json')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown before a route counts as a regression')
+    args = parser.parse_args()
+
+    sizes = sizes_from_arguments(args)
+    if not args.no_seed:
+        seed_database(args.db, seed=args.seed, **sizes)
+
+    from CourseManagementApp import create_app
+    overrides = dict(setting.split('=', 1) for setting in args.config)
+    app = create_app({'DB_BACKEND': 'sqlite', 'DB_SQLITE_PATH': args.db, 'SECRET_KEY': 'benchmark',
+                      **{key: json.loads(value) for key, value in overrides.items()}})
+
+    results = {}
+    print(f"{'route':40} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7}")
+    for name, login, url in scenarios(load_samples(args.db, args.seed)):
+        if args.only and name not in args.only:
+            continue
+        result = results[name] = run_scenario(app, login, url, args.requests, args.warmup, args.concurrency)
+        print(f"{name:40} {result['p50_ms']:9.2f} {result['p95_ms']:9.2f} {result['p99_ms']:9.2f} {result['rps']:9.1f} {result['errors']:7}")
+
+    config = {'sizes': sizes, 'seed': args.seed, 'requests': args.requests, 'warmup': args.warmup, 'concurrency': args.concurrency,
+              'settings': overrides, 'python': platform.python_version()}
+    status = 0
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f'{args.compare}.json')) as f:
+            baseline = json.load(f)
+        if baseline['config'] != config:
+            print(f'Warning: baseline {args.compare} was recorded with different settings: {baseline["config"]}')
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}')
+        if any(result['errors'] for result in results.values()):
+            regressions.append('errors')
+            print('Some requests did not answer 200')
+        status = 1 if regressions else 0
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(os.path.join(BASELINE_DIR, f'{args.save}.json'), 'w') as f:
+            json.dump({'config': config, 'results': results}, f, indent=2)
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import argparse
+import datetime
+import os
+import random
+import re
+import sqlite3
+from werkzeug.security import generate_password_hash
+from CourseManagementApp.backends import SQL_DIR, SqliteBackend
+
+## Seeds a SQLite database with a synthetic program shaped like inserting.sql: terms with courses, domains, competencies with
+## ordered elements, and course-element links. The text of every row is drawn from the words of inserting.sql, so searches
+## hit realistic text. The same arguments and seed always produce the same database.
+
+PROFILES = {
+    'small': {'terms': 6, 'domains': 4, 'courses': 60, 'competencies': 40, 'elements': 5, 'links': 8},
+    'medium': {'terms': 6, 'domains': 8, 'courses': 300, 'competencies': 150, 'elements': 6, 'links': 12},
+    'large': {'terms': 8, 'domains': 12, 'courses': 1200, 'competencies': 600, 'elements': 6, 'links': 16}
+}
+
+TERM_NAMES = ['Fall', 'Winter']
+COMPETENCY_TYPES = ['Mandatory', 'Optional']
+BENCHMARK_EMAIL = 'benchmark@example.com'
+BENCHMARK_PASSWORD = 'benchmark'
+
+def vocabulary():
+    with open(os.path.join(SQL_DIR, 'inserting.sql'), 'r', errors='replace') as f:
+        words = sorted(set(word.lower() for word in re.findall(r'[A-Za-z]{4,}', f.read())))
+    return words
+
+def sentence(rng, words, count):
+    return ' '.join(rng.choice(words) for _ in range(count)).capitalize()
+
+def course_id(n):
+    return f'{420 + n // 900}-{100 + n % 900:03d}-DW'
+
+def competency_id(n):
+    return f'{chr(ord("A") + n // 1000)}{n % 1000:03d}'
+
+def generate(terms, domains, courses, competencies, elements, links, seed=0):
+    '''Returns the rows of each table for a program of this size'''
+    rng = random.Random(seed)
+    words = vocabulary()
+    rows = {
+        'terms': [(i, TERM_NAMES[(i - 1) % 2]) for i in range(1, terms + 1)],
+        'domains': [(i, sentence(rng, words, 4)[:50], sentence(rng, words, 40)) for i in range(1, domains + 1)],
+        'courses': [], 'competencies': [], 'elements': [], 'courses_elements': []
+    }
+    for n in range(courses):
+        theory, lab = rng.randint(1, 4), rng.randint(1, 4)
+        rows['courses'].append((course_id(n), sentence(rng, words, 3)[:50], theory, lab, rng.randint(1, 4), sentence(rng, words, 50),
+                                rng.randint(1, domains), n * terms // courses + 1))
+    element_id = 0
+    for n in range(competencies):
+        rows['competencies'].append((competency_id(n), sentence(rng, words, 5), sentence(rng, words, 20), rng.choice(COMPETENCY_TYPES)))
+        for order in range(1, elements + 1):
+            element_id += 1
+            rows['elements'].append((element_id, order, sentence(rng, words, 6), sentence(rng, words, 25), competency_id(n)))
+    for n in range(courses):
+        for element in rng.sample(range(1, element_id + 1), min(links, element_id)):
+            rows['courses_elements'].append((course_id(n), element, rng.randint(3, 30)))
+    return rows
+
+def seed_database(path, seed=0, **sizes):
+    '''Recreates the database at path with the schema of the SQLite backend, a generated program and the benchmark user'''
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    backend = SqliteBackend(path)
+    backend.release(backend.connect())
+    rows = generate(seed=seed, **sizes)
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            for table in ('courses_elements', 'elements', 'competencies', 'courses', 'domains', 'terms', 'course_users'):
+                connection.execute(f'DELETE FROM {table}')
+            for table in ('terms', 'domains', 'courses', 'competencies', 'elements', 'courses_elements'):
+                placeholders = ', '.join('?' * len(rows[table][0]))
+                connection.executemany(f'INSERT INTO {table} VALUES ({placeholders})', rows[table])
+            connection.execute('INSERT INTO course_users VALUES (1, ?, ?, ?, 3, ?, ?)',
+                               ('Benchmark', generate_password_hash(BENCHMARK_PASSWORD), BENCHMARK_EMAIL, datetime.datetime.now(), '0'))
+    finally:
+        connection.close()
+    return {table: len(table_rows) for table, table_rows in rows.items()}
+
+def add_size_arguments(parser):
+    parser.add_argument('--profile', choices=PROFILES, default='small', help='Program size to start from')
+    for name in PROFILES['small']:
+        parser.add_argument(f'--{name}', type=int, help=f'Override the number of {name}' + (' per competency' if name == 'elements' else ' per course' if name == 'links' else ''))
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the generated program')
+
+def sizes_from_arguments(args):
+    sizes = dict(PROFILES[args.profile])
+    for name in sizes:
+        if getattr(args, name) is not None:
+            sizes[name] = getattr(args, name)
+    return sizes
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed a SQLite database with a synthetic program')
+    parser.add_argument('path', help='SQLite file to (re)create')
+    add_size_arguments(parser)
+    args = parser.parse_args()
+    counts = seed_database(args.path, seed=args.seed, **sizes_from_arguments(args))
+    print(', '.join(f'{count} {table}' for table, count in counts.items()))
+
+if __name__ == '__main__':
+    main()
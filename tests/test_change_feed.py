@@ -0,0 +1,106 @@
+import sqlite3
+import time
+import flask_unittest
+from CourseManagementApp import create_app, cache
+from CourseManagementApp.db import Database
+from CourseManagementApp import change_feed
+from CourseManagementApp.change_feed import ChangeFeed, FEED_TABLES, invalidate
+from CourseManagementApp.program_graph import get_program_graph
+
+class ChangeFeedTest(flask_unittest.AppTestCase):
+    def create_app(self):
+        return create_app()
+    
+    def test_poll_reports_row_changes(self, app):
+        db = Database()
+        try:
+            feed = ChangeFeed()
+            self.assertEqual(feed.poll(db), [])
+            element_id = db.get_elements()[-1].element_id
+            db.add_course_elements('420-110-DW', element_id, 5)
+            db.del_course_element_pairing('420-110-DW', element_id)
+            
+            ## Testing the order, structure and position of the polled changes
+            changes = feed.poll(db)
+            self.assertEqual([(change.table_name, change.operation, change.row_key) for change in changes],
+                             [('courses_elements', 'INSERT', f'420-110-DW/{element_id}'), ('courses_elements', 'DELETE', f'420-110-DW/{element_id}')])
+            self.assertEqual(feed.position, changes[-1].log_id)
+            self.assertEqual(feed.poll(db), [])
+        finally:
+            db.close()
+    
+    def test_followers_share_versions(self, app):
+        db = Database()
+        try:
+            first_feed, first_versions = ChangeFeed(), cache.VersionStore()
+            first_feed.publish(db)
+            first_versions.follow(first_feed.tallies)
+            element_id = db.get_elements()[-1].element_id
+            db.add_course_elements('420-110-DW', element_id, 5)
+            db.del_course_element_pairing('420-110-DW', element_id)
+            
+            ## Testing that a process started after the writes ends up with the same versions as one that followed them
+            second_feed, second_versions = ChangeFeed(), cache.VersionStore()
+            for feed, versions in ((first_feed, first_versions), (second_feed, second_versions)):
+                feed.publish(db)
+                versions.follow(feed.tallies)
+            self.assertEqual([first_versions.version(table) for table in FEED_TABLES], [second_versions.version(table) for table in FEED_TABLES])
+            self.assertNotEqual(first_versions.version('courses_elements'), cache.VersionStore().version('courses_elements'))
+            
+            ## Testing that a local write keeps its own version until the feed sees it
+            version = first_versions.version('courses_elements')
+            first_versions.bump('courses_elements')
+            first_versions.follow(first_feed.tallies)
+            self.assertNotEqual(first_versions.version('courses_elements'), version)
+        finally:
+            db.close()
+    
+    def test_outside_write_invalidates(self, app):
+        db = Database()
+        try:
+            feed = ChangeFeed()
+            feed.subscribe(invalidate)
+            feed.publish(db)
+            with app.test_request_context('/'):
+                title = get_program_graph().get_course('420-110-DW').course_title
+                version = cache.versions.version('courses')
+                
+                ## Testing that a write the app did not make reaches the caches through the feed
+                connection = sqlite3.connect(app.config['DB_SQLITE_PATH'])
+                try:
+                    with connection:
+                        connection.execute("UPDATE courses SET course_title = 'Changed outside' WHERE course_id = '420-110-DW'")
+                    self.assertEqual(get_program_graph().get_course('420-110-DW').course_title, title)
+                    feed.publish(db)
+                    self.assertNotEqual(cache.versions.version('courses'), version)
+                    self.assertEqual(get_program_graph().get_course('420-110-DW').course_title, 'Changed outside')
+                finally:
+                    with connection:
+                        connection.execute("UPDATE courses SET course_title = ? WHERE course_id = '420-110-DW'", (title,))
+                    connection.close()
+                    cache.changed('courses')
+        finally:
+            db.close()
+
+    def test_requests_follow_the_feed(self, app):
+        app.config['CHANGE_FEED_INTERVAL'] = 0.001
+        change_feed.init_change_feed(app)
+        client = app.test_client()
+        client.get('/')
+        self.assertTrue(cache.versions_shared())
+        with app.test_request_context('/'):
+            title = get_program_graph().get_course('420-110-DW').course_title
+        
+        ## Testing that a request after an outside write serves the new data
+        connection = sqlite3.connect(app.config['DB_SQLITE_PATH'])
+        try:
+            with connection:
+                connection.execute("UPDATE courses SET course_title = 'Seen by the feed' WHERE course_id = '420-110-DW'")
+            time.sleep(0.01)
+            self.assertIn(b'Seen by the feed', client.get('/').data)
+        finally:
+            with connection:
+                connection.execute("UPDATE courses SET course_title = ? WHERE course_id = '420-110-DW'", (title,))
+            connection.close()
+            cache.changed('courses')
+
@@ -3,6 +3,7 @@ from CourseManagementApp import create_app
 from CourseManagementApp.db import Database
 from CourseManagementApp.competency import Competency
 from CourseManagementApp.element import Element
+from CourseManagementApp.pagination import encode_cursor
 
 class CompetencyTestAPI(flask_unittest.ClientTestCase):
     app = create_app()
@@ -221,4 +222,14 @@ class CompetencyTestAPI(flask_unittest.ClientTestCase):
         new_element = Element(1, 'Solve Any Programming Problem', 'Under all circumstances', '00Q2')
         new_element_json = new_element.to_json()
         resp = client.post('/api/v1/competencies/00Q2/elements', json=new_element_json)
+        self.assertEqual(resp.status_code, 400)
+        
+    def test_competency_elements_cursor_parent(self, client):
+        ## Testing GET with a cursor of this competency's elements
+        cursor = encode_cursor(('00Q2', 0), 'next', 'competency_api.competency_elements', {'competency_id': '00Q2'})
+        resp = client.get(f'/api/v1/competencies/00Q2/elements?cursor={cursor}')
+        self.assertEqual(resp.status_code, 200)
+        
+        ## Testing GET with the same cursor replayed against another competency
+        resp = client.get(f'/api/v1/competencies/00Q3/elements?cursor={cursor}')
         self.assertEqual(resp.status_code, 400)
\ No newline at end of file
@@ -18,6 +18,7 @@ class CourseTestAPI(flask_unittest.ClientTestCase):
             
             db.del_course('420-150-DW')
             db.del_course('420-130-DW')
+            db.del_course('420-999-DW')
             db.del_element_for_unit_test('420-110-DW', 'Solve Any Programming Problem', 12)
             
             if db is not None:
@@ -259,4 +260,43 @@ class CourseTestAPI(flask_unittest.ClientTestCase):
         new_element = Element(1, 'Solve Any Programming Problem', 'Under all circumstances', '00Q2')
         new_element_json = new_element.to_json()
         resp = client.post('/api/v1/courses/420-110-DW/competencies/00Q2/elements', json=new_element_json)
-        self.assertEqual(resp.status_code, 400)
\ No newline at end of file
+        self.assertEqual(resp.status_code, 400)
+        
+    def test_course_elements_batch(self, client):
+        try:
+            self.cleanup()
+        except:
+            raise Exception('Database error, cleanup interrupted. The subsequent tests will likely fail as a consequence')
+        
+        new_course = Course('420-999-DW', 'Test Course', 3, 3, 3, 'Test Description', 1, 1)
+        client.post('/api/v1/courses', json=new_course.to_json())
+        
+        ## Testing POST of a batch of links, with the new hour totals
+        batch = {'upserts': [{'course_id': '420-999-DW', 'element_id': 1, 'element_hours': 45},
+                             {'course_id': '420-999-DW', 'element_id': 2, 'element_hours': 45}]}
+        resp = client.post('/api/v1/course_elements', json=batch)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json['courses'], [{'course_id': '420-999-DW', 'element_hours': 90, 'expected_hours': 90, 'hours_match': True}])
+        
+        ## Testing POST of a batch updating and deleting links
+        batch = {'upserts': [{'course_id': '420-999-DW', 'element_id': 1, 'element_hours': 30}],
+                 'deletes': [{'course_id': '420-999-DW', 'element_id': 2}]}
+        resp = client.post('/api/v1/course_elements', json=batch)
+        self.assertEqual(resp.json['courses'][0]['element_hours'], 30)
+        self.assertFalse(resp.json['courses'][0]['hours_match'])
+        
+        ## Testing POST of a batch with a nonexistent element, which must not apply anything
+        batch = {'upserts': [{'course_id': '420-999-DW', 'element_id': 1, 'element_hours': 90},
+                             {'course_id': '420-999-DW', 'element_id': 99999, 'element_hours': 45}]}
+        resp = client.post('/api/v1/course_elements', json=batch)
+        self.assertEqual(resp.status_code, 400)
+        resp = client.post('/api/v1/course_elements', json={'upserts': [{'course_id': '420-999-DW', 'element_id': 1, 'element_hours': 30}]})
+        self.assertEqual(resp.json['courses'][0]['element_hours'], 30)
+        
+        ## Testing POST of malformed batches
+        resp = client.post('/api/v1/course_elements', json={'upserts': [{'course_id': '420-999-DW'}]})
+        self.assertEqual(resp.status_code, 400)
+        resp = client.post('/api/v1/course_elements', json={})
+        self.assertEqual(resp.status_code, 400)
+        
+        client.delete('/api/v1/courses/420-999-DW')
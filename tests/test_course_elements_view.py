@@ -0,0 +1,39 @@
+import flask_unittest
+from CourseManagementApp import create_app
+from CourseManagementApp.db import Database
+
+class CourseElementsViewTest(flask_unittest.ClientTestCase):
+    app = create_app()
+    
+    def test_edit_course_element_hours(self, client):
+        db = Database()
+        try:
+            element_id, hours = db.get_course_element_hours('420-110-DW')[0]
+            
+            ## Testing that hours which are not a positive number are rejected
+            resp = client.post('/course_elements/form/edit/', data={'grouping': f'420-110-DW_{element_id}', 'element_hours': 'many'})
+            self.assertEqual(resp.status_code, 200)
+            self.assertIn(b'Element hours must be a positive number', resp.data)
+            resp = client.post('/course_elements/form/edit/', data={'grouping': f'420-110-DW_{element_id}', 'element_hours': '-3'})
+            self.assertIn(b'Element hours must be a positive number', resp.data)
+            self.assertEqual(dict(db.get_course_element_hours('420-110-DW'))[element_id], hours)
+            
+            ## Testing that valid hours are stored as a number
+            try:
+                resp = client.post('/course_elements/form/edit/', data={'grouping': f'420-110-DW_{element_id}', 'element_hours': '7.5'})
+                self.assertEqual(resp.status_code, 302)
+                self.assertEqual(dict(db.get_course_element_hours('420-110-DW'))[element_id], 7.5)
+            finally:
+                db.apply_course_element_changes([('420-110-DW', element_id, hours)], [])
+            
+            ## Testing a link that does not exist
+            resp = client.post('/course_elements/form/edit/', data={'grouping': '420-110-DW_-1', 'element_hours': '5'})
+            self.assertEqual(resp.status_code, 302)
+            resp = client.post('/course_elements/form/delete/', data={'grouping': 'nonsense'})
+            self.assertEqual(resp.status_code, 302)
+            
+            ## Testing GET of the forms
+            self.assertIn(f'420-110-DW_{element_id}'.encode(), client.get('/course_elements/form/edit/').data)
+            self.assertIn(f'420-110-DW_{element_id}'.encode(), client.get('/course_elements/form/delete/').data)
+        finally:
+            db.close()
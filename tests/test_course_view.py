@@ -0,0 +1,33 @@
+import sqlite3
+import flask_unittest
+from CourseManagementApp import create_app, cache
+from CourseManagementApp.db import Database
+
+class CourseViewTest(flask_unittest.ClientTestCase):
+    app = create_app()
+    
+    def test_course_without_domain(self, client):
+        connection = sqlite3.connect(self.app.config['DB_SQLITE_PATH'])
+        try:
+            with connection:
+                connection.execute("INSERT INTO courses VALUES ('420-998-DW', 'No Domain', 3, 3, 3, 'A course without a domain', NULL, 1)")
+            cache.changed('courses')
+            db = Database()
+            try:
+                ## Testing the bundle of a course that has no domain
+                course, domain, competencies, elements, element_hours, total = db.get_course_bundle('420-998-DW')
+                self.assertEqual(course.course_id, '420-998-DW')
+                self.assertIsNone(domain)
+                self.assertEqual((elements, total), ([], 0))
+            finally:
+                db.close()
+            
+            ## Testing GET of its page
+            resp = client.get('/course/420-998-DW/')
+            self.assertEqual(resp.status_code, 200)
+            self.assertIn(b'Domain: None', resp.data)
+        finally:
+            with connection:
+                connection.execute("DELETE FROM courses WHERE course_id = '420-998-DW'")
+            connection.close()
+            cache.changed('courses')
@@ -68,4 +68,31 @@ class CompetencyTestAPI(flask_unittest.ClientTestCase):
         new_element = Element(1, 'Solve Any Programming Problem', 'Under all circumstances', '00Q2')
         new_element_json = new_element.to_json()
         resp = client.post('/api/v1/elements', json=new_element_json)
-        self.assertEqual(resp.status_code, 400)
\ No newline at end of file
+        self.assertEqual(resp.status_code, 400)
+        
+    def test_elements_get_cursor(self, client):
+        ## Testing GET of the first page, which also hands out a cursor to the next one
+        resp = client.get('/api/v1/elements')
+        self.assertEqual(resp.status_code, 200)
+        first_page = resp.json
+        self.assertIsNone(first_page['previous_cursor'])
+        self.assertIsNotNone(first_page['next_cursor'])
+        
+        ## Testing GET with the next cursor matches the page 2 results
+        resp = client.get(f"/api/v1/elements?cursor={first_page['next_cursor']}")
+        self.assertEqual(resp.status_code, 200)
+        cursor_page = resp.json
+        resp = client.get('/api/v1/elements?page=2')
+        self.assertEqual([element['element_id'] for element in cursor_page['results']], [element['element_id'] for element in resp.json['results']])
+        
+        ## Testing GET with the previous cursor returns to the first page
+        resp = client.get(f"/api/v1/elements?cursor={cursor_page['previous_cursor']}")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([element['element_id'] for element in resp.json['results']], [element['element_id'] for element in first_page['results']])
+        self.assertIsNone(resp.json['previous_cursor'])
+        
+        ## Testing GET with a malformed cursor, and with a cursor from another collection
+        resp = client.get('/api/v1/elements?cursor=not-a-cursor')
+        self.assertEqual(resp.status_code, 400)
+        resp = client.get(f"/api/v1/courses?cursor={first_page['next_cursor']}")
+        self.assertEqual(resp.status_code, 400)
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+import flask_unittest
+from CourseManagementApp import create_app, cache, change_feed
+from CourseManagementApp.db import Database
+
+class ExportTestAPI(flask_unittest.ClientTestCase):
+    app = create_app()
+    
+    def test_export_collection_ndjson(self, client):
+        db = Database()
+        course_count = db.count_courses()
+        db.close()
+        
+        ## Testing NDJSON export of courses
+        resp = client.get('/api/v1/export/courses')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.mimetype, 'application/x-ndjson')
+        records = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        self.assertEqual(len(records), course_count)
+        self.assertIn('course_title', records[0])
+        
+        ## Testing export of unknown collection and format
+        resp = client.get('/api/v1/export/users')
+        self.assertEqual(resp.status_code, 404)
+        resp = client.get('/api/v1/export/courses?format=xml')
+        self.assertEqual(resp.status_code, 400)
+        
+    def test_export_collection_csv(self, client):
+        ## Testing CSV export of the course element links
+        resp = client.get('/api/v1/export/courses_elements?format=csv')
+        self.assertEqual(resp.status_code, 200)
+        rows = list(csv.reader(io.StringIO(resp.get_data(as_text=True))))
+        self.assertEqual(rows[0], ['course_id', 'element_id', 'element_hours'])
+        self.assertGreater(len(rows), 1)
+        
+    def test_export_program(self, client):
+        ## Testing NDJSON export of the whole program
+        resp = client.get('/api/v1/export')
+        self.assertEqual(resp.status_code, 200)
+        types = set(json.loads(line)['type'] for line in resp.get_data(as_text=True).splitlines())
+        self.assertEqual(types, {'course', 'competency', 'element', 'course_element'})
+        resp = client.get('/api/v1/export?format=csv')
+        self.assertEqual(resp.status_code, 400)
+        
+    def test_export_streams_unshared(self, client):
+        ## Testing that the export is not read into memory for an ETag when the versions are not shared
+        feed, change_feed.feed = change_feed.feed, None
+        cache.set_following(False)
+        try:
+            with self.app.test_request_context('/api/v1/export/courses'):
+                resp = self.app.full_dispatch_request()
+                try:
+                    self.assertEqual(resp.status_code, 200)
+                    self.assertTrue(resp.is_streamed)
+                    self.assertFalse(resp.is_sequence)
+                    self.assertIsNone(resp.get_etag()[0])
+                finally:
+                    resp.close()
+        finally:
+            change_feed.feed, change_feed.last_poll = feed, 0.0
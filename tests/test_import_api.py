@@ -0,0 +1,70 @@
+import flask_unittest
+from CourseManagementApp import create_app
+from CourseManagementApp.db import Database
+
+class ImportTestAPI(flask_unittest.ClientTestCase):
+    app = create_app()
+    
+    def cleanup(self):
+        try:
+            db = Database()
+            
+            db.del_course('420-998-DW')
+            db.del_course('420-999-DW')
+            
+            if db is not None:
+                db.close()
+        except:
+            if db is not None:
+                db.close()
+                raise Exception('Database error, cleanup incomplete. Aborting')
+    
+    def test_import_json(self, client):
+        try:
+            self.cleanup()
+        except:
+            raise Exception('Database error, cleanup interrupted. The subsequent tests will likely fail as a consequence')
+        
+        ## Testing import of valid and invalid courses in one request
+        courses = [{'course_id': '420-998-DW', 'course_title': 'Test Course', 'theory_hours': 3, 'lab_hours': 3, 'work_hours': 3, 'description': 'Test Description', 'domain_id': 1, 'term_id': 1},
+                   {'course_id': '420-999-DW', 'course_title': 'Test Course', 'theory_hours': 'three', 'lab_hours': 3, 'work_hours': 3, 'description': 'Test Description', 'domain_id': 1, 'term_id': 1},
+                   {'course_id': '420-999-DW', 'course_title': 'Test Course', 'theory_hours': 3, 'lab_hours': 3, 'work_hours': 3, 'description': 'Test Description', 'domain_id': 1, 'term_id': 1},
+                   {'course_id': '420-998-DW', 'course_title': 'Duplicate', 'theory_hours': 3, 'lab_hours': 3, 'work_hours': 3, 'description': 'Test Description', 'domain_id': 1, 'term_id': 1}]
+        resp = client.post('/api/v1/import/courses', json=courses)
+        self.assertEqual(resp.status_code, 200)
+        report = resp.json
+        self.assertEqual(report['received'], 4)
+        self.assertEqual(report['imported'], 2)
+        self.assertEqual([error['row'] for error in report['errors']], [2, 4])
+        
+        resp = client.get('/api/v1/courses/420-999-DW')
+        self.assertEqual(resp.status_code, 200)
+        self.cleanup()
+        
+    def test_import_csv(self, client):
+        try:
+            self.cleanup()
+        except:
+            raise Exception('Database error, cleanup interrupted. The subsequent tests will likely fail as a consequence')
+        
+        ## Testing import of courses and their element links from csv
+        courses = 'course_id,course_title,theory_hours,lab_hours,work_hours,description,domain_id,term_id\n420-999-DW,Test Course,3,3,3,Test Description,1,1\n'
+        resp = client.post('/api/v1/import/courses', data=courses, content_type='text/csv')
+        self.assertEqual(resp.json['imported'], 1)
+        links = 'course_id,element_id,element_hours\n420-999-DW,1,45\n420-999-DW,2,45\n420-999-DW,99999,45\n'
+        resp = client.post('/api/v1/import/courses_elements?format=csv', data=links)
+        self.assertEqual(resp.json['imported'], 2)
+        self.assertEqual(resp.json['errors'][0]['row'], 3)
+        
+        ## Testing import of fractional element hours, as exported, and of hours that are not numbers
+        links = 'course_id,element_id,element_hours\n420-999-DW,3,22.5\n420-999-DW,4,many\n'
+        resp = client.post('/api/v1/import/courses_elements?format=csv', data=links)
+        self.assertEqual(resp.json['imported'], 1)
+        self.assertEqual(resp.json['errors'][0]['row'], 2)
+        
+        ## Testing import of unknown collection and unreadable data
+        resp = client.post('/api/v1/import/users', json=[])
+        self.assertEqual(resp.status_code, 404)
+        resp = client.post('/api/v1/import/courses', data='not json', content_type='application/json')
+        self.assertEqual(resp.status_code, 400)
+        self.cleanup()
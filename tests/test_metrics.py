@@ -0,0 +1,27 @@
+import flask_unittest
+from CourseManagementApp import create_app
+from CourseManagementApp.metrics import format_labels
+
+class MetricsTest(flask_unittest.ClientTestCase):
+    app = create_app()
+    
+    def test_metrics_get(self, client):
+        client.get('/api/v1/terms')
+        client.get('/api/v1/terms/999')
+        
+        ## Testing the exposition of request latency, DB time and error ids
+        resp = client.get('/metrics')
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.content_type.startswith('text/plain'))
+        text = resp.get_data(as_text=True)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+        self.assertIn('http_request_duration_seconds_count{blueprint="term_api",endpoint="term_api.terms"}', text)
+        self.assertIn('http_request_db_seconds_count{blueprint="term_api",endpoint="term_api.terms"}', text)
+        self.assertIn('http_requests_in_flight{blueprint="",endpoint="metrics"} 1', text)
+        self.assertIn('api_errors_total{blueprint="term_api",endpoint="term_api.term_by_id",error_id="Not Found"}', text)
+        self.assertIn('cache_requests_total{cache="entity",result="hit"}', text)
+    
+    def test_label_escaping(self, client):
+        ## Testing that backslashes, double quotes and newlines in label values are escaped, and only in the values
+        self.assertEqual(format_labels([('error_id', 'Say "hi"\\\n')]), '{error_id="Say \\"hi\\"\\\\\\n"}')
+        self.assertEqual(format_labels([]), '')
@@ -0,0 +1,86 @@
+import sqlite3
+import flask_unittest
+from CourseManagementApp import create_app, cache, change_feed, program_graph
+from CourseManagementApp.db import Database
+from CourseManagementApp.dbmanager import get_db
+from CourseManagementApp.program_graph import get_program_graph
+
+class ProgramGraphTest(flask_unittest.AppTestCase):
+    def create_app(self):
+        return create_app()
+    
+    def test_matches_database(self, app):
+        db = Database()
+        try:
+            with app.test_request_context('/'):
+                graph = get_program_graph()
+                self.assertIs(graph, get_program_graph())
+                self.assertEqual([course.course_id for course in graph.get_courses()], [course.course_id for course in db.get_courses()])
+                self.assertEqual(sorted(graph.get_course_competency_groupings()), sorted(db.get_course_competency_groupings()))
+                self.assertEqual(sorted(graph.get_course_element_groupings()), sorted(db.get_course_element_groupings()))
+                self.assertEqual([element.element_id for element in graph.get_elements_of_course('420-210-DW')],
+                                 [element.element_id for element in db.get_elements_of_course('420-210-DW')])
+                self.assertIsNone(graph.get_course('XXX-000-XX'))
+        finally:
+            db.close()
+    
+    def test_refreshes_after_write(self, app):
+        db = Database()
+        try:
+            with app.test_request_context('/'):
+                graph = get_program_graph()
+                linked = [element.element_id for element in graph.get_elements_of_course('420-210-DW')]
+                element_id = next(element.element_id for element in graph.get_elements() if element.element_id not in linked)
+                db.add_course_elements('420-210-DW', element_id, 5)
+                try:
+                    ## Testing that the write is seen by the next reader, while the old snapshot stays as it was
+                    refreshed = get_program_graph()
+                    self.assertIsNot(refreshed, graph)
+                    self.assertIn(element_id, [element.element_id for element in refreshed.get_elements_of_course('420-210-DW')])
+                    self.assertIn('420-210-DW', [course.course_id for course in refreshed.get_courses_of_element(element_id)])
+                    self.assertNotIn(element_id, [element.element_id for element in graph.get_elements_of_course('420-210-DW')])
+                finally:
+                    db.del_course_element_pairing('420-210-DW', element_id)
+                self.assertNotIn(element_id, [element.element_id for element in get_program_graph().get_elements_of_course('420-210-DW')])
+        finally:
+            db.close()
+        
+    def test_refreshes_after_ttl(self, app):
+        ## Testing that a write the versions did not see shows once the snapshot is older than its TTL
+        feed, change_feed.feed = change_feed.feed, None
+        connection = sqlite3.connect(app.config['DB_SQLITE_PATH'])
+        try:
+            with app.test_request_context('/'):
+                graph = get_program_graph()
+                with connection:
+                    connection.execute("UPDATE courses SET course_title = 'Zymurgy Course' WHERE course_id = '420-210-DW'")
+                self.assertIs(get_program_graph(), graph)
+                program_graph.ttl = 0
+                self.assertEqual(get_program_graph().get_course('420-210-DW').course_title, 'Zymurgy Course')
+        finally:
+            with connection:
+                connection.execute("UPDATE courses SET course_title = ? WHERE course_id = '420-210-DW'", (graph.get_course('420-210-DW').course_title,))
+            connection.close()
+            cache.changed('courses')
+            program_graph.ttl = app.config['PROGRAM_GRAPH_TTL']
+            change_feed.feed = feed
+        
+    def test_rebuild_skips_entity_cache(self, app):
+        ## Testing that a rebuild reads the tables themselves rather than what the entity cache still holds
+        feed, change_feed.feed = change_feed.feed, None
+        connection = sqlite3.connect(app.config['DB_SQLITE_PATH'])
+        try:
+            with app.test_request_context('/'):
+                term = get_db().get_terms()[0]
+                with connection:
+                    connection.execute("UPDATE terms SET term_name = 'Zymurgy' WHERE term_id = ?", (term.term_id,))
+                self.assertEqual(get_db().get_terms()[0].term_name, term.term_name)
+                program_graph.ttl = 0
+                self.assertEqual(get_program_graph().get_terms()[0].term_name, 'Zymurgy')
+        finally:
+            with connection:
+                connection.execute("UPDATE terms SET term_name = ? WHERE term_id = ?", (term.term_name, term.term_id))
+            connection.close()
+            cache.changed('terms')
+            program_graph.ttl = app.config['PROGRAM_GRAPH_TTL']
+            change_feed.feed = feed
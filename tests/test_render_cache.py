@@ -0,0 +1,54 @@
+import flask_unittest
+from CourseManagementApp import create_app, cache, change_feed
+from CourseManagementApp.db import Database
+from CourseManagementApp.element import Element
+
+class RenderCacheTest(flask_unittest.ClientTestCase):
+    app = create_app()
+    
+    def cleanup(self):
+        db = Database()
+        try:
+            for element in db.get_elements():
+                if element.element == 'Render cache test element':
+                    db.del_element(element.element_id)
+        finally:
+            db.close()
+    
+    def test_page_cache(self, client):
+        self.cleanup()
+        
+        ## Testing that anonymous pages are served from the cache once rendered
+        client.get('/element/reference/')
+        resp = client.get('/element/reference/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers['X-Render-Cache'], 'hit')
+        
+        ## Testing that a write makes the next visit render again
+        db = Database()
+        try:
+            db.add_element(Element(99, 'Render cache test element', '* Criteria', '00Q2'))
+        finally:
+            db.close()
+        try:
+            resp = client.get('/element/reference/')
+            self.assertEqual(resp.headers['X-Render-Cache'], 'miss')
+            self.assertIn(b'Render cache test element', resp.data)
+            self.assertEqual(client.get('/element/reference/').headers['X-Render-Cache'], 'hit')
+        finally:
+            self.cleanup()
+        self.assertNotIn(b'Render cache test element', client.get('/element/reference/').data)
+    
+    def test_page_cache_unshared(self, client):
+        ## Testing that nothing is cached while other workers' writes do not reach the versions
+        feed, change_feed.feed = change_feed.feed, None
+        following = cache.following
+        cache.set_following(False)
+        try:
+            client.get('/element/reference/')
+            resp = client.get('/element/reference/')
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotIn('X-Render-Cache', resp.headers)
+        finally:
+            cache.set_following(following)
+            change_feed.feed = feed
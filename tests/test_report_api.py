@@ -0,0 +1,54 @@
+import sqlite3
+import flask_unittest
+from CourseManagementApp import create_app, cache, change_feed
+from CourseManagementApp.db import Database
+
+class ReportTestAPI(flask_unittest.ClientTestCase):
+    app = create_app()
+    
+    def test_program_report_get(self, client):
+        db = Database()
+        course = db.get_course('420-110-DW')
+        course_count = db.count_courses()
+        db.close()
+        
+        ## Testing GET of the program report
+        resp = client.get('/api/v1/reports/program')
+        self.assertEqual(resp.status_code, 200)
+        json = resp.json
+        self.assertEqual(json['totals']['courses'], course_count)
+        report_course = [c for c in json['courses'] if c['course_id'] == '420-110-DW'][0]
+        self.assertEqual(report_course['total_hours'], (course.theory_hours + course.lab_hours) * 15)
+        self.assertEqual(report_course['credits'], round((course.theory_hours + course.lab_hours + course.work_hours) / 3, 2))
+        self.assertEqual(sum(term['courses'] for term in json['terms']), course_count)
+        
+        ## Testing the coverage matrix against the uncovered competencies
+        coverage = json['coverage']
+        uncovered = [competency['competency_id'] for competency in json['uncovered_competencies']]
+        for i, competency_id in enumerate(coverage['competencies']):
+            covered = any(row['hours'][i] for row in coverage['courses'])
+            self.assertEqual(covered, competency_id not in uncovered)
+        
+    def test_program_report_page(self, client):
+        ## Testing the dashboard page
+        resp = client.get('/reports/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn(b'Competency Coverage', resp.data)
+    
+    def test_program_report_unshared(self, client):
+        ## Testing that the report shows another worker's write at once when the versions are not shared
+        feed, change_feed.feed = change_feed.feed, None
+        cache.set_following(False)
+        connection = sqlite3.connect(self.app.config['DB_SQLITE_PATH'])
+        title = [c for c in client.get('/api/v1/reports/program').json['courses'] if c['course_id'] == '420-110-DW'][0]['course_title']
+        try:
+            with connection:
+                connection.execute("UPDATE courses SET course_title = 'Zymurgy Course' WHERE course_id = '420-110-DW'")
+            report_course = [c for c in client.get('/api/v1/reports/program').json['courses'] if c['course_id'] == '420-110-DW'][0]
+            self.assertEqual(report_course['course_title'], 'Zymurgy Course')
+        finally:
+            with connection:
+                connection.execute("UPDATE courses SET course_title = ? WHERE course_id = '420-110-DW'", (title,))
+            connection.close()
+            cache.changed('courses')
+            change_feed.feed, change_feed.last_poll = feed, 0.0
@@ -0,0 +1,94 @@
+import flask_unittest
+from CourseManagementApp import create_app
+from CourseManagementApp.db import Database
+from CourseManagementApp.course import Course
+from CourseManagementApp.search_index import program_index
+from CourseManagementApp import change_feed
+import sqlite3
+
+class SearchTest(flask_unittest.ClientTestCase):
+    app = create_app()
+    
+    def cleanup(self):
+        try:
+            db = Database()
+            
+            db.del_course('420-999-DW')
+            
+            if db is not None:
+                db.close()
+        except:
+            if db is not None:
+                db.close()
+                raise Exception('Database error, cleanup incomplete. Aborting')
+    
+    def test_search(self, client):
+        try:
+            self.cleanup()
+        except:
+            raise Exception('Database error, cleanup interrupted. The subsequent tests will likely fail as a consequence')
+        
+        ## Testing search by word, word prefix and inside a word
+        for query in ['Programming', 'progr', 'gramming']:
+            resp = client.get(f'/{query}/')
+            self.assertEqual(resp.status_code, 200)
+            self.assertIn(b'420-110-DW: Programming I', resp.data)
+        
+        ## Testing that the index picks up new courses
+        resp = client.get('/Zymurgy/')
+        self.assertNotIn(b'420-999-DW', resp.data)
+        client.post('/api/v1/courses', json=Course('420-999-DW', 'Zymurgy', 3, 3, 3, 'Test Description', 1, 1).to_json())
+        resp = client.get('/Zymurgy/')
+        self.assertIn(b'420-999-DW: Zymurgy', resp.data)
+        self.cleanup()
+        
+    def test_search_parallel(self, client):
+        ## Testing that parallel mode returns what the sequential queries return
+        self.app.config['SEARCH_MODE'] = 'parallel'
+        try:
+            resp = client.get('/gramming/')
+            self.assertEqual(resp.status_code, 200)
+            self.assertIn(b'420-110-DW: Programming I', resp.data)
+        finally:
+            self.app.config['SEARCH_MODE'] = 'index'
+        
+    def test_search_fulltext(self, client):
+        try:
+            self.cleanup()
+        except:
+            raise Exception('Database error, cleanup interrupted. The subsequent tests will likely fail as a consequence')
+        
+        ## Testing full-text search of descriptions, including rows written after the index was built
+        self.app.config['SEARCH_MODE'] = 'fulltext'
+        try:
+            resp = client.get('/programming/')
+            self.assertEqual(resp.status_code, 200)
+            self.assertIn(b'420-110-DW: Programming I', resp.data)
+            client.post('/api/v1/courses', json=Course('420-999-DW', 'Test Course', 3, 3, 3, 'Brewing with zymurgy', 1, 1).to_json())
+            resp = client.get('/zymurgy/')
+            self.assertIn(b'420-999-DW: Test Course', resp.data)
+        finally:
+            self.app.config['SEARCH_MODE'] = 'index'
+            self.cleanup()
+    
+    def test_search_index_ttl(self, client):
+        try:
+            self.cleanup()
+        except:
+            raise Exception('Database error, cleanup interrupted. The subsequent tests will likely fail as a consequence')
+        client.get('/zymurgy/')
+        
+        ## Testing that a write the versions did not see shows once the index is older than its TTL
+        feed, change_feed.feed = change_feed.feed, None
+        connection = sqlite3.connect(self.app.config['DB_SQLITE_PATH'])
+        try:
+            with connection:
+                connection.execute("INSERT INTO courses VALUES ('420-999-DW', 'Zymurgy Course', 3, 3, 3, 'Test Description', 1, 1)")
+            self.assertNotIn(b'420-999-DW', client.get('/zymurgy/').data)
+            program_index.ttl = 0
+            self.assertIn(b'420-999-DW: Zymurgy Course', client.get('/zymurgy/').data)
+        finally:
+            program_index.ttl = self.app.config['SEARCH_INDEX_TTL']
+            change_feed.feed = feed
+            connection.close()
+            self.cleanup()
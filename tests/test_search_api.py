@@ -0,0 +1,47 @@
+import flask_unittest
+import sqlite3
+import time
+from CourseManagementApp import create_app, change_feed
+from CourseManagementApp.search_index import program_index, suggestion_cache
+
+class SearchTestAPI(flask_unittest.ClientTestCase):
+    app = create_app()
+    
+    def test_suggest_get(self, client):
+        ## Testing GET of suggestions for a partial word
+        resp = client.get('/api/v1/search/suggest?q=progr')
+        self.assertEqual(resp.status_code, 200)
+        json = resp.json
+        self.assertEqual(json['courses'][0]['course_id'], '420-110-DW')
+        self.assertLessEqual(len(json['elements']), 10)
+        
+        ## Testing GET of suggestions with a limit
+        resp = client.get('/api/v1/search/suggest?q=pro&limit=2')
+        self.assertEqual(resp.status_code, 200)
+        self.assertLessEqual(len(resp.json['courses']), 2)
+        
+        ## Testing GET of suggestions with invalid parameters
+        resp = client.get('/api/v1/search/suggest')
+        self.assertEqual(resp.status_code, 400)
+        resp = client.get('/api/v1/search/suggest?q=pro&limit=0')
+        self.assertEqual(resp.status_code, 400)
+        
+    def test_suggest_ttl(self, client):
+        ## Testing that suggestions a missed write would hide expire with the index after their TTL
+        feed, change_feed.feed = change_feed.feed, None
+        program_index.ttl = suggestion_cache.ttl = 0.2
+        connection = sqlite3.connect(self.app.config['DB_SQLITE_PATH'])
+        try:
+            client.get('/api/v1/search/suggest?q=zymur')
+            with connection:
+                connection.execute("INSERT INTO courses VALUES ('420-999-DW', 'Zymurgy Course', 3, 3, 3, 'Test Description', 1, 1)")
+            self.assertEqual(client.get('/api/v1/search/suggest?q=zymur').json['courses'], [])
+            time.sleep(0.3)
+            self.assertEqual(client.get('/api/v1/search/suggest?q=zymur').json['courses'][0]['course_id'], '420-999-DW')
+        finally:
+            program_index.ttl = self.app.config['SEARCH_INDEX_TTL']
+            suggestion_cache.ttl = self.app.config['SEARCH_SUGGEST_TTL']
+            change_feed.feed = feed
+            with connection:
+                connection.execute("DELETE FROM courses WHERE course_id = '420-999-DW'")
+            connection.close()
@@ -3,6 +3,7 @@ from CourseManagementApp import create_app
 from CourseManagementApp.db import Database
 from CourseManagementApp.course import Course
 from CourseManagementApp.term import Term
+from CourseManagementApp import cache, change_feed
 
 class TermTestAPI(flask_unittest.ClientTestCase):
     app = create_app()
@@ -108,4 +109,86 @@ class TermTestAPI(flask_unittest.ClientTestCase):
         
         ## Testing DELETE of nonexistent term
         resp = client.delete('/api/v1/terms/7')
-        self.assertEqual(resp.status_code, 400)
\ No newline at end of file
+        self.assertEqual(resp.status_code, 400)
+        
+    def test_term_cache_invalidation(self, client):
+        try:
+            self.cleanup()
+        except:
+            raise Exception('Database error, cleanup interrupted. The subsequent tests will likely fail as a consequence')
+        
+        ## Caching the missing term, then checking that writes invalidate it
+        resp = client.get('/api/v1/terms/7')
+        self.assertEqual(resp.status_code, 404)
+        resp = client.post('/api/v1/terms', json=Term(7).to_json())
+        self.assertEqual(resp.status_code, 201)
+        resp = client.get('/api/v1/terms/7')
+        self.assertEqual(resp.status_code, 200)
+        
+        ## Writes made outside the API go through Database and invalidate as well
+        summer = Term(7)
+        summer.term_name = 'Summer'
+        db = Database()
+        db.edit_term(7, summer)
+        db.close()
+        resp = client.get('/api/v1/terms/7')
+        self.assertEqual(resp.json['term_name'], 'Summer')
+        
+        client.delete('/api/v1/terms/7')
+        resp = client.get('/api/v1/terms/7')
+        self.assertEqual(resp.status_code, 404)
+        
+    def test_terms_conditional_get(self, client):
+        try:
+            self.cleanup()
+        except:
+            raise Exception('Database error, cleanup interrupted. The subsequent tests will likely fail as a consequence')
+        
+        ## Testing GET of terms with validators
+        resp = client.get('/api/v1/terms')
+        self.assertEqual(resp.status_code, 200)
+        etag = resp.headers['ETag']
+        self.assertIsNotNone(resp.headers.get('Last-Modified'))
+        self.assertIn('public', resp.headers['Cache-Control'])
+        
+        ## Testing GET of unchanged terms
+        resp = client.get('/api/v1/terms', headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.headers['ETag'], etag)
+        
+        ## Testing GET of terms after a change
+        client.post('/api/v1/terms', json=Term(7).to_json())
+        resp = client.get('/api/v1/terms', headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp.headers['ETag'], etag)
+        client.delete('/api/v1/terms/7')
+        
+    def test_terms_conditional_get_unshared(self, client):
+        try:
+            self.cleanup()
+        except:
+            raise Exception('Database error, cleanup interrupted. The subsequent tests will likely fail as a consequence')
+        feed, change_feed.feed = change_feed.feed, None
+        cache.set_following(False)
+        try:
+            ## Testing GET of terms validated by their body when other workers' writes may not be seen
+            resp = client.get('/api/v1/terms')
+            self.assertEqual(resp.status_code, 200)
+            etag = resp.headers['ETag']
+            self.assertIsNone(resp.headers.get('Last-Modified'))
+            
+            resp = client.get('/api/v1/terms', headers={'If-None-Match': etag})
+            self.assertEqual(resp.status_code, 304)
+            
+            client.post('/api/v1/terms', json=Term(7).to_json())
+            resp = client.get('/api/v1/terms', headers={'If-None-Match': etag})
+            self.assertEqual(resp.status_code, 200)
+            client.delete('/api/v1/terms/7')
+        finally:
+            change_feed.feed, change_feed.last_poll = feed, 0.0
+        
+    def test_terms_server_timing(self, client):
+        ## Testing that the queries run by a request are summed up in Server-Timing
+        resp = client.get('/api/v1/terms')
+        self.assertEqual(resp.status_code, 200)
+        self.assertRegex(resp.headers['Server-Timing'], r'^db;dur=[0-9.]+;desc="[0-9]+ queries"$')
@@ -0,0 +1,65 @@
+import datetime
+import sqlite3
+import flask_unittest
+from CourseManagementApp import create_app
+from CourseManagementApp import cache
+from CourseManagementApp.db import Database
+from CourseManagementApp.user import Member
+
+class UserCacheTest(flask_unittest.AppTestCase):
+    def create_app(self):
+        return create_app()
+    
+    def cleanup(self, db):
+        try:
+            db.del_user('cached.user@example.com')
+        except:
+            pass
+    
+    def test_user_cache(self, app):
+        db = Database()
+        try:
+            self.cleanup(db)
+            db.add_user(Member('Cached User', 'password', 'cached.user@example.com', datetime.datetime.now(), '0'))
+            user_id = db.get_user_by_email('cached.user@example.com').id
+            # As once the change feed has polled
+            cache.set_following(True)
+            
+            ## Testing that the user is served from the cache once loaded
+            user = db.get_user_by_id(user_id)
+            self.assertEqual(user.name, 'Cached User')
+            self.assertFalse(user.blocked)
+            hits = cache.user_cache.entries.hits
+            self.assertEqual(db.get_user_by_id(user_id).email, 'cached.user@example.com')
+            self.assertEqual(cache.user_cache.entries.hits, hits + 1)
+            
+            ## Testing that blocking, role changes and deletion take effect at once
+            db.block_user_db('cached.user@example.com')
+            self.assertTrue(db.get_user_by_id(user_id).blocked)
+            db.edit_user_group('Admin', 'cached.user@example.com')
+            self.assertEqual(db.get_user_by_id(user_id).access_group, 2)
+            db.del_user('cached.user@example.com')
+            self.assertIsNone(db.get_user_by_id(user_id))
+        finally:
+            cache.set_following(False)
+            self.cleanup(db)
+            db.close()
+    
+    def test_user_cache_unshared(self, app):
+        db = Database()
+        connection = sqlite3.connect(app.config['DB_SQLITE_PATH'])
+        try:
+            self.cleanup(db)
+            db.add_user(Member('Cached User', 'password', 'cached.user@example.com', datetime.datetime.now(), '0'))
+            user_id = db.get_user_by_email('cached.user@example.com').id
+            
+            ## Testing that a block made by another worker applies at once when the versions are not shared
+            cache.set_following(False)
+            self.assertFalse(db.get_user_by_id(user_id).blocked)
+            with connection:
+                connection.execute("UPDATE course_users SET blocked = 1 WHERE email = 'cached.user@example.com'")
+            self.assertTrue(db.get_user_by_id(user_id).blocked)
+        finally:
+            connection.close()
+            self.cleanup(db)
+            db.close()